@@ -1,14 +1,17 @@
+import io
 import json
 import asyncio
 import time
 import os
+import zipfile
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Body
+from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-import uvicorn
 
 
 import sys
@@ -21,13 +24,43 @@ from core.translator_service import (
     translate_json_async,
     create_job,
     get_job,
+    build_request_key,
+    find_duplicate_job,
     list_jobs,
     delete_job,
+    resume_interrupted_jobs,
+    launch_job_in_process,
+    get_result_data,
+    get_job_store_stats,
+    save_job,
+    is_job_local,
+    request_job_cancel,
     TranslationJob,
+    FINISHED_STATUSES,
+    has_openai_key,
     MODEL_PRICING,
     DEFAULT_MODEL,
     DEFAULT_BATCH_SIZE,
     DEFAULT_PARALLEL,
+    load_json_bundle_zip,
+    write_json_atomic,
+)
+from core import job_events
+from core import metrics
+from core.worker_pool import JobDispatcher, JOB_WORKERS
+from core.file_index import FileIndex, SORT_FIELDS
+from core.file_offsets import FileOffsetIndex, parse_pointer
+from core.search_index import SearchIndex, SEARCH_FIELDS
+from core.json_compare import CompareCache, DIFF_STATUSES
+from core.estimator import latency_summary
+from core.tracing import get_trace_path, get_profile_files
+from core.payload_cache import (
+    CompressedPayload,
+    SpilledPayload,
+    negotiate_encoding,
+    etag_matches,
+    iter_compressed,
+    iter_file_chunks,
 )
 
 app = FastAPI(
@@ -44,6 +77,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.InFlightMiddleware)
 
 
 class TranslationRequest(BaseModel):
@@ -53,6 +87,10 @@ class TranslationRequest(BaseModel):
     parallel: Optional[int] = Field(DEFAULT_PARALLEL, description="Número de batches paralelos")
     method: str = Field("openai", description="Método de tradução: 'openai' ou 'google'")
     json_data: Dict[str, Any] = Field(..., description="Dados JSON a traduzir")
+    source_filename: Optional[str] = Field(None, description="Nome do arquivo de origem (registrado no índice de arquivos)")
+    force: bool = Field(False, description="Cria um job novo mesmo havendo um idêntico em andamento ou concluído")
+    profile: bool = Field(False, description="Grava o perfil de CPU do job (GET /api/translate/{job_id}/profile)")
+    profile_memory: bool = Field(False, description="Com profile, também grava as alocações de memória (tracemalloc)")
 
 
 class EstimateRequest(BaseModel):
@@ -82,6 +120,142 @@ class JobStatusResponse(BaseModel):
     target_language: Optional[str] = None
     model: Optional[str] = None
     error_message: Optional[str]
+    files: Optional[Dict[str, Any]] = None
+    timings: Optional[Dict[str, Any]] = None
+
+
+LANGUAGE_NAMES = {
+    "es": "Espanhol", "pt": "Português", "fr": "Francês", "de": "Alemão",
+    "it": "Italiano", "nl": "Holandês", "pl": "Polonês", "sv": "Sueco",
+    "da": "Dinamarquês", "no": "Norueguês", "fi": "Finlandês", "cs": "Tcheco",
+    "hu": "Húngaro", "ro": "Romeno", "hr": "Croata", "sr": "Sérvio (Latinizado)",
+    "tr": "Turco", "id": "Indonésio", "tl": "Filipino (Tagalog)", "ms": "Malaio",
+}
+
+# Stream de progresso (SSE): janela de agrupamento de eventos e intervalo de keepalive
+SSE_COALESCE_SECONDS = 0.5
+SSE_KEEPALIVE_SECONDS = 15.0
+# Job executado por outro processo da API: o estado é relido do store compartilhado
+SSE_STORE_POLL_SECONDS = 1.0
+
+# Cache de payloads comprimidos de /api/files/{filename}, chaveado por (mtime, tamanho)
+FILE_PAYLOAD_CACHE_SIZE = 32
+_file_payload_cache: "OrderedDict[str, Tuple[Tuple[int, int], CompressedPayload]]" = OrderedDict()
+# Acima deste tamanho o arquivo é enviado em streaming, sem ser carregado nem guardado no cache
+FILE_STREAM_THRESHOLD = int(os.getenv("FILE_STREAM_THRESHOLD_MB", "16")) * 1024 * 1024
+
+
+async def payload_response(request: Request, payload: CompressedPayload) -> Response:
+    
+    headers = {
+        "ETag": payload.etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache",
+    }
+    
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    
+    if isinstance(payload, SpilledPayload):
+        return StreamingResponse(
+            payload.iter_encoded(encoding),
+            media_type="application/json",
+            headers=headers,
+        )
+    
+    # Só o gzip em memória sai pronto; descomprimir, gerar o brotli ou ler o blob do SQLite (StoredPayload) vai para uma thread
+    if encoding == "gzip" and isinstance(payload, CompressedPayload):
+        content = payload.encoded(encoding)
+    else:
+        content = await asyncio.to_thread(payload.encoded, encoding)
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def request_options(target_language: str, method: str, model: Optional[str]) -> Dict[str, Any]:
+    
+    # batch_size e parallel só mudam o agendamento, não a tradução: ficam fora da chave
+    return {
+        "target_language": target_language,
+        "method": method,
+        "model": (model or DEFAULT_MODEL) if method == "openai" else None,
+    }
+
+
+def deduplicated_response(job: TranslationJob) -> Dict[str, Any]:
+    
+    return {
+        "success": True,
+        "job_id": job.job_id,
+        "status": job.status,
+        "deduplicated": True,
+        "message": "Resultado já disponível" if job.status == "completed" else "Tradução idêntica já em andamento",
+    }
+
+
+# Pool de processos que executa os jobs (None = jobs no próprio event loop, JOB_WORKERS=0)
+dispatcher: Optional[JobDispatcher] = None
+
+
+def require_backend(method: str) -> None:
+    
+    # Falha na hora em vez de criar um job que só descobre a falta da chave no worker
+    if method == "openai" and not has_openai_key():
+        raise HTTPException(status_code=503, detail="OPENAI_API_KEY não configurada no servidor. Use method 'google' ou configure a chave")
+
+
+def launch_job(job: TranslationJob, params: Dict[str, Any]) -> None:
+    
+    # O config vai para o plano do checkpoint: um job retomado continua deduplicável
+    params = {**params, "job_config": job.config}
+    if dispatcher is not None:
+        dispatcher.submit(job, params)
+    else:
+        launch_job_in_process(job, params)
+    # Status "queued" e config visíveis para os outros processos da API
+    save_job(job)
+
+
+def cancel_job(job_id: str, keep_partial: bool = True) -> Optional[TranslationJob]:
+    
+    if dispatcher is not None:
+        dispatcher.cancel(job_id)
+    return request_job_cancel(job_id, keep_partial)
+
+
+# Tarefa de fundo que mede o atraso do event loop para o /metrics
+loop_lag_monitor: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def start_workers_and_resume_jobs():
+    
+    global dispatcher, loop_lag_monitor
+    if JOB_WORKERS > 0:
+        dispatcher = JobDispatcher(JOB_WORKERS)
+        dispatcher.start(asyncio.get_running_loop())
+    metrics.QUEUE_DEPTH.callback = lambda: dispatcher.queue_depth if dispatcher is not None else 0
+    loop_lag_monitor = asyncio.create_task(metrics.monitor_event_loop_lag())
+    
+    resumed = resume_interrupted_jobs(launch_job)
+    if resumed:
+        print(f"♻️  Retomando {len(resumed)} job(s) interrompido(s): {', '.join(resumed)}")
+
+
+@app.on_event("shutdown")
+async def stop_workers():
+    
+    if loop_lag_monitor is not None:
+        loop_lag_monitor.cancel()
+    if dispatcher is not None:
+        dispatcher.shutdown()
 
 
 @app.get("/")
@@ -91,14 +265,25 @@ async def root():
         "name": "JSON Translator API",
         "version": "1.0.0",
         "docs": "/docs",
+        "backends": {"openai": has_openai_key(), "google": True},
         "endpoints": {
             "upload": "POST /api/upload",
             "estimate": "POST /api/translate/estimate",
             "start": "POST /api/translate/start",
             "status": "GET /api/translate/{job_id}/status",
+            "events": "GET /api/translate/{job_id}/events",
+            "cancel": "POST /api/translate/{job_id}/cancel",
+            "bulk": "POST /api/translate/bulk",
+            "bundle": "GET /api/translate/{job_id}/bundle",
             "result": "GET /api/translate/{job_id}/result",
+            "trace": "GET /api/translate/{job_id}/trace",
+            "profile": "GET /api/translate/{job_id}/profile?format=pstats|text|alloc",
             "models": "GET /api/models",
             "languages": "GET /api/languages",
+            "search": "GET /api/search?q=...",
+            "compare": "POST /api/compare",
+            "latency": "GET /api/telemetry/latency",
+            "metrics": "GET /metrics",
         }
     }
 
@@ -111,7 +296,8 @@ async def upload_json(file: UploadFile = File(...)):
     
     try:
         contents = await file.read()
-        json_data = json.loads(contents.decode('utf-8'))
+        # Parse fora do event loop: arquivos grandes não travam as outras requisições
+        json_data = await asyncio.to_thread(json.loads, contents.decode('utf-8'))
         
 
         is_valid, error_msg = validate_json(json_data)
@@ -154,7 +340,9 @@ async def estimate(estimate_req: EstimateRequest):
         if parallel < 1 or parallel > 10:
             raise HTTPException(status_code=400, detail="Batches paralelos deve estar entre 1 e 10")
         
-        estimate_result = estimate_translation(
+        # Tokenização e simulação do plano rodam fora do event loop
+        estimate_result = await asyncio.to_thread(
+            estimate_translation,
             json_data=estimate_req.json_data,
             target_language=estimate_req.target_language,
             method=estimate_req.method,
@@ -175,15 +363,16 @@ async def estimate(estimate_req: EstimateRequest):
 
 
 @app.post("/api/translate/start")
-async def start_translation(
-    translation_req: TranslationRequest,
-    background_tasks: BackgroundTasks,
-):
+async def start_translation(translation_req: TranslationRequest):
     
     try:
 
         if translation_req.method not in ["openai", "google"]:
             raise HTTPException(status_code=400, detail="Método deve ser 'openai' ou 'google'")
+        # No event loop da API o cProfile mediria também os outros jobs e as requisições
+        if translation_req.profile and dispatcher is None:
+            raise HTTPException(status_code=400, detail="\"profile\" exige o pool de workers (JOB_WORKERS > 0)")
+        require_backend(translation_req.method)
         
         # Validar limites
         batch_size = translation_req.batch_size or DEFAULT_BATCH_SIZE
@@ -196,30 +385,48 @@ async def start_translation(
             raise HTTPException(status_code=400, detail="Batches paralelos deve estar entre 1 e 10")
         
 
+        request_key = await asyncio.to_thread(
+            build_request_key,
+            translation_req.json_data,
+            request_options(translation_req.target_language, translation_req.method, translation_req.model),
+        )
+        # Clique duplo ou o mesmo arquivo enviado por outra pessoa: reaproveita o job existente.
+        # Pedido de perfil sempre roda de novo: o job reaproveitado não teria o perfil
+        if not translation_req.force and not translation_req.profile:
+            duplicate = find_duplicate_job(request_key)
+            if duplicate is not None:
+                return deduplicated_response(duplicate)
+        
         job = create_job()
         
 
-        job.config = translation_req
+        # Só os parâmetros; o JSON de origem não fica preso ao job depois de achatado
+        job.config = {name: value for name, value in translation_req if name != "json_data"}
+        job.config["request_key"] = request_key
+        job.target_language = translation_req.target_language
         
 
-        background_tasks.add_task(
-            translate_json_async,
-            json_data=translation_req.json_data,
-            target_language=translation_req.target_language,
-            job_id=job.job_id,
-            method=translation_req.method,
-            model=translation_req.model or DEFAULT_MODEL,
-            batch_size=batch_size,
-            parallel=parallel,
-        )
+        launch_job(job, {
+            "json_data": translation_req.json_data,
+            "target_language": translation_req.target_language,
+            "method": translation_req.method,
+            "model": translation_req.model or DEFAULT_MODEL,
+            "batch_size": batch_size,
+            "parallel": parallel,
+            "profile": translation_req.profile,
+            "profile_memory": translation_req.profile and translation_req.profile_memory,
+        })
         
         return {
             "success": True,
             "job_id": job.job_id,
             "status": job.status,
+            "deduplicated": False,
             "message": "Tradução iniciada",
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao iniciar tradução: {str(e)}")
 
@@ -231,19 +438,105 @@ async def get_translation_status(job_id: str):
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado")
     
+    return build_job_status(job)
+
+
+@app.post("/api/translate/bulk")
+async def start_bulk_translation(
+    file: UploadFile = File(...),
+    target_language: str = Form(...),
+    method: str = Form("openai"),
+    model: Optional[str] = Form(None),
+    batch_size: Optional[int] = Form(None),
+    parallel: Optional[int] = Form(None),
+    force: bool = Form(False),
+    profile: bool = Form(False),
+    profile_memory: bool = Form(False),
+):
+    
+    if not file.filename.endswith('.zip'):
+        raise HTTPException(status_code=400, detail="Arquivo deve ser .zip com os JSONs do idioma de origem")
+    
+    if method not in ["openai", "google"]:
+        raise HTTPException(status_code=400, detail="Método deve ser 'openai' ou 'google'")
+    if profile and dispatcher is None:
+        raise HTTPException(status_code=400, detail="\"profile\" exige o pool de workers (JOB_WORKERS > 0)")
+    require_backend(method)
+    
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    parallel = parallel or DEFAULT_PARALLEL
+    
+    if batch_size < 1 or batch_size > 250:
+        raise HTTPException(status_code=400, detail="Tamanho do batch deve estar entre 1 e 250")
+    
+    if parallel < 1 or parallel > 10:
+        raise HTTPException(status_code=400, detail="Batches paralelos deve estar entre 1 e 10")
+    
+    try:
+        files = load_json_bundle_zip(io.BytesIO(await file.read()))
+    except (zipfile.BadZipFile, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Erro ao ler arquivo .zip: {str(e)}")
+    
+    if not files:
+        raise HTTPException(status_code=400, detail="Nenhum arquivo .json encontrado no .zip")
+    
+    for name, data in files.items():
+        is_valid, error_msg = validate_json(data)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=f"JSON inválido em {name}: {error_msg}")
+    
+    request_key = await asyncio.to_thread(build_request_key, files, request_options(target_language, method, model))
+    if not force and not profile:
+        duplicate = find_duplicate_job(request_key)
+        if duplicate is not None:
+            return {**deduplicated_response(duplicate), "files": sorted(files)}
+    
+    try:
+        job = create_job()
+        job.config = {
+            "request_key": request_key,
+            "archive": file.filename,
+            "file_count": len(files),
+            "target_language": target_language,
+            "method": method,
+            "model": model or DEFAULT_MODEL,
+            "batch_size": batch_size,
+            "parallel": parallel,
+        }
+        job.target_language = target_language
+        job.files = {name: {"total": 0, "done": 0} for name in files}
+        
+        launch_job(job, {
+            "files": files,
+            "target_language": target_language,
+            "method": method,
+            "model": model or DEFAULT_MODEL,
+            "batch_size": batch_size,
+            "parallel": parallel,
+            "profile": profile,
+            "profile_memory": profile and profile_memory,
+        })
+        
+        return {
+            "success": True,
+            "job_id": job.job_id,
+            "status": job.status,
+            "files": sorted(files),
+            "deduplicated": False,
+            "message": f"Tradução em lote iniciada ({len(files)} arquivos)",
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao iniciar tradução: {str(e)}")
+
+
+def build_job_status(job: TranslationJob) -> JobStatusResponse:
+    
     elapsed = None
     if job.start_time:
         elapsed = time.time() - job.start_time if job.status == "processing" else (job.end_time - job.start_time if job.end_time else None)
     
-
-    language_map = {
-        "es": "Espanhol", "pt": "Português", "fr": "Francês", "de": "Alemão",
-        "it": "Italiano", "nl": "Holandês", "pl": "Polonês", "sv": "Sueco",
-        "da": "Dinamarquês", "no": "Norueguês", "fi": "Finlandês", "cs": "Tcheco",
-        "hu": "Húngaro", "ro": "Romeno", "hr": "Croata", "sr": "Sérvio (Latinizado)",
-        "tr": "Turco", "id": "Indonésio", "tl": "Filipino (Tagalog)", "ms": "Malaio",
-    }
-    target_language_name = language_map.get(getattr(job, 'target_language', None), getattr(job, 'target_language', 'Unknown'))
+    target_language_name = LANGUAGE_NAMES.get(job.target_language, job.target_language or 'Unknown')
     
     return JobStatusResponse(
         job_id=job.job_id,
@@ -258,16 +551,110 @@ async def get_translation_status(job_id: str):
         estimated_cost=job.estimated_cost,
         actual_cost=job.actual_cost,
         eta_seconds=job.eta_seconds,
-        estimated_total_seconds=getattr(job, 'estimated_total_seconds', None),
+        estimated_total_seconds=job.estimated_total_seconds,
         elapsed_seconds=elapsed,
         target_language=target_language_name,
-        model=getattr(job, 'model', None),
+        model=job.model,
         error_message=job.error_message,
+        files=job.files,
+        timings=job.timings,
+    )
+
+
+def format_sse(event: str, data: Any) -> str:
+    
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.get("/api/translate/{job_id}/events")
+async def stream_translation_events(job_id: str, request: Request):
+    
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado")
+    
+    stream = job_events.subscribe(job_id)
+    
+    async def event_generator():
+        nonlocal job
+        try:
+            yield format_sse("status", jsonable_encoder(build_job_status(job)))
+            
+            last_sent = time.monotonic()
+            while job.status not in ("completed", "failed", "cancelled"):
+                local = is_job_local(job_id)
+                if await stream.wait(SSE_KEEPALIVE_SECONDS if local else SSE_STORE_POLL_SECONDS):
+                    # Agrupa os eventos da janela num único envio
+                    await asyncio.sleep(SSE_COALESCE_SECONDS)
+                    pending = stream.drain()
+                else:
+                    if await request.is_disconnected():
+                        return
+                    if local:
+                        yield ": keepalive\n\n"
+                        continue
+                    
+                    previous = job.snapshot()
+                    job = get_job(job_id)
+                    if job is None:
+                        return
+                    if job.snapshot() == previous:
+                        if time.monotonic() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                            yield ": keepalive\n\n"
+                            last_sent = time.monotonic()
+                        continue
+                    pending = {"events": [], "dropped": 0}
+                
+                yield format_sse("progress", {
+                    "status": jsonable_encoder(build_job_status(job)),
+                    "batches": [e for e in pending["events"] if e["type"] == "batch"],
+                    "dropped": pending["dropped"],
+                })
+                last_sent = time.monotonic()
+            
+            yield format_sse("done", jsonable_encoder(build_job_status(job)))
+        finally:
+            job_events.unsubscribe(stream)
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def build_bundle_zip(job: TranslationJob) -> bytes:
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        # Mesma árvore de diretórios do .zip de entrada
+        for name, data in get_result_data(job).items():
+            zf.writestr(name, json.dumps(data, ensure_ascii=False, indent=2))
+    return buffer.getvalue()
+
+
+@app.get("/api/translate/{job_id}/bundle")
+async def download_translation_bundle(job_id: str):
+    
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado")
+    
+    if job.status != "completed" or job.files is None:
+        raise HTTPException(status_code=400, detail=f"Job não é um lote concluído. Status: {job.status}")
+    
+    content = await asyncio.to_thread(build_bundle_zip, job)
+    
+    lang = job.target_language or (job.config or {}).get("target_language") or 'unknown'
+    return Response(
+        content=content,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="translated_{job_id[:8]}_{lang}.zip"'},
     )
 
 
 @app.get("/api/translate/{job_id}/result")
-async def get_translation_result(job_id: str):
+async def get_translation_result(job_id: str, request: Request):
     
     job = get_job(job_id)
     if not job:
@@ -279,51 +666,58 @@ async def get_translation_result(job_id: str):
             detail=f"Job ainda não concluído. Status: {job.status}"
         )
     
-    if not job.result_data:
+    if not job.result_payload:
         raise HTTPException(status_code=500, detail="Resultado não disponível")
     
+    return await payload_response(request, job.result_payload)
 
-    from core.translator_service import flatten_object
-    from scripts.script_openai import DEFAULT_ON_FAILURE
+
+@app.get("/api/translate/{job_id}/trace")
+async def download_job_trace(job_id: str):
+    
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado")
     
-    flat_result = flatten_object(job.result_data)
+    trace_path = get_trace_path(job.job_id)
+    if not trace_path.exists():
+        if job.status in FINISHED_STATUSES:
+            raise HTTPException(status_code=404, detail="Trace não disponível para este job")
+        raise HTTPException(status_code=400, detail=f"Trace disponível quando o job terminar. Status: {job.status}")
     
+    # Formato de eventos do Chrome: abre em chrome://tracing ou ui.perfetto.dev
+    return FileResponse(
+        path=str(trace_path),
+        filename=f"trace_{job_id[:8]}.json",
+        media_type="application/json",
+    )
 
-    failed_keys = []
-    empty_keys = []
-    needs_review_keys = []
+
+@app.get("/api/translate/{job_id}/profile")
+async def download_job_profile(job_id: str, format: str = "pstats"):
     
-    for entry in flat_result:
-        key = entry["key"]
-        value = entry["value"]
-        if isinstance(value, str):
-            if value == DEFAULT_ON_FAILURE:
-                needs_review_keys.append(key)
-            elif len(value) == 0:
-                empty_keys.append(key)
-            elif value.strip() == "":
-                empty_keys.append(key)
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado")
     
-    failed_keys = needs_review_keys + empty_keys
+    files = get_profile_files(job.job_id)
+    if format not in files:
+        raise HTTPException(status_code=400, detail=f"Formato deve ser {', '.join(files)}")
     
-    return {
-        "success": True,
-        "job_id": job.job_id,
-        "data": job.result_data,
-        "stats": {
-            "total_strings": job.total_strings,
-            "translated": job.translated_strings,
-            "cached": job.cached_strings,
-            "cost_usd": job.actual_cost,
-            "tokens": job.stats["total_tokens"],
-            "errors": job.stats.get("errors", 0),
-            "failed_keys": failed_keys[:50],
-            "failed_count": len(failed_keys),
-            "needs_review_count": len(needs_review_keys),
-            "empty_count": len(empty_keys),
-        },
-        "error_message": job.error_message,
-    }
+    profile_path = files[format]
+    if not profile_path.exists():
+        if job.status not in FINISHED_STATUSES:
+            raise HTTPException(status_code=400, detail=f"Perfil disponível quando o job terminar. Status: {job.status}")
+        if format == "alloc" and files["pstats"].exists():
+            raise HTTPException(status_code=404, detail="Job perfilado sem profile_memory")
+        raise HTTPException(status_code=404, detail="Perfil não disponível para este job (inicie com \"profile\": true)")
+    
+    # pstats abre com python -m pstats ou snakeviz; text e alloc são relatórios prontos
+    return FileResponse(
+        path=str(profile_path),
+        filename=f"profile_{job_id[:8]}{profile_path.name[len(job.job_id):]}",
+        media_type="application/octet-stream" if format == "pstats" else "text/plain",
+    )
 
 
 @app.get("/api/models")
@@ -381,6 +775,23 @@ async def get_languages():
     }
 
 
+@app.get("/metrics")
+async def get_metrics():
+    
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/api/telemetry/latency")
+async def get_latency_models():
+    
+    # Modelo de latência ajustado por backend/modelo a partir dos batches já executados
+    models = await asyncio.to_thread(latency_summary)
+    return {
+        "success": True,
+        "models": models,
+    }
+
+
 @app.get("/api/jobs")
 async def list_all_jobs():
     
@@ -396,12 +807,38 @@ async def list_all_jobs():
             for job in jobs
         ],
         "total": len(jobs),
+        "store": get_job_store_stats(),
+    }
+
+
+@app.post("/api/translate/{job_id}/cancel")
+async def cancel_translation_job(job_id: str, keep_partial: bool = True):
+    
+    job = cancel_job(job_id, keep_partial)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado")
+    
+    if job.status in ("completed", "failed", "cancelled"):
+        return {
+            "success": False,
+            "job_id": job_id,
+            "status": job.status,
+            "message": f"Job já finalizado ({job.status})",
+        }
+    
+    return {
+        "success": True,
+        "job_id": job_id,
+        "status": job.status,
+        "message": "Cancelamento solicitado; o status muda para 'cancelled' quando o job parar",
     }
 
 
 @app.delete("/api/translate/{job_id}")
 async def delete_translation_job(job_id: str):
     
+    # Um job em andamento é cancelado antes de sair da lista, para não continuar gastando tokens
+    cancel_job(job_id)
     deleted = delete_job(job_id)
     if not deleted:
         raise HTTPException(status_code=404, detail=f"Job {job_id} não encontrado")
@@ -425,20 +862,21 @@ async def save_translation_result(job_id: str, filename: Optional[str] = None):
             detail=f"Job ainda não concluído. Status: {job.status}"
         )
     
-    if not job.result_data:
+    # Descomprimir o resultado e gravar o arquivo são feitos numa thread, fora do event loop
+    result_data = await asyncio.to_thread(get_result_data, job)
+    if not result_data:
         raise HTTPException(status_code=500, detail="Resultado não disponível")
     
 
     output_dir = Path("output")
     output_dir.mkdir(exist_ok=True)
     
+    if job.files is not None:
+        return await asyncio.to_thread(save_bundle_result, job, result_data, output_dir, filename)
+    
 
     if not filename:
-        target_lang = getattr(job, 'config', None)
-        if target_lang and hasattr(target_lang, 'target_language'):
-            lang = target_lang.target_language
-        else:
-            lang = 'unknown'
+        lang = job.target_language or (job.config or {}).get("target_language") or 'unknown'
         filename = f"translated_{job_id[:8]}_{lang}.json"
     
 
@@ -449,10 +887,14 @@ async def save_translation_result(job_id: str, filename: Optional[str] = None):
     
 
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(job.result_data, f, ensure_ascii=False, indent=2)
-        
-        file_size = output_path.stat().st_size
+        file_size = await asyncio.to_thread(
+            write_translated_file,
+            output_path,
+            result_data,
+            language_code=job.target_language or (job.config or {}).get("target_language"),
+            source=(job.config or {}).get("source_filename"),
+            job_id=job_id,
+        )
         
         return {
             "success": True,
@@ -465,6 +907,48 @@ async def save_translation_result(job_id: str, filename: Optional[str] = None):
         raise HTTPException(status_code=500, detail=f"Erro ao salvar arquivo: {str(e)}")
 
 
+def write_translated_file(output_path: Path, data: Dict[str, Any], **fields: Any) -> int:
+    
+    # Grava num arquivo temporário e renomeia: leitores nunca veem um arquivo pela metade
+    write_json_atomic(output_path, data)
+    _file_payload_cache.pop(output_path.name, None)
+    file_offsets.remove(output_path.name)
+    entry = file_index.record(output_path.name, data, **fields)
+    search_index.index_file(output_path.name, data, entry.get("language_code"))
+    return entry["size"]
+
+
+def save_bundle_result(job: TranslationJob, result_data: Dict[str, Any], output_dir: Path, dirname: Optional[str]) -> Dict[str, Any]:
+    
+    if not dirname:
+        lang = job.target_language or (job.config or {}).get("target_language") or 'unknown'
+        dirname = f"translated_{job.job_id[:8]}_{lang}"
+    
+    bundle_dir = (output_dir / Path(dirname).name).resolve()
+    total_size = 0
+    try:
+        for name, data in result_data.items():
+            output_path = (bundle_dir / name).resolve()
+            if bundle_dir not in output_path.parents:
+                raise HTTPException(status_code=400, detail=f"Caminho inválido no lote: {name}")
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(output_path, data)
+            total_size += output_path.stat().st_size
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao salvar lote: {str(e)}")
+    
+    return {
+        "success": True,
+        "directory": bundle_dir.name,
+        "path": str(output_dir / bundle_dir.name),
+        "files": len(result_data),
+        "size": total_size,
+        "size_kb": round(total_size / 1024, 2),
+    }
+
+
 def extract_language_from_filename(filename: str) -> Optional[str]:
     
 
@@ -487,81 +971,288 @@ def get_language_name(lang_code: Optional[str]) -> Optional[str]:
     if not lang_code:
         return None
     
-    language_map = {
-        "es": "Espanhol",
-        "pt": "Português",
-        "fr": "Francês",
-        "de": "Alemão",
-        "it": "Italiano",
-        "nl": "Holandês",
-        "pl": "Polonês",
-        "sv": "Sueco",
-        "da": "Dinamarquês",
-        "no": "Norueguês",
-        "fi": "Finlandês",
-        "cs": "Tcheco",
-        "hu": "Húngaro",
-        "ro": "Romeno",
-        "hr": "Croata",
-        "sr": "Sérvio (Latinizado)",
-        "tr": "Turco",
-        "id": "Indonésio",
-        "tl": "Filipino (Tagalog)",
-        "ms": "Malaio",
-    }
+    return LANGUAGE_NAMES.get(lang_code)
+
+
+# Metadados dos arquivos salvos; criado após extract_language_from_filename
+file_index = FileIndex(Path("output"), detect_language=extract_language_from_filename)
+file_offsets = FileOffsetIndex(Path("output"))
+search_index = SearchIndex(Path("output"))
+compare_cache = CompareCache()
+
+
+def describe_file_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
     
-    return language_map.get(lang_code)
+    return {
+        "filename": entry["filename"],
+        "size": entry["size"],
+        "size_kb": round(entry["size"] / 1024, 2),
+        "size_mb": round(entry["size"] / (1024 * 1024), 2),
+        "created": entry["created"],
+        "modified": entry["modified"],
+        "language_code": entry.get("language_code"),
+        "language_name": get_language_name(entry.get("language_code")),
+        "source": entry.get("source"),
+        "job_id": entry.get("job_id"),
+        "keys": entry.get("keys"),
+        "strings": entry.get("strings"),
+        "needs_review": entry.get("needs_review"),
+    }
 
 
 @app.get("/api/files")
-async def list_translated_files():
+async def list_translated_files(
+    page: int = 1,
+    page_size: int = 50,
+    language: Optional[str] = None,
+    search: Optional[str] = None,
+    job_id: Optional[str] = None,
+    sort: str = "modified",
+    order: str = "desc",
+):
     
-    output_dir = Path("output")
+    if sort not in SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort deve ser um de: {', '.join(SORT_FIELDS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order deve ser 'asc' ou 'desc'")
+    if page < 1 or page_size < 1 or page_size > 500:
+        raise HTTPException(status_code=400, detail="page deve ser >= 1 e page_size entre 1 e 500")
     
-    if not output_dir.exists():
-        return {
-            "success": True,
-            "files": [],
-            "total": 0,
-        }
+    # Na primeira consulta (ou depois de mudanças por fora) o índice relê os arquivos alterados
+    entries, total = await asyncio.to_thread(
+        file_index.query,
+        language=language,
+        search=search,
+        job_id=job_id,
+        sort=sort,
+        order=order,
+        page=page,
+        page_size=page_size,
+    )
     
-    files = []
-    for file_path in output_dir.glob("*.json"):
-        if file_path.name == ".gitkeep":
-            continue
-        
+    return {
+        "success": True,
+        "files": [describe_file_entry(entry) for entry in entries],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": (total + page_size - 1) // page_size,
+    }
+
+
+def file_envelope_prefix(filename: str) -> bytes:
+    
+    return f'{{"success":true,"filename":{json.dumps(filename, ensure_ascii=False)},"data":'.encode("utf-8")
+
+
+def load_file_payload(file_path: Path, filename: str, etag: str) -> CompressedPayload:
+    
+    # Roda numa thread. O conteúdo vai cru dentro do envelope, mas antes é validado:
+    # um arquivo corrompido ou truncado geraria um corpo 200 com JSON inválido
+    raw = file_path.read_bytes()
+    json.loads(raw)
+    return CompressedPayload(file_envelope_prefix(filename) + raw + b"}", etag)
+
+
+def stream_file_envelope(request: Request, file_path: Path, filename: str, etag: str) -> StreamingResponse:
+    
+    # O StreamingResponse consome o gerador numa thread, fora do event loop
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    
+    def chunks():
+        yield file_envelope_prefix(filename)
+        yield from iter_file_chunks(file_path)
+        yield b"}"
+    
+    return StreamingResponse(
+        iter_compressed(chunks(), encoding),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+async def read_file_slice(
+    filename: str,
+    pointer: Optional[str],
+    prefix: Optional[str],
+    page: Optional[int],
+    page_size: int,
+) -> Dict[str, Any]:
+    
+    if pointer is not None:
         try:
-            stat = file_path.stat()
-            
+            parse_pointer(pointer)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if (page is not None and page < 1) or page_size < 1 or page_size > 1000:
+        raise HTTPException(status_code=400, detail="page deve ser >= 1 e page_size entre 1 e 1000")
+    
+    try:
+        # Na primeira consulta o índice de offsets do arquivo é construído (uma vez por versão)
+        if prefix is None and page is None:
+            data = await asyncio.to_thread(file_offsets.subtree, filename, pointer)
+            return {"success": True, "filename": filename, "pointer": pointer, "data": data}
+        
+        page = page or 1
+        entries, total = await asyncio.to_thread(
+            file_offsets.entries, filename, pointer, prefix, page, page_size,
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Caminho {pointer} não encontrado em {filename}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Arquivo JSON inválido: {str(e)}")
+    
+    return {
+        "success": True,
+        "filename": filename,
+        "pointer": pointer,
+        "prefix": prefix,
+        "entries": entries,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": (total + page_size - 1) // page_size,
+    }
 
-            lang_code = extract_language_from_filename(file_path.name)
-            lang_name = get_language_name(lang_code)
-            
-            files.append({
-                "filename": file_path.name,
-                "size": stat.st_size,
-                "size_kb": round(stat.st_size / 1024, 2),
-                "size_mb": round(stat.st_size / (1024 * 1024), 2),
-                "created": stat.st_ctime,
-                "modified": stat.st_mtime,
-                "language_code": lang_code,
-                "language_name": lang_name,
-            })
-        except Exception:
-            continue
-    
-
-    files.sort(key=lambda x: x["modified"], reverse=True)
+
+@app.get("/api/search")
+async def search_translated_files(
+    q: str,
+    field: Optional[str] = None,
+    language: Optional[str] = None,
+    filename: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50,
+):
+    
+    if field is not None and field not in SEARCH_FIELDS:
+        raise HTTPException(status_code=400, detail=f"field deve ser um de: {', '.join(SEARCH_FIELDS)}")
+    if page < 1 or page_size < 1 or page_size > 200:
+        raise HTTPException(status_code=400, detail="page deve ser >= 1 e page_size entre 1 e 200")
+    
+    def run_search():
+        # Arquivos alterados por fora da API entram no índice antes da busca
+        search_index.sync(file_index.entries())
+        return search_index.search(q, field, language, filename, page, page_size)
+    
+    start_time = time.perf_counter()
+    results, total = await asyncio.to_thread(run_search)
+    
+    return {
+        "success": True,
+        "query": q,
+        "results": results,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": (total + page_size - 1) // page_size,
+        "took_ms": round((time.perf_counter() - start_time) * 1000, 2),
+    }
+
+
+async def read_compare_side(upload: Optional[UploadFile], filename: Optional[str], label: str) -> Tuple[bytes, str]:
+    
+    if upload is not None:
+        return await upload.read(), upload.filename
+    if not filename:
+        raise HTTPException(status_code=400, detail=f"Envie {label} ou o nome de um arquivo salvo")
+    
+    output_dir = Path("output")
+    file_path = output_dir / filename
+    if not str(file_path.resolve()).startswith(str(output_dir.resolve())):
+        raise HTTPException(status_code=403, detail="Acesso negado")
+    if not file_path.is_file():
+        raise HTTPException(status_code=404, detail=f"Arquivo {filename} não encontrado")
+    return await asyncio.to_thread(file_path.read_bytes), filename
+
+
+@app.post("/api/compare")
+async def compare_json_files(
+    file1: Optional[UploadFile] = File(None),
+    file2: Optional[UploadFile] = File(None),
+    filename1: Optional[str] = Form(None),
+    filename2: Optional[str] = Form(None),
+):
+    
+    left_raw, left_name = await read_compare_side(file1, filename1, "file1")
+    right_raw, right_name = await read_compare_side(file2, filename2, "file2")
+    
+    start_time = time.perf_counter()
+    try:
+        # O resultado é guardado pelo par de hashes: a mesma comparação não é refeita
+        result, cached = await asyncio.to_thread(compare_cache.compare, left_raw, right_raw, left_name, right_name)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Erro ao parsear JSON: {str(e)}")
     
     return {
         "success": True,
-        "files": files,
-        "total": len(files),
+        "compare_id": result["compare_id"],
+        "cached": cached,
+        "left": {**result["left"], "name": left_name},
+        "right": {**result["right"], "name": right_name},
+        "summary": result["summary"],
+        "took_ms": round((time.perf_counter() - start_time) * 1000, 2),
     }
 
 
+@app.get("/api/compare/{compare_id}")
+async def get_compare_diffs(
+    compare_id: str,
+    category: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 200,
+):
+    
+    if category is not None and category not in DIFF_STATUSES:
+        raise HTTPException(status_code=400, detail=f"category deve ser um de: {', '.join(DIFF_STATUSES)}")
+    if page < 1 or page_size < 1 or page_size > 1000:
+        raise HTTPException(status_code=400, detail="page deve ser >= 1 e page_size entre 1 e 1000")
+    
+    try:
+        diffs, total = await asyncio.to_thread(compare_cache.page, compare_id, category, page, page_size)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Comparação {compare_id} não encontrada")
+    
+    return {
+        "success": True,
+        "compare_id": compare_id,
+        "category": category,
+        "diffs": diffs,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": (total + page_size - 1) // page_size,
+    }
+
+
+@app.get("/api/compare/{compare_id}/report")
+async def download_compare_report(compare_id: str):
+    
+    try:
+        report = await asyncio.to_thread(compare_cache.report, compare_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Comparação {compare_id} não encontrada")
+    
+    body = await asyncio.to_thread(json.dumps, report, ensure_ascii=False, indent=2)
+    return Response(
+        content=body.encode("utf-8"),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="comparison-report_{compare_id}.json"'},
+    )
+
+
 @app.get("/api/files/{filename}")
-async def get_translated_file(filename: str):
+async def get_translated_file(
+    filename: str,
+    request: Request,
+    pointer: Optional[str] = None,
+    prefix: Optional[str] = None,
+    page: Optional[int] = None,
+    page_size: int = 100,
+):
     
     output_dir = Path("output")
     file_path = output_dir / filename
@@ -577,17 +1268,38 @@ async def get_translated_file(filename: str):
     if not str(file_path.resolve()).startswith(str(output_dir.resolve())):
         raise HTTPException(status_code=403, detail="Acesso negado")
     
+    if pointer is not None or prefix is not None or page is not None:
+        return await read_file_slice(filename, pointer, prefix, page, page_size)
+    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        stat = file_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
         
-        return {
-            "success": True,
-            "filename": filename,
-            "data": data,
-        }
+        cached = _file_payload_cache.get(filename)
+        if cached and cached[0] == signature:
+            _file_payload_cache.move_to_end(filename)
+            payload = cached[1]
+        else:
+            etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+            
+            if stat.st_size > FILE_STREAM_THRESHOLD:
+                # Arquivos grandes são validados pelo índice de offsets (feito uma vez por versão)
+                await asyncio.to_thread(file_offsets.ensure, filename)
+                return stream_file_envelope(request, file_path, filename, etag)
+            
+            payload = await asyncio.to_thread(load_file_payload, file_path, filename, etag)
+            _file_payload_cache[filename] = (signature, payload)
+            while len(_file_payload_cache) > FILE_PAYLOAD_CACHE_SIZE:
+                _file_payload_cache.popitem(last=False)
+        
+        return await payload_response(request, payload)
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Arquivo JSON inválido")
+    except ValueError as e:
+        # UnicodeDecodeError e erros do scanner de offsets (arquivos grandes)
+        raise HTTPException(status_code=400, detail=f"Arquivo JSON inválido: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao ler arquivo: {str(e)}")
 
@@ -612,6 +1324,15 @@ async def download_translated_file(filename: str):
     )
 
 
+def remove_translated_file(file_path: Path) -> None:
+    
+    file_path.unlink()
+    _file_payload_cache.pop(file_path.name, None)
+    file_index.remove(file_path.name)
+    file_offsets.remove(file_path.name)
+    search_index.remove(file_path.name)
+
+
 @app.delete("/api/files/{filename}")
 async def delete_translated_file(filename: str):
     
@@ -626,7 +1347,7 @@ async def delete_translated_file(filename: str):
         raise HTTPException(status_code=403, detail="Acesso negado")
     
     try:
-        file_path.unlink()
+        await asyncio.to_thread(remove_translated_file, file_path)
         return {
             "success": True,
             "message": f"Arquivo {filename} removido",
@@ -636,5 +1357,6 @@ async def delete_translated_file(filename: str):
 
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
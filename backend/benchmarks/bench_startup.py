@@ -0,0 +1,197 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+RESULTS_VERSION = 1
+BACKEND_DIR = Path(__file__).parent.parent
+DEFAULT_REPEAT = 5
+DEFAULT_OUTPUT_DIR = Path("output/.benchmarks")
+# A API tem que subir bem abaixo disso (mediana do import de api.api)
+DEFAULT_BUDGET = 1.0
+# Pacotes por tempo próprio de import mostrados no relatório
+TOP_PACKAGES = 12
+# Dependências que só devem ser importadas no primeiro uso
+LAZY_MODULES = ("openai", "deep_translator", "uvicorn")
+
+# Cada alvo roda num processo novo: o tempo inclui o import de todas as dependências
+TARGETS = {
+    "script_openai": "import scripts.script_openai",
+    "translator_service": "import core.translator_service",
+    "api": "import api.api",
+    # Custo que saiu do import: pacote openai + primeiro cliente (sem rede)
+    "openai_client": "import scripts.script_openai as s; s.create_openai_client()",
+}
+
+CHILD_CODE = """
+import json, sys, time
+started = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def parse_args() -> Dict[str, Any]:
+
+    args = {
+        "only": list(TARGETS),
+        "repeat": DEFAULT_REPEAT,
+        "budget": DEFAULT_BUDGET,
+        "output": None,
+    }
+
+    def value_after(flag: str) -> Optional[str]:
+        if flag in sys.argv:
+            idx = sys.argv.index(flag)
+            if idx + 1 < len(sys.argv):
+                return sys.argv[idx + 1]
+        return None
+
+    if value_after("--only"):
+        args["only"] = [part.strip() for part in value_after("--only").split(",") if part.strip()]
+    if value_after("--repeat"):
+        args["repeat"] = max(1, int(value_after("--repeat")))
+    if value_after("--budget"):
+        args["budget"] = float(value_after("--budget"))
+    if value_after("--output"):
+        args["output"] = Path(value_after("--output"))
+
+    unknown = [name for name in args["only"] if name not in TARGETS]
+    if unknown:
+        print(f"❌ Alvos desconhecidos: {', '.join(unknown)} (use {', '.join(TARGETS)})")
+        sys.exit(2)
+    return args
+
+
+def git_revision() -> Optional[str]:
+
+    # Sem importar bench_transforms, que prepara o ambiente dele no import
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.strip() or None
+
+
+def child_env(target: str, work_dir: Path) -> Dict[str, str]:
+
+    env = dict(os.environ)
+    # Sem credenciais: a API e os scripts têm que importar sem a chave da OpenAI
+    env.pop("OPENAI_API_KEY", None)
+    if target == "openai_client":
+        env["OPENAI_API_KEY"] = "sk-startup-benchmark"
+    env["PYTHONPATH"] = str(BACKEND_DIR) + os.pathsep + env.get("PYTHONPATH", "")
+    env["API_CACHE_DIR"] = str(work_dir / "cache")
+    env["TELEMETRY_DB_PATH"] = str(work_dir / "telemetry.db")
+    return env
+
+
+def run_child(target: str, work_dir: Path, importtime: bool = False) -> subprocess.CompletedProcess:
+
+    code = CHILD_CODE.format(statement=TARGETS[target], lazy=LAZY_MODULES)
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    # cwd temporário: o output/ relativo da API não suja o repositório
+    completed = subprocess.run(
+        command, cwd=work_dir, env=child_env(target, work_dir), capture_output=True, text=True, timeout=120,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{target} falhou:\n{completed.stderr[-2000:]}")
+    return completed
+
+
+def import_breakdown(stderr: str) -> List[Dict[str, Any]]:
+
+    # Linhas "import time: self [us] | cumulative | nome", somadas por pacote de topo
+    packages: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]
+    return [{"package": package, "seconds": round(us / 1_000_000, 4)} for package, us in top]
+
+
+def measure_target(target: str, repeat: int, work_dir: Path) -> Dict[str, Any]:
+
+    # Primeira execução descartada: aquece o cache de disco e os .pyc
+    run_child(target, work_dir)
+    timings, loaded = [], []
+    for _ in range(repeat):
+        result = json.loads(run_child(target, work_dir).stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        loaded = result["loaded"]
+    return {
+        "name": target,
+        "runs": repeat,
+        "best_seconds": round(min(timings), 4),
+        "median_seconds": round(statistics.median(timings), 4),
+        "lazy_loaded": loaded,
+        "packages": import_breakdown(run_child(target, work_dir, importtime=True).stderr),
+    }
+
+
+def main():
+
+    args = parse_args()
+    print(f"🚀 Tempo de import em processos novos | {', '.join(args['only'])} | {args['repeat']} execuções\n")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="json-translator-startup-") as work_dir:
+        for target in args["only"]:
+            result = measure_target(target, args["repeat"], Path(work_dir))
+            results.append(result)
+            top = ", ".join(f"{p['package']} {p['seconds'] * 1000:.0f}ms" for p in result["packages"][:5])
+            print(f"  {target:<20} mediana {result['median_seconds'] * 1000:>7.1f} ms | melhor {result['best_seconds'] * 1000:>7.1f} ms"
+                  f" | carregados: {', '.join(result['lazy_loaded']) or '-'}")
+            print(f"  {'':<20} {top}")
+
+    revision = git_revision()
+    report = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": {"repeat": args["repeat"], "budget": args["budget"]},
+        "results": results,
+    }
+
+    output_path = args["output"]
+    if output_path is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output_path = DEFAULT_OUTPUT_DIR / f"startup_{stamp}_{revision or 'norev'}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Resultados salvos em {output_path}")
+
+    api = next((r for r in results if r["name"] == "api"), None)
+    if api is not None:
+        problems = []
+        if api["median_seconds"] > args["budget"]:
+            problems.append(f"import da API em {api['median_seconds']:.2f}s (limite {args['budget']:.2f}s)")
+        if api["lazy_loaded"]:
+            problems.append(f"a API importou {', '.join(api['lazy_loaded'])} na inicialização")
+        if problems:
+            print(f"\n❌ {'; '.join(problems)}")
+            sys.exit(1)
+        print(f"\n✅ API sobe em {api['median_seconds']:.2f}s, sem chave da OpenAI e sem {', '.join(LAZY_MODULES)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Tudo offline, sem chave da OpenAI. Cache e telemetria vão para um diretório temporário
+# (a estimativa usa o modelo de latência padrão)
+BENCH_WORK_DIR = Path(tempfile.mkdtemp(prefix="json-translator-bench-"))
+os.environ["API_CACHE_DIR"] = str(BENCH_WORK_DIR / "cache")
+os.environ["TELEMETRY_DB_PATH"] = str(BENCH_WORK_DIR / "telemetry.db")
+
+from scripts.script_openai import (
+    flatten_object,
+    mask_placeholders,
+    restore_placeholders,
+    reconstruct_json_preserving_order,
+)
+from core.translator_service import validate_json, estimate_translation
+from core.translation_cache import load_translation_cache, merge_translation_cache, get_translation_cache_path
+from core.payload_cache import encode_json_payload
+from benchmarks.datasets import SHAPES, generate_document, string_values
+
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_REPEAT = 5
+DEFAULT_OUTPUT_DIR = Path("output/.benchmarks")
+# Diferença de tempo (melhor execução) acima disso conta como regressão no --compare
+DEFAULT_THRESHOLD = 0.2
+# Medições abaixo disso variam demais para acusar regressão
+MIN_COMPARE_SECONDS = 0.001
+
+BENCHMARKS = (
+    "flatten_object", "mask_placeholders", "restore_placeholders", "reconstruct_json",
+    "validate_json", "estimate_translation", "cache_save", "cache_load", "encode_result_payload",
+)
+
+
+def parse_args() -> Dict[str, Any]:
+
+    args = {
+        "sizes": list(DEFAULT_SIZES),
+        "shapes": list(SHAPES),
+        "only": list(BENCHMARKS),
+        "repeat": DEFAULT_REPEAT,
+        "output": None,
+        "compare": None,
+        "threshold": DEFAULT_THRESHOLD,
+    }
+
+    def value_after(flag: str) -> Optional[str]:
+        if flag in sys.argv:
+            idx = sys.argv.index(flag)
+            if idx + 1 < len(sys.argv):
+                return sys.argv[idx + 1]
+        return None
+
+    def split(value: str) -> List[str]:
+        return [part.strip() for part in value.split(",") if part.strip()]
+
+    if value_after("--sizes"):
+        args["sizes"] = [int(float(size)) for size in split(value_after("--sizes"))]
+    if value_after("--shapes"):
+        args["shapes"] = split(value_after("--shapes"))
+    if value_after("--only"):
+        args["only"] = split(value_after("--only"))
+    if value_after("--repeat"):
+        args["repeat"] = max(1, int(value_after("--repeat")))
+    if value_after("--output"):
+        args["output"] = Path(value_after("--output"))
+    if value_after("--compare"):
+        args["compare"] = Path(value_after("--compare"))
+    if value_after("--threshold"):
+        args["threshold"] = float(value_after("--threshold"))
+
+    unknown = [name for name in args["only"] if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Benchmarks desconhecidos: {', '.join(unknown)} (use {', '.join(BENCHMARKS)})")
+        sys.exit(2)
+    return args
+
+
+def measure(func: Callable[[], Any], runs: int, setup: Optional[Callable[[], Any]] = None) -> List[float]:
+
+    timings = []
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def build_cases(document: Any) -> Dict[str, Any]:
+
+    # Entradas de cada benchmark, preparadas fora da medição
+    entries = flatten_object(document)
+    values = string_values(entries)
+    masked = [mask_placeholders(value) for value in values]
+    translated = {e["key"]: f"{e['value']} (es)" for e in entries if isinstance(e["value"], str)}
+    cache_entries = {value: f"{value} (es)" for value in values}
+    cache_path = get_translation_cache_path("bench")
+
+    def reset_cache():
+        cache_path.unlink(missing_ok=True)
+
+    def fill_cache():
+        if not cache_path.exists():
+            merge_translation_cache("bench", cache_entries)
+
+    return {
+        "flatten_object": (lambda: flatten_object(document), None),
+        "mask_placeholders": (lambda: [mask_placeholders(value) for value in values], None),
+        "restore_placeholders": (lambda: [restore_placeholders(text, ph_map) for text, ph_map in masked], None),
+        "reconstruct_json": (lambda: reconstruct_json_preserving_order(document, translated), None),
+        "validate_json": (lambda: validate_json(document), None),
+        "estimate_translation": (lambda: estimate_translation(document, "es"), None),
+        "cache_save": (lambda: merge_translation_cache("bench", cache_entries), reset_cache),
+        "cache_load": (lambda: load_translation_cache("bench"), fill_cache),
+        "encode_result_payload": (lambda: encode_json_payload({"success": True, "data": document}), None),
+    }
+
+
+def run_benchmarks(args: Dict[str, Any]) -> List[Dict[str, Any]]:
+
+    results = []
+    for shape in args["shapes"]:
+        for leaves in args["sizes"]:
+            document = generate_document(shape, leaves)
+            cases = build_cases(document)
+            # Documentos grandes rodam uma vez só (uma execução já leva segundos)
+            runs = args["repeat"] if leaves < 1_000_000 else 1
+            for name in args["only"]:
+                func, setup = cases[name]
+                timings = measure(func, runs, setup)
+                result = {
+                    "name": name,
+                    "shape": shape,
+                    "leaves": leaves,
+                    "runs": runs,
+                    "best_seconds": round(min(timings), 6),
+                    "median_seconds": round(statistics.median(timings), 6),
+                    "per_leaf_us": round(min(timings) / leaves * 1e6, 4),
+                }
+                results.append(result)
+                print(f"  {name:<22} {shape:<13} {leaves:>9,} folhas  "
+                      f"{result['best_seconds'] * 1000:>10.2f} ms  {result['per_leaf_us']:>8.3f} µs/folha")
+            get_translation_cache_path("bench").unlink(missing_ok=True)
+    return results
+
+
+def git_revision() -> Optional[str]:
+
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare_results(current: List[Dict[str, Any]], baseline_path: Path, threshold: float) -> List[Dict[str, Any]]:
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(r["name"], r["shape"], r["leaves"]): r for r in baseline.get("results", [])}
+
+    regressions = []
+    print(f"\n📊 Comparação com {baseline_path} ({baseline.get('git_revision') or 'sem revisão'}):")
+    for result in current:
+        old = previous.get((result["name"], result["shape"], result["leaves"]))
+        if old is None or old["best_seconds"] <= 0:
+            continue
+        ratio = result["best_seconds"] / old["best_seconds"]
+        regressed = ratio > 1 + threshold and result["best_seconds"] >= MIN_COMPARE_SECONDS
+        marker = "❌" if regressed else ("✅" if ratio < 1 - threshold else "  ")
+        print(f"  {marker} {result['name']:<22} {result['shape']:<13} {result['leaves']:>9,}  "
+              f"{old['best_seconds'] * 1000:>10.2f} → {result['best_seconds'] * 1000:>10.2f} ms  ({ratio:.2f}x)")
+        if regressed:
+            regressions.append({**result, "baseline_seconds": old["best_seconds"], "ratio": round(ratio, 3)})
+    return regressions
+
+
+def main():
+
+    args = parse_args()
+    print(f"⏱️  Benchmarks offline: {', '.join(args['shapes'])} | "
+          f"{', '.join(f'{size:,}' for size in args['sizes'])} folhas | {args['repeat']} execuções\n")
+
+    try:
+        results = run_benchmarks(args)
+    finally:
+        shutil.rmtree(BENCH_WORK_DIR, ignore_errors=True)
+
+    revision = git_revision()
+    report = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": {"sizes": args["sizes"], "shapes": args["shapes"], "repeat": args["repeat"]},
+        "results": results,
+    }
+
+    output_path = args["output"]
+    if output_path is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output_path = DEFAULT_OUTPUT_DIR / f"bench_{stamp}_{revision or 'norev'}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Resultados salvos em {output_path}")
+
+    if args["compare"] is not None:
+        regressions = compare_results(results, args["compare"], args["threshold"])
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressões acima de {args['threshold']:.0%}")
+            sys.exit(1)
+        print(f"\n✅ Nenhuma regressão acima de {args['threshold']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import random
+from typing import Any, Callable, Dict, List
+
+
+SHAPES = ("flat", "nested", "arrays", "placeholders")
+
+WORDS = (
+    "account", "settings", "save", "cancel", "your", "profile", "was", "updated", "successfully",
+    "please", "try", "again", "later", "the", "file", "could", "not", "be", "uploaded", "welcome",
+    "back", "delete", "this", "item", "permanently", "notifications", "are", "disabled", "for",
+    "team", "members", "invite", "new", "password", "must", "contain", "at", "least", "characters",
+)
+
+PLACEHOLDERS = ("{name}", "{{count}}", "%s", "%d", "{ user.email }", "{{ date }}")
+
+
+def make_text(rng: random.Random, placeholders: int = 0) -> str:
+
+    words = [rng.choice(WORDS) for _ in range(rng.randint(2, 12))]
+    for _ in range(placeholders):
+        words.insert(rng.randint(0, len(words)), rng.choice(PLACEHOLDERS))
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + rng.choice(("", ".", "!", "?"))
+
+
+def _flat(rng: random.Random, leaves: int) -> Dict[str, Any]:
+
+    return {f"key_{i}": make_text(rng) for i in range(leaves)}
+
+
+def _nested(rng: random.Random, leaves: int) -> Dict[str, Any]:
+
+    # Caminhos com 6 níveis e até 8 filhos por nível (ex.: s3.s0.s7.s1.s2.k5)
+    root: Dict[str, Any] = {}
+    for i in range(leaves):
+        node = root
+        rest = i // 8
+        for _ in range(5):
+            node = node.setdefault(f"s{rest % 8}", {})
+            rest //= 8
+        node[f"k{i % 8}" if rest == 0 else f"k{i % 8}_{rest}"] = make_text(rng)
+    return root
+
+
+def _arrays(rng: random.Random, leaves: int) -> List[Dict[str, Any]]:
+
+    # Array na raiz com objetos de 5 folhas. Listas dentro de objetos são uma folha só para o
+    # flatten_object (não são traduzidas), então as tags entram inteiras como um valor
+    return [
+        {
+            "id": i,
+            "title": make_text(rng),
+            "body": make_text(rng),
+            "summary": make_text(rng),
+            "tags": [rng.choice(WORDS), rng.choice(WORDS)],
+        }
+        for i in range((leaves + 4) // 5)
+    ]
+
+
+def _placeholders(rng: random.Random, leaves: int) -> Dict[str, Any]:
+
+    sections: Dict[str, Any] = {}
+    for i in range(leaves):
+        sections.setdefault(f"section_{i % 20}", {})[f"message_{i}"] = make_text(rng, rng.randint(1, 3))
+    return sections
+
+
+GENERATORS: Dict[str, Callable[[random.Random, int], Any]] = {
+    "flat": _flat,
+    "nested": _nested,
+    "arrays": _arrays,
+    "placeholders": _placeholders,
+}
+
+
+def generate_document(shape: str, leaves: int, seed: int = 0) -> Any:
+
+    if shape not in GENERATORS:
+        raise ValueError(f"Formato desconhecido: {shape} (use {', '.join(SHAPES)})")
+    # Mesma semente, mesmo documento: resultados comparáveis entre commits
+    return GENERATORS[shape](random.Random(f"{shape}:{leaves}:{seed}"), leaves)
+
+
+def string_values(entries: List[Dict[str, Any]]) -> List[str]:
+
+    return [e["value"] for e in entries if isinstance(e["value"], str) and e["value"]]
@@ -0,0 +1,414 @@
+import asyncio
+import json
+import math
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.datasets import SHAPES, generate_document
+
+
+BACKEND_DIR = Path(__file__).parent.parent
+DEFAULT_OUTPUT_DIR = Path("output/.benchmarks")
+ENDPOINTS = ("upload", "estimate", "start", "status", "result")
+STARTUP_TIMEOUT = 60.0
+# Intervalo de amostragem da memória do processo da API
+MEMORY_SAMPLE_SECONDS = 0.5
+# Job que não termina nesse tempo conta como falha (status "timeout")
+DEFAULT_JOB_TIMEOUT = 600.0
+LOOP_LAG_METRIC = "translator_event_loop_lag_seconds"
+
+
+def parse_args() -> Dict[str, Any]:
+
+    args = {
+        "users": 10,
+        "jobs": 1,
+        "leaves": 200,
+        "shape": "flat",
+        "target_language": "es",
+        "batch_size": 50,
+        "parallel": 3,
+        "poll_interval": 0.5,
+        "ramp": 0.0,
+        "workers": 0,
+        "latency": 0.3,
+        "tps": 150.0,
+        "rate_limit": None,
+        "error_rate": 0.0,
+        "api_url": None,
+        "job_timeout": DEFAULT_JOB_TIMEOUT,
+        "output": None,
+    }
+    flags = {
+        "--users": ("users", int),
+        "--jobs": ("jobs", int),
+        "--leaves": ("leaves", int),
+        "--shape": ("shape", str),
+        "--lang": ("target_language", str),
+        "--batch": ("batch_size", int),
+        "--parallel": ("parallel", int),
+        "--poll": ("poll_interval", float),
+        "--ramp": ("ramp", float),
+        "--workers": ("workers", int),
+        "--latency": ("latency", float),
+        "--tps": ("tps", float),
+        "--rate-limit": ("rate_limit", float),
+        "--error-rate": ("error_rate", float),
+        "--api-url": ("api_url", str),
+        "--job-timeout": ("job_timeout", float),
+        "--output": ("output", Path),
+    }
+    for flag, (name, cast) in flags.items():
+        if flag in sys.argv:
+            idx = sys.argv.index(flag)
+            if idx + 1 < len(sys.argv):
+                args[name] = cast(sys.argv[idx + 1])
+    if args["shape"] not in SHAPES:
+        print(f"❌ Formato desconhecido: {args['shape']} (use {', '.join(SHAPES)})")
+        sys.exit(2)
+    return args
+
+
+def free_port() -> int:
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+
+    # Só Linux (/proc); em outros sistemas a memória não é reportada
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def parse_histogram(metrics_text: str, name: str) -> Dict[str, Any]:
+
+    # Buckets cumulativos, soma e contagem de um histograma sem labels no formato do Prometheus
+    buckets = []
+    total, count = 0.0, 0
+    for line in metrics_text.splitlines():
+        if line.startswith(f"{name}_bucket"):
+            bound = re.search(r'le="([^"]+)"', line).group(1)
+            buckets.append((float("inf") if bound == "+Inf" else float(bound), int(float(line.rsplit(" ", 1)[1]))))
+        elif line.startswith(f"{name}_sum"):
+            total = float(line.rsplit(" ", 1)[1])
+        elif line.startswith(f"{name}_count"):
+            count = int(float(line.rsplit(" ", 1)[1]))
+    return {"buckets": buckets, "sum": total, "count": count}
+
+
+def summarize_loop_lag(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+
+    count = after["count"] - before["count"]
+    if count <= 0:
+        return {"samples": 0}
+    previous = dict(before["buckets"])
+    buckets = [(bound, cumulative - previous.get(bound, 0)) for bound, cumulative in after["buckets"]]
+
+    def upper_bound(fraction: float) -> Optional[float]:
+        # Limite superior do bucket que contém o percentil
+        for bound, cumulative in buckets:
+            if cumulative >= fraction * count:
+                return bound if bound != float("inf") else None
+        return None
+
+    return {
+        "samples": count,
+        "mean_seconds": round((after["sum"] - before["sum"]) / count, 6),
+        "p99_seconds_le": upper_bound(0.99),
+        "max_bucket_seconds_le": upper_bound(1.0),
+    }
+
+
+class LoadTest:
+    """
+    Usuários simulados percorrendo upload → estimate → start → status → result na API,
+    com a tradução indo para o backend falso (stub_openai.py).
+    """
+
+    def __init__(self, args: Dict[str, Any]):
+        self.args = args
+        self.latencies: Dict[str, List[float]] = {name: [] for name in ENDPOINTS}
+        self.errors: Dict[str, int] = {name: 0 for name in ENDPOINTS}
+        self.jobs: List[Dict[str, Any]] = []
+        self.memory: List[Tuple[float, float]] = []
+        self.processes: List[subprocess.Popen] = []
+        self.work_dir: Optional[Path] = None
+        self.api_url = args["api_url"]
+        self.stub_url: Optional[str] = None
+        self.api_pid: Optional[int] = None
+
+    def start_services(self) -> None:
+
+        # API e stub em processos próprios, com output/ num diretório temporário
+        self.work_dir = Path(tempfile.mkdtemp(prefix="json-translator-load-"))
+        stub_port, api_port = free_port(), free_port()
+        stub_cmd = [
+            sys.executable, str(BACKEND_DIR / "benchmarks" / "stub_openai.py"),
+            "--port", str(stub_port), "--latency", str(self.args["latency"]), "--tps", str(self.args["tps"]),
+            "--error-rate", str(self.args["error_rate"]),
+        ]
+        if self.args["rate_limit"] is not None:
+            stub_cmd += ["--rate-limit", str(self.args["rate_limit"])]
+        self.processes.append(subprocess.Popen(stub_cmd, cwd=self.work_dir, stdout=subprocess.DEVNULL))
+        self.stub_url = f"http://127.0.0.1:{stub_port}"
+
+        env = {
+            **os.environ,
+            "OPENAI_API_KEY": "sk-load-test",
+            "OPENAI_BASE_URL": f"{self.stub_url}/v1",
+            "JOB_WORKERS": str(self.args["workers"]),
+            "PYTHONPATH": str(BACKEND_DIR),
+        }
+        api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api.api:app", "--host", "127.0.0.1", "--port", str(api_port),
+             "--log-level", "warning"],
+            cwd=self.work_dir, env=env, stdout=subprocess.DEVNULL,
+        )
+        self.processes.append(api)
+        self.api_pid = api.pid
+        self.api_url = f"http://127.0.0.1:{api_port}"
+
+    def stop_services(self) -> None:
+
+        for process in reversed(self.processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self.work_dir is not None:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    async def wait_ready(self, client: httpx.AsyncClient, url: str) -> None:
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Serviço não respondeu em {STARTUP_TIMEOUT:.0f}s: {url}")
+            await asyncio.sleep(0.2)
+
+    async def timed(self, name: str, request: Any) -> Optional[httpx.Response]:
+
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+            return None
+        return response
+
+    async def run_user(self, client: httpx.AsyncClient, user: int) -> None:
+
+        await asyncio.sleep(self.args["ramp"] * user / max(1, self.args["users"]))
+        for iteration in range(self.args["jobs"]):
+            # Documento diferente por usuário e job: sem deduplicação de jobs nem cache compartilhado
+            document = generate_document(self.args["shape"], self.args["leaves"], seed=user * 1000 + iteration)
+            if isinstance(document, list):
+                document = {"items": {str(i): item for i, item in enumerate(document)}}
+            job = {"user": user, "iteration": iteration, "status": "error"}
+            self.jobs.append(job)
+            options = {
+                "target_language": self.args["target_language"],
+                "batch_size": self.args["batch_size"],
+                "parallel": self.args["parallel"],
+            }
+
+            body = json.dumps(document).encode("utf-8")
+            upload = await self.timed("upload", client.post(
+                "/api/upload", files={"file": (f"user{user}_{iteration}.json", body, "application/json")}
+            ))
+            if upload is None:
+                continue
+            json_data = upload.json()["data"]
+            if await self.timed("estimate", client.post("/api/translate/estimate", json={**options, "json_data": json_data})) is None:
+                continue
+            started = time.perf_counter()
+            response = await self.timed("start", client.post("/api/translate/start", json={**options, "json_data": json_data}))
+            if response is None:
+                continue
+            job_id = response.json()["job_id"]
+
+            status = {"status": "timeout", "total_strings": 0, "stats": {}}
+            deadline = started + self.args["job_timeout"]
+            while time.perf_counter() < deadline:
+                await asyncio.sleep(self.args["poll_interval"])
+                response = await self.timed("status", client.get(f"/api/translate/{job_id}/status"))
+                if response is None:
+                    continue
+                if response.json()["status"] in ("completed", "failed", "cancelled"):
+                    status = response.json()
+                    break
+            job.update({
+                "job_id": job_id,
+                "status": status["status"],
+                "seconds": round(time.perf_counter() - started, 3),
+                "strings": status["total_strings"],
+                "api_calls": status["stats"].get("api_calls", 0),
+                "errors": status["stats"].get("errors", 0),
+            })
+            if status["status"] == "completed":
+                await self.timed("result", client.get(f"/api/translate/{job_id}/result"))
+
+    async def sample_memory(self, started: float) -> None:
+
+        while self.api_pid is not None:
+            rss = read_rss_mb(self.api_pid)
+            if rss is not None:
+                self.memory.append((round(time.perf_counter() - started, 2), round(rss, 1)))
+            await asyncio.sleep(MEMORY_SAMPLE_SECONDS)
+
+    async def run(self) -> Dict[str, Any]:
+
+        users = self.args["users"]
+        limits = httpx.Limits(max_connections=users * 2, max_keepalive_connections=users * 2)
+        async with httpx.AsyncClient(base_url=self.api_url, limits=limits, timeout=120.0) as client:
+            await self.wait_ready(client, "/")
+            lag_before = parse_histogram((await client.get("/metrics")).text, LOOP_LAG_METRIC)
+            started = time.perf_counter()
+            sampler = asyncio.create_task(self.sample_memory(started))
+            await asyncio.gather(*(self.run_user(client, user) for user in range(users)))
+            elapsed = time.perf_counter() - started
+            sampler.cancel()
+            lag_after = parse_histogram((await client.get("/metrics")).text, LOOP_LAG_METRIC)
+            stub_stats = None
+            if self.stub_url is not None:
+                async with httpx.AsyncClient(base_url=self.stub_url) as stub_client:
+                    stub_stats = (await stub_client.get("/stats")).json()
+        return self.build_report(elapsed, summarize_loop_lag(lag_before, lag_after), stub_stats)
+
+    def build_report(self, elapsed: float, loop_lag: Dict[str, Any], stub_stats: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+
+        completed = [job for job in self.jobs if job["status"] == "completed"]
+        requests = sum(len(values) for values in self.latencies.values())
+        endpoints = {}
+        for name in ENDPOINTS:
+            values = self.latencies[name]
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                **{
+                    f"{label}_ms": round(percentile(values, fraction) * 1000, 2) if values else None
+                    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+                },
+            }
+        memory = None
+        if self.memory:
+            rss = [value for _, value in self.memory]
+            memory = {"start_mb": rss[0], "peak_mb": max(rss), "end_mb": rss[-1], "growth_mb": round(rss[-1] - rss[0], 1)}
+        job_seconds = [job["seconds"] for job in completed]
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "args": {name: (str(value) if isinstance(value, Path) else value) for name, value in self.args.items()},
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput": {
+                "jobs_completed": len(completed),
+                "jobs_failed": len(self.jobs) - len(completed),
+                "jobs_per_second": round(len(completed) / elapsed, 3),
+                "strings_per_second": round(sum(job["strings"] for job in completed) / elapsed, 1),
+                # Strings que saíram como NEEDS_MANUAL_REVIEW (ex.: 429 além das retentativas do cliente)
+                "failed_strings": sum(job.get("errors", 0) for job in self.jobs),
+                "requests_per_second": round(requests / elapsed, 2),
+                "job_seconds_p50": percentile(job_seconds, 0.5),
+                "job_seconds_p95": percentile(job_seconds, 0.95),
+            },
+            "endpoints": endpoints,
+            "event_loop_lag": loop_lag,
+            "memory": memory,
+            "stub": stub_stats,
+            "jobs": self.jobs,
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+
+    throughput = report["throughput"]
+    print(f"\n📊 {throughput['jobs_completed']} jobs concluídos, {throughput['jobs_failed']} com falha "
+          f"em {report['elapsed_seconds']:.1f}s")
+    print(f"   {throughput['jobs_per_second']} jobs/s | {throughput['strings_per_second']} strings/s | "
+          f"{throughput['requests_per_second']} req/s | job p50 {throughput['job_seconds_p50']}s "
+          f"p95 {throughput['job_seconds_p95']}s | {throughput['failed_strings']} strings com falha")
+    print(f"\n   {'endpoint':<10} {'req':>6} {'erros':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in report["endpoints"].items():
+        cells = [f"{stats[key]:>9.1f}" if stats[key] is not None else f"{'-':>9}" for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")]
+        print(f"   {name:<10} {stats['requests']:>6} {stats['errors']:>6} {' '.join(cells)}")
+    lag = report["event_loop_lag"]
+    if lag.get("samples"):
+        print(f"\n   Event loop: atraso médio {lag['mean_seconds'] * 1000:.2f} ms, p99 ≤ {lag['p99_seconds_le']}s "
+              f"({lag['samples']} amostras)")
+    if report["memory"]:
+        memory = report["memory"]
+        print(f"   Memória da API: {memory['start_mb']} → {memory['end_mb']} MB (pico {memory['peak_mb']} MB, "
+              f"+{memory['growth_mb']} MB)")
+    if report["stub"]:
+        print(f"   Stub: {report['stub']['requests']} chamadas, {report['stub']['rate_limited']} respondidas com 429")
+
+
+def main():
+
+    args = parse_args()
+    test = LoadTest(args)
+    if args["api_url"] is None:
+        test.start_services()
+    print(f"🚦 Teste de carga: {args['users']} usuários x {args['jobs']} jobs | {args['leaves']} folhas ({args['shape']}) "
+          f"| API {test.api_url} | JOB_WORKERS={args['workers']}")
+    try:
+        report = asyncio.run(test.run())
+    finally:
+        test.api_pid = None
+        if args["api_url"] is None:
+            test.stop_services()
+
+    print_report(report)
+    output_path = args["output"]
+    if output_path is None:
+        output_path = DEFAULT_OUTPUT_DIR / f"load_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Relatório salvo em {output_path}")
+    if report["throughput"]["jobs_failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+import uvicorn
+
+
+DEFAULT_PORT = 9900
+# Latência de uma chamada: fixa + tokens de saída / velocidade de geração
+DEFAULT_LATENCY = 0.3
+DEFAULT_TOKENS_PER_SECOND = 150.0
+
+
+class StubConfig:
+    """Comportamento do backend falso: latência, limite de requisições e 429 aleatórios."""
+
+    def __init__(
+        self,
+        latency: float = DEFAULT_LATENCY,
+        tokens_per_second: float = DEFAULT_TOKENS_PER_SECOND,
+        rate_limit: Optional[float] = None,
+        error_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        # Requisições por segundo aceitas (token bucket com rajada de 1s); acima disso, 429
+        self.rate_limit = rate_limit
+        # Fração das requisições respondidas com 429 mesmo dentro do limite
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+
+def parse_items(messages: Any) -> Dict[str, str]:
+
+    # Mesmo formato de build_translation_messages: o JSON de entrada vem entre os marcadores
+    user = messages[-1]["content"]
+    body = user.split("Input JSON:\n", 1)[1].rsplit("\n\nRemember", 1)[0]
+    return json.loads(body)
+
+
+def create_stub_app(config: StubConfig) -> FastAPI:
+
+    app = FastAPI(title="Stub OpenAI")
+    counters = {"requests": 0, "rate_limited": 0, "completed": 0, "completion_tokens": 0}
+    bucket = {"tokens": config.rate_limit or 0.0, "updated": time.monotonic()}
+
+    def take_rate_token() -> bool:
+
+        if config.rate_limit is None:
+            return True
+        now = time.monotonic()
+        bucket["tokens"] = min(config.rate_limit, bucket["tokens"] + (now - bucket["updated"]) * config.rate_limit)
+        bucket["updated"] = now
+        if bucket["tokens"] < 1:
+            return False
+        bucket["tokens"] -= 1
+        return True
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+
+        counters["requests"] += 1
+        body = await request.json()
+        if not take_rate_token() or config.random.random() < config.error_rate:
+            counters["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": str(config.retry_after)},
+                content={"error": {
+                    "message": "Rate limit reached (stub)",
+                    "type": "requests",
+                    "code": "rate_limit_exceeded",
+                }},
+            )
+
+        items = parse_items(body["messages"])
+        content = json.dumps({key: f"[{value}]" for key, value in items.items()}, indent=2, ensure_ascii=False)
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        completion_tokens = len(content) // 4
+        await asyncio.sleep(config.latency + completion_tokens / config.tokens_per_second)
+
+        counters["completed"] += 1
+        counters["completion_tokens"] += completion_tokens
+        return {
+            "id": f"chatcmpl-stub-{counters['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    async def stats():
+
+        return counters
+
+    return app
+
+
+def parse_args() -> Dict[str, Any]:
+
+    args = {
+        "port": DEFAULT_PORT,
+        "latency": DEFAULT_LATENCY,
+        "tokens_per_second": DEFAULT_TOKENS_PER_SECOND,
+        "rate_limit": None,
+        "error_rate": 0.0,
+        "retry_after": 1.0,
+    }
+    flags = {
+        "--port": ("port", int),
+        "--latency": ("latency", float),
+        "--tps": ("tokens_per_second", float),
+        "--rate-limit": ("rate_limit", float),
+        "--error-rate": ("error_rate", float),
+        "--retry-after": ("retry_after", float),
+    }
+    for flag, (name, cast) in flags.items():
+        if flag in sys.argv:
+            idx = sys.argv.index(flag)
+            if idx + 1 < len(sys.argv):
+                args[name] = cast(sys.argv[idx + 1])
+    return args
+
+
+def main():
+
+    args = parse_args()
+    port = args.pop("port")
+    config = StubConfig(**args)
+    print(f"🧪 Stub OpenAI em http://127.0.0.1:{port}/v1 | latência {config.latency}s + saída/{config.tokens_per_second:g} tok/s"
+          f" | limite {config.rate_limit or '-'} req/s | 429 aleatório {config.error_rate:.0%}")
+    uvicorn.run(create_stub_app(config), host="127.0.0.1", port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+import heapq
+import json
+import math
+import re
+import sqlite3
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from scripts.script_openai import (
+    flatten_object,
+    mask_placeholders,
+    build_translation_messages,
+    should_translate_individually,
+    MODEL_PRICING,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MODEL,
+    DEFAULT_PARALLEL,
+)
+from core.telemetry import get_telemetry, predict_batch_seconds
+
+
+# Tokens extras por mensagem do chat e para iniciar a resposta (formato da API de chat)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Tokens da tradução / tokens do texto de origem: (otimista, esperado, pessimista)
+OUTPUT_TOKEN_RATIO = (1.0, 1.3, 1.7)
+# Erro relativo da contagem de tokens de entrada: tokenizer real x aproximação local
+TOKENIZER_ERROR = {"tiktoken": 0.02, "heuristic": 0.2}
+# Vai na resposta da estimativa quando a contagem não veio do tokenizer do modelo
+HEURISTIC_WARNING = (
+    "Tokens contados por aproximação local (erro típico de ±20%): o tiktoken não está instalado "
+    "ou não conseguiu carregar o encoding do modelo. Instale com: pip install -r requirements_openai.txt"
+)
+# Fração das chaves de um batch que costuma voltar faltando/concatenada e é retraduzida sozinha
+RETRY_RATE = 0.05
+# Variação da latência das chamadas em torno do modelo padrão: (otimista, pessimista)
+LATENCY_SPREAD = (0.6, 2.0)
+# Com o modelo ajustado, a faixa sai do erro medido (nunca mais estreita que este erro)
+MIN_FITTED_ERROR = 0.1
+# Batches "fictícios" com a razão medido/previsto = 1 no ETA: os primeiros batches não o derrubam sozinhos
+ETA_PRIOR_BATCHES = 2
+
+# Latência de uma chamada: intercept + per_input_token * entrada + per_output_token * saída.
+# São o ponto de partida; a telemetria dos batches concluídos recalibra por modelo (core/telemetry.py)
+DEFAULT_LATENCY = {"intercept": 0.6, "per_input_token": 0.00002, "per_output_token": 1 / 60}
+MODEL_LATENCY = {
+    "gpt-4o-mini": {"intercept": 0.5, "per_input_token": 0.00002, "per_output_token": 1 / 80},
+    "gpt-4o": {"intercept": 0.6, "per_input_token": 0.00003, "per_output_token": 1 / 60},
+    "gpt-4-turbo": {"intercept": 0.8, "per_input_token": 0.00005, "per_output_token": 1 / 30},
+    "gpt-4": {"intercept": 1.0, "per_input_token": 0.00008, "per_output_token": 1 / 20},
+    "gpt-3.5-turbo": {"intercept": 0.4, "per_input_token": 0.00001, "per_output_token": 1 / 90},
+}
+# Google Translate: uma requisição por string + a pausa de 0.1s entre elas
+GOOGLE_LATENCY = {"intercept": 0.8, "per_input_token": 0.0, "per_output_token": 0.0}
+GOOGLE_MAX_PARALLEL = 2
+
+# Aproximação local do BPE: palavras (longas viram vários tokens), números em grupos de
+# até 3 dígitos, sequências de pontuação e quebras de linha com indentação
+_TOKEN_PATTERN = re.compile(r" ?[^\W\d_]+| ?\d{1,3}| ?[^\w\s]+|\s+")
+
+
+@lru_cache(maxsize=None)
+def _encoding_for(model: str) -> Any:
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # O tiktoken baixa o BPE no primeiro uso: sem rede (e sem cache local), fica a aproximação
+        print(f"⚠️  tiktoken sem encoding para {model} ({e}): usando a contagem aproximada de tokens")
+        return None
+
+
+def heuristic_token_count(text: str) -> int:
+
+    tokens = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        piece = match.group(0)
+        if piece.isspace():
+            tokens += 1
+            continue
+        word = piece.lstrip()
+        # Letras fora do ASCII (acentos, outros alfabetos) rendem bem menos texto por token
+        extra = sum(1 for ch in word if ord(ch) > 127)
+        tokens += max(1, math.ceil((len(word) - extra) / 6) + math.ceil(extra / 2))
+    return tokens
+
+
+def get_token_counter(model: str) -> Tuple[Callable[[str], int], str]:
+
+    encoding = _encoding_for(model) if tiktoken is not None else None
+    if encoding is not None:
+        return (lambda text: len(encoding.encode(text, disallowed_special=()))), "tiktoken"
+    return heuristic_token_count, "heuristic"
+
+
+def count_message_tokens(messages: List[Dict[str, str]], count: Callable[[str], int]) -> int:
+
+    return sum(TOKENS_PER_MESSAGE + count(m["role"]) + count(m["content"]) for m in messages) + TOKENS_PER_REPLY
+
+
+def schedule_batches(durations: List[float], parallel: int, busy: Optional[List[float]] = None) -> float:
+
+    # Mesma ordem do job: os batches entram no semáforo na ordem do plano.
+    # busy: quanto falta para os slots já ocupados (batches em andamento) liberarem
+    slots = sorted(busy or [])[:max(1, parallel)]
+    slots += [0.0] * (max(1, parallel) - len(slots))
+    heapq.heapify(slots)
+    for duration in durations:
+        start = heapq.heappop(slots)
+        heapq.heappush(slots, start + duration)
+    return max(slots)
+
+
+def token_cost(model: str, input_tokens: float, output_tokens: float) -> float:
+
+    pricing = MODEL_PRICING.get(model)
+    if not pricing:
+        return 0.0
+    return (input_tokens / 1_000_000) * pricing["input"] + (output_tokens / 1_000_000) * pricing["output"]
+
+
+def resolve_latency(method: str, model: str, parallel: int) -> Dict[str, Any]:
+
+    if method == "google":
+        backend, name, prior = "google", "Google Translate", GOOGLE_LATENCY
+    else:
+        backend, name, prior = "openai", model, MODEL_LATENCY.get(model, DEFAULT_LATENCY)
+    try:
+        return get_telemetry().fit(backend, name, parallel, prior)
+    except sqlite3.Error:
+        # Telemetria ilegível não impede a estimativa: vale o modelo padrão
+        return {"latency": dict(prior), "source": "default", "samples": 0, "error": None}
+
+
+def latency_summary() -> List[Dict[str, Any]]:
+
+    telemetry = get_telemetry()
+    summary = []
+    for backend, name, recorded in telemetry.models():
+        prior = GOOGLE_LATENCY if backend == "google" else MODEL_LATENCY.get(name, DEFAULT_LATENCY)
+        summary.append({
+            "backend": backend,
+            "model": name,
+            "recorded_batches": recorded,
+            **telemetry.fit(backend, name, None, prior),
+            "default_latency": prior,
+        })
+    return summary
+
+
+def time_range(seconds: float, latency_info: Optional[Dict[str, Any]] = None) -> List[int]:
+
+    low, high = LATENCY_SPREAD
+    if latency_info and latency_info["source"] == "fitted" and latency_info["error"] is not None:
+        error = max(latency_info["error"], MIN_FITTED_ERROR)
+        low, high = max(0.3, 1 - 2 * error), 1 + 2 * error
+    return [int(seconds * low), int(math.ceil(seconds * high))]
+
+
+def plan_batches(
+    entry_batches: List[List[Dict[str, Any]]],
+    cache: Dict[str, str],
+    parallel: int = 1,
+) -> Tuple[List[Dict[str, Any]], int]:
+
+    # Reproduz o roteamento de translate_batch_async: cache, chamadas individuais e o batch
+    batches = []
+    cached = 0
+    seen = set()
+    for index, entries in enumerate(entry_batches):
+        # Batches que rodam ao mesmo tempo não enxergam as traduções uns dos outros
+        if index >= parallel:
+            seen.update(entry["value"] for entry in entry_batches[index - parallel])
+        individual = []
+        grouped = {}
+        for entry in entries:
+            original = entry["value"]
+            hit = cache.get(original)
+            if (hit is not None and "__PH_" not in hit) or original in seen:
+                cached += 1
+                continue
+            masked, _ = mask_placeholders(original)
+            if should_translate_individually(entry["key"], original):
+                individual.append((entry["key"], masked))
+            else:
+                grouped[entry["key"]] = masked
+        batches.append({"individual": individual, "grouped": grouped})
+    return batches, cached
+
+
+def plan_calls(
+    to_translate: List[Dict[str, Any]],
+    cache: Dict[str, str],
+    batch_size: int,
+    parallel: int = 1,
+) -> Tuple[List[Dict[str, Any]], int]:
+
+    return plan_batches(
+        [to_translate[i:i + batch_size] for i in range(0, len(to_translate), batch_size)], cache, parallel
+    )
+
+
+def count_batch_tokens(
+    batches: List[Dict[str, Any]],
+    target_language: str,
+    model: str,
+) -> Tuple[List[Dict[str, float]], str]:
+
+    count, tokenizer = get_token_counter(model)
+
+    # O template do prompt é contado uma vez por variante (com/sem instrução de placeholders)
+    templates = {
+        has_placeholders: count_message_tokens(
+            build_translation_messages({"": "__PH_GG__0__" if has_placeholders else ""}, target_language), count,
+        ) - count(json.dumps({"": "__PH_GG__0__" if has_placeholders else ""}, indent=2))
+        for has_placeholders in (False, True)
+    }
+
+    def call_tokens(items: Dict[str, str]) -> Tuple[int, int, int]:
+
+        body = json.dumps(items, indent=2, ensure_ascii=False)
+        values = sum(count(value) for value in items.values())
+        has_placeholders = any("__PH_" in value for value in items.values())
+        body_tokens = count(body)
+        # A resposta repete as chaves e a moldura do JSON; só os valores mudam de tamanho
+        return templates[has_placeholders] + body_tokens, body_tokens - values, values
+
+    # Por batch: entrada, moldura e valores da saída, e o que o pessimista soma em retentativas
+    usage = []
+    for batch in batches:
+        item = {"calls": 0, "input": 0, "framing": 0, "values": 0,
+                "retry_input": 0.0, "retry_framing": 0.0, "retry_values": 0.0}
+        calls = [call_tokens({key: masked}) for key, masked in batch["individual"]]
+        grouped = batch["grouped"]
+        if grouped:
+            input_tokens, framing, values = call_tokens(grouped)
+            calls.append((input_tokens, framing, values))
+            # Parte das chaves volta faltando/concatenada e é retraduzida sozinha (template próprio cada)
+            item["retry_input"] = RETRY_RATE * (len(grouped) * templates[False] + input_tokens - templates[False])
+            item["retry_framing"] = RETRY_RATE * framing
+            item["retry_values"] = RETRY_RATE * values
+        item["calls"] = len(calls)
+        for input_tokens, framing, values in calls:
+            item["input"] += input_tokens
+            item["framing"] += framing
+            item["values"] += values
+        usage.append(item)
+    return usage, tokenizer
+
+
+def expected_batch_seconds(usage: Dict[str, float], latency: Dict[str, float]) -> float:
+
+    # Como no job: as chamadas do batch são sequenciais (individuais, depois a do batch)
+    return predict_batch_seconds(
+        latency, usage["calls"], usage["input"], usage["framing"] + usage["values"] * OUTPUT_TOKEN_RATIO[1]
+    )
+
+
+def estimate_openai_plan(
+    batches: List[Dict[str, Any]],
+    target_language: str,
+    model: str,
+    parallel: int,
+    latency_info: Dict[str, Any],
+) -> Dict[str, Any]:
+
+    usage, tokenizer = count_batch_tokens(batches, target_language, model)
+    low_ratio, ratio, high_ratio = OUTPUT_TOKEN_RATIO
+
+    input_tokens = sum(u["input"] for u in usage)
+    framing = sum(u["framing"] for u in usage)
+    values = sum(u["values"] for u in usage)
+    output_tokens = framing + values * ratio
+
+    error = TOKENIZER_ERROR[tokenizer]
+    input_range = (
+        int(input_tokens * (1 - error)),
+        int((input_tokens + sum(u["retry_input"] for u in usage)) * (1 + error)),
+    )
+    retry_output = sum(u["retry_framing"] + u["retry_values"] * high_ratio for u in usage)
+    output_range = (
+        int((framing + values * low_ratio) * (1 - error)),
+        int((framing + values * high_ratio + retry_output) * (1 + error)),
+    )
+    seconds = schedule_batches([expected_batch_seconds(u, latency_info["latency"]) for u in usage], parallel)
+    api_calls = sum(u["calls"] for u in usage)
+    return {
+        "estimated_tokens_input": int(input_tokens),
+        "estimated_tokens_output": int(output_tokens),
+        "estimated_cost_usd": round(token_cost(model, input_tokens, output_tokens), 6),
+        "estimated_time_seconds": int(math.ceil(seconds)),
+        "api_calls": api_calls,
+        "individual_calls": sum(len(batch["individual"]) for batch in batches),
+        "tokenizer": tokenizer,
+        "tokenizer_warning": HEURISTIC_WARNING if tokenizer == "heuristic" else None,
+        "range": {
+            "tokens_input": list(input_range),
+            "tokens_output": list(output_range),
+            "cost_usd": [
+                round(token_cost(model, input_range[0], output_range[0]), 6),
+                round(token_cost(model, input_range[1], output_range[1]), 6),
+            ],
+            "time_seconds": time_range(seconds, latency_info),
+        },
+    }
+
+
+def predict_batch_durations(
+    entry_batches: List[List[Dict[str, Any]]],
+    cache: Dict[str, str],
+    target_language: str,
+    method: str,
+    model: str,
+    parallel: int,
+    latency: Dict[str, float],
+) -> List[float]:
+
+    batches, _ = plan_batches(entry_batches, cache, parallel)
+    if method == "google":
+        return [
+            predict_batch_seconds(latency, len(batch["individual"]) + len(batch["grouped"]), 0, 0)
+            for batch in batches
+        ]
+    usage, _ = count_batch_tokens(batches, target_language, model)
+    return [expected_batch_seconds(u, latency) for u in usage]
+
+
+class JobEta:
+    """
+    Tempo restante de um job: a duração prevista de cada batch, corrigida pela razão
+    medido/previsto dos batches já concluídos e agendada nos slots de paralelismo.
+    """
+
+    def __init__(self, predicted: Dict[int, float], parallel: int):
+        self.predicted = dict(predicted)
+        self.parallel = max(1, parallel)
+        self.started: Dict[int, float] = {}
+        self.done_predicted = 0.0
+        self.done_actual = 0.0
+        mean = sum(predicted.values()) / len(predicted) if predicted else 0.0
+        self.prior = ETA_PRIOR_BATCHES * mean
+
+    def start(self, batch_num: int) -> None:
+
+        self.started[batch_num] = time.time()
+
+    def finish(self, batch_num: int, seconds: float) -> None:
+
+        self.started.pop(batch_num, None)
+        self.done_predicted += self.predicted.pop(batch_num, 0.0)
+        self.done_actual += seconds
+
+    def scale(self) -> float:
+
+        total = self.done_predicted + self.prior
+        return (self.done_actual + self.prior) / total if total > 0 else 1.0
+
+    def remaining(self) -> float:
+
+        now = time.time()
+        scale = self.scale()
+        busy = [
+            max(0.0, scale * self.predicted.get(batch_num, 0.0) - (now - started))
+            for batch_num, started in self.started.items()
+        ]
+        pending = [scale * seconds for batch_num, seconds in self.predicted.items() if batch_num not in self.started]
+        return schedule_batches(pending, self.parallel, busy)
+
+
+def estimate_translation_plan(
+    json_data: Any,
+    target_language: str,
+    method: str = "openai",
+    model: str = DEFAULT_MODEL,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    parallel: int = DEFAULT_PARALLEL,
+    cache: Optional[Dict[str, str]] = None,
+    latency: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+
+    flat_data = flatten_object(json_data)
+    # Mesmo critério do job: toda string não vazia entra no plano
+    to_translate = [e for e in flat_data if isinstance(e["value"], str) and len(e["value"]) > 0]
+    effective_parallel = min(parallel, GOOGLE_MAX_PARALLEL) if method == "google" else parallel
+    batches, cached = plan_calls(to_translate, cache or {}, batch_size, effective_parallel)
+    if latency is None:
+        latency_info = resolve_latency(method, model, effective_parallel)
+    else:
+        latency_info = {"latency": latency, "source": "custom", "samples": 0, "error": None}
+
+    result = {
+        "total_strings": sum(1 for e in to_translate if e["value"].strip()),
+        "total_entries": len(flat_data),
+        "cached_strings": cached,
+        "strings_to_translate": len(to_translate) - cached,
+        "estimated_batches": len(batches),
+        "method": method,
+        "batch_size": batch_size,
+        "latency_model": {name: latency_info[name] for name in ("source", "samples", "error")},
+    }
+
+    if method == "google":
+        durations = [
+            predict_batch_seconds(latency_info["latency"], len(batch["individual"]) + len(batch["grouped"]), 0, 0)
+            for batch in batches
+        ]
+        seconds = schedule_batches(durations, effective_parallel)
+        return {
+            **result,
+            "estimated_tokens_input": 0,
+            "estimated_tokens_output": 0,
+            "estimated_cost_usd": 0.0,
+            "estimated_time_seconds": int(math.ceil(seconds)),
+            "api_calls": result["strings_to_translate"],
+            "individual_calls": result["strings_to_translate"],
+            "tokenizer": None,
+            "tokenizer_warning": None,
+            "range": {
+                "tokens_input": [0, 0],
+                "tokens_output": [0, 0],
+                "cost_usd": [0.0, 0.0],
+                "time_seconds": time_range(seconds, latency_info),
+            },
+            "model": "Google Translate",
+            "parallel": effective_parallel,
+        }
+
+    return {
+        **result,
+        **estimate_openai_plan(batches, target_language, model, parallel, latency_info),
+        "model": model,
+        "parallel": parallel,
+    }
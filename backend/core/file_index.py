@@ -0,0 +1,249 @@
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from core.file_lock import exclusive_file_lock
+from scripts.script_openai import flatten_object, write_json_atomic, DEFAULT_ON_FAILURE
+
+
+OUTPUT_DIR = Path("output")
+# Fica num subdiretório oculto, fora da listagem dos arquivos traduzidos
+INDEX_DIR_NAME = ".index"
+INDEX_FILE = "files.json"
+INDEX_VERSION = 1
+
+SORT_FIELDS = ("modified", "created", "filename", "size", "keys", "language_code")
+
+
+def describe_json_data(data: Any) -> Dict[str, int]:
+
+    keys = 0
+    strings = 0
+    needs_review = 0
+    for entry in flatten_object(data):
+        keys += 1
+        value = entry["value"]
+        if isinstance(value, str):
+            strings += 1
+            if value == DEFAULT_ON_FAILURE:
+                needs_review += 1
+    return {"keys": keys, "strings": strings, "needs_review": needs_review}
+
+
+class FileIndex:
+    """
+    Índice de metadados dos arquivos de output/ (tamanho, idioma, origem, job e contagem
+    de chaves), persistido em output/.index/files.json. É atualizado a cada gravação ou
+    exclusão feita pela API; mudanças feitas por fora (inclusive regravar um arquivo no
+    lugar) são detectadas pelo mtime e tamanho de cada arquivo, e só os alterados são relidos.
+    """
+
+    def __init__(
+        self,
+        directory: Path = OUTPUT_DIR,
+        detect_language: Optional[Callable[[str], Optional[str]]] = None,
+    ):
+        self.directory = Path(directory)
+        self.index_path = self.directory / INDEX_DIR_NAME / INDEX_FILE
+        self.detect_language = detect_language or (lambda filename: None)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # Arquivos que não são JSON válido, com a assinatura lida: só são relidos se mudarem
+        self._invalid: Dict[str, List[int]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+
+        # Vários workers da API podem gravar o índice: lê-modifica-grava sob lock de arquivo
+        with self._lock, exclusive_file_lock(self.index_path.with_suffix(".lock")):
+            self._reload()
+            yield
+
+    def _reload(self) -> None:
+
+        try:
+            stat = self.index_path.stat()
+        except FileNotFoundError:
+            self._entries, self._invalid, self._signature = {}, {}, None
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            index = {}
+        if index.get("version") != INDEX_VERSION:
+            index = {}
+        self._entries = index.get("files", {})
+        self._invalid = index.get("invalid", {})
+        self._signature = signature
+
+    def _save(self) -> None:
+
+        write_json_atomic(self.index_path, {
+            "version": INDEX_VERSION,
+            "files": self._entries,
+            "invalid": self._invalid,
+        }, indent=None)
+        stat = self.index_path.stat()
+        self._signature = (stat.st_mtime_ns, stat.st_size)
+
+    def _scan(self) -> Dict[str, List[int]]:
+
+        # Só glob + stat: barato mesmo com milhares de arquivos
+        signatures = {}
+        try:
+            paths = list(self.directory.glob("*.json"))
+        except OSError:
+            return signatures
+        for path in paths:
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signatures[path.name] = [stat.st_mtime_ns, stat.st_size]
+        return signatures
+
+    def _is_current(self, signatures: Dict[str, List[int]]) -> bool:
+
+        if len(signatures) != len(self._entries) + len(self._invalid):
+            return False
+        for name, signature in signatures.items():
+            entry = self._entries.get(name)
+            if entry is not None:
+                if [entry.get("mtime_ns"), entry.get("size")] != signature:
+                    return False
+            elif self._invalid.get(name) != signature:
+                return False
+        return True
+
+    def _build_entry(
+        self,
+        path: Path,
+        data: Any,
+        previous: Optional[Dict[str, Any]] = None,
+        **fields: Any,
+    ) -> Dict[str, Any]:
+
+        stat = path.stat()
+        entry = dict(previous or {})
+        entry.update({
+            "filename": path.name,
+            "size": stat.st_size,
+            "created": stat.st_ctime,
+            "modified": stat.st_mtime,
+            "mtime_ns": stat.st_mtime_ns,
+            **describe_json_data(data),
+        })
+        for name, value in fields.items():
+            if value is not None:
+                entry[name] = value
+        if not entry.get("language_code"):
+            entry["language_code"] = self.detect_language(path.name)
+        entry.setdefault("source", None)
+        entry.setdefault("job_id", None)
+        return entry
+
+    def sync(self) -> None:
+
+        # Bloqueante (stat de cada arquivo e json.load dos alterados): a API chama numa thread
+        signatures = self._scan()
+        with self._lock:
+            self._reload()
+            if self._is_current(signatures):
+                return
+
+        with self._locked():
+            signatures = self._scan()
+            if self._is_current(signatures):
+                return
+            entries, invalid = {}, {}
+            for name, signature in signatures.items():
+                previous = self._entries.get(name)
+                if previous and [previous.get("mtime_ns"), previous.get("size")] == signature:
+                    entries[name] = previous
+                    continue
+                if self._invalid.get(name) == signature:
+                    invalid[name] = signature
+                    continue
+                path = self.directory / name
+                try:
+                    # Arquivo novo ou alterado por fora da API: única leitura completa
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    entries[name] = self._build_entry(path, data, previous)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    invalid[name] = signature
+                except OSError:
+                    continue
+            self._entries = entries
+            self._invalid = invalid
+            self._save()
+
+    def record(self, filename: str, data: Any, **fields: Any) -> Dict[str, Any]:
+
+        with self._locked():
+            entry = self._build_entry(self.directory / filename, data, self._entries.get(filename), **fields)
+            self._entries[filename] = entry
+            self._invalid.pop(filename, None)
+            self._save()
+        return entry
+
+    def remove(self, filename: str) -> None:
+
+        with self._locked():
+            self._entries.pop(filename, None)
+            self._invalid.pop(filename, None)
+            self._save()
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+
+        self.sync()
+        with self._lock:
+            return dict(self._entries)
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+
+        with self._lock:
+            self._reload()
+            return self._entries.get(filename)
+
+    def query(
+        self,
+        language: Optional[str] = None,
+        search: Optional[str] = None,
+        job_id: Optional[str] = None,
+        sort: str = "modified",
+        order: str = "desc",
+        page: int = 1,
+        page_size: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+
+        self.sync()
+        with self._lock:
+            entries = list(self._entries.values())
+
+        if language:
+            entries = [e for e in entries if e.get("language_code") == language]
+        if job_id:
+            entries = [e for e in entries if e.get("job_id") == job_id]
+        if search:
+            needle = search.lower()
+            entries = [
+                e for e in entries
+                if needle in e["filename"].lower() or needle in (e.get("source") or "").lower()
+            ]
+
+        # Sem valor (ex.: idioma não detectado) fica sempre no fim, em qualquer ordem
+        present = [e for e in entries if e.get(sort) is not None]
+        present.sort(key=lambda e: e[sort], reverse=(order == "desc"))
+        entries = present + [e for e in entries if e.get(sort) is None]
+        start = (page - 1) * page_size
+        return entries[start:start + page_size], len(entries)
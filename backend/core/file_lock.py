@@ -0,0 +1,49 @@
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+# msvcrt.locking(LK_LOCK) desiste depois de ~10s; tenta de novo até conseguir
+MSVCRT_RETRY_SECONDS = 0.05
+
+
+@contextmanager
+def exclusive_file_lock(lock_path: Path) -> Iterator[None]:
+
+    # Lock entre processos (workers do pool, workers do uvicorn): flock no POSIX, msvcrt no Windows
+    if fcntl is None and msvcrt is None:
+        raise RuntimeError(f"Sem suporte a lock de arquivo nesta plataforma: {lock_path}")
+
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            # msvcrt trava bytes a partir da posição atual: sempre o primeiro byte
+            while True:
+                lock_file.seek(0)
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(MSVCRT_RETRY_SECONDS)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
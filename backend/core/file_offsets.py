@@ -0,0 +1,385 @@
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.file_index import OUTPUT_DIR, INDEX_DIR_NAME
+
+
+OFFSETS_DB = "offsets.db"
+# Incrementar quando o formato do índice mudar: arquivos já indexados são reprocessados
+OFFSETS_VERSION = 1
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.S)
+_SCALAR = re.compile(rb'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null')
+_STRUCTURE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.S)
+
+_OPEN_OBJECT, _CLOSE_OBJECT = ord("{"), ord("}")
+_OPEN_ARRAY, _CLOSE_ARRAY = ord("["), ord("]")
+_QUOTE, _COLON, _COMMA = ord('"'), ord(":"), ord(",")
+
+
+def escape_pointer_token(token: str) -> str:
+
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def parse_pointer(pointer: str) -> List[str]:
+
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError("JSON pointer deve começar com '/'")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def build_pointer(tokens: List[str]) -> str:
+
+    return "".join(f"/{escape_pointer_token(t)}" for t in tokens)
+
+
+def _decode_string(raw: bytes) -> str:
+
+    if b"\\" in raw:
+        return json.loads(raw)
+    return raw[1:-1].decode("utf-8")
+
+
+class _OffsetScanner:
+    """
+    Varre o JSON em bytes uma única vez e registra a posição (início, fim) de cada chave
+    achatada, na mesma ordem e com as mesmas regras de flatten_object, e de cada
+    objeto/array alcançável por elas, indexado por JSON pointer.
+    Listas que viram valor (e o que houver dentro delas) são só puladas.
+    """
+
+    def __init__(self, buf: bytes):
+        self.buf = buf
+        self.leaves: List[Tuple[str, int, int]] = []
+        self.containers: List[Tuple[str, int, int]] = []
+
+    def _error(self, pos: int, expected: str) -> ValueError:
+        return ValueError(f"JSON inválido na posição {pos}: esperado {expected}")
+
+    def _skip_array(self, pos: int) -> int:
+
+        depth = 0
+        buf = self.buf
+        for match in _STRUCTURE.finditer(buf, pos):
+            char = buf[match.start()]
+            if char == _QUOTE:
+                continue
+            if char == _OPEN_ARRAY or char == _OPEN_OBJECT:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        raise self._error(len(buf), "]")
+
+    def _value(self, pos: int, pointer: str, key: str) -> int:
+
+        buf = self.buf
+        char = buf[pos]
+        if char == _OPEN_OBJECT:
+            return self.scan_object(pos, pointer, key)
+        if char == _QUOTE:
+            match = _STRING.match(buf, pos)
+        elif char == _OPEN_ARRAY:
+            end = self._skip_array(pos)
+            self.containers.append((pointer, pos, end))
+            self.leaves.append((key, pos, end))
+            return end
+        else:
+            match = _SCALAR.match(buf, pos)
+        if not match:
+            raise self._error(pos, "um valor")
+        end = match.end()
+        self.leaves.append((key, pos, end))
+        return end
+
+    def scan_object(self, pos: int, pointer: str, key: str) -> int:
+
+        buf = self.buf
+        skip = _WHITESPACE.match
+        start = pos
+        pos = skip(buf, pos + 1).end()
+        if buf[pos] == _CLOSE_OBJECT:
+            end = pos + 1
+        else:
+            while True:
+                match = _STRING.match(buf, pos)
+                if not match:
+                    raise self._error(pos, "uma chave")
+                name = _decode_string(match.group())
+                pos = skip(buf, match.end()).end()
+                if buf[pos] != _COLON:
+                    raise self._error(pos, ":")
+                pos = skip(buf, pos + 1).end()
+                pos = self._value(pos, f"{pointer}/{escape_pointer_token(name)}", f"{key}.{name}" if key else name)
+                pos = skip(buf, pos).end()
+                if buf[pos] == _COMMA:
+                    pos = skip(buf, pos + 1).end()
+                    continue
+                if buf[pos] != _CLOSE_OBJECT:
+                    raise self._error(pos, "}")
+                end = pos + 1
+                break
+        self.containers.append((pointer, start, end))
+        return end
+
+    def scan_root(self) -> None:
+
+        buf = self.buf
+        skip = _WHITESPACE.match
+        pos = skip(buf, 3 if buf.startswith(b"\xef\xbb\xbf") else 0).end()
+        if pos >= len(buf):
+            raise self._error(pos, "um valor")
+        char = buf[pos]
+        if char == _OPEN_OBJECT:
+            end = self.scan_object(pos, "", "")
+        elif char == _OPEN_ARRAY:
+            # Como em flatten_object, só a lista raiz é expandida
+            start = pos
+            pos = skip(buf, pos + 1).end()
+            index = 0
+            if buf[pos] == _CLOSE_ARRAY:
+                end = pos + 1
+            else:
+                while True:
+                    pos = self._value(pos, f"/{index}", f"[{index}]")
+                    index += 1
+                    pos = skip(buf, pos).end()
+                    if buf[pos] == _COMMA:
+                        pos = skip(buf, pos + 1).end()
+                        continue
+                    if buf[pos] != _CLOSE_ARRAY:
+                        raise self._error(pos, "]")
+                    end = pos + 1
+                    break
+            self.containers.append(("", start, end))
+        else:
+            return
+        # Lixo depois da raiz (ex.: dois documentos colados) também é JSON inválido
+        if skip(buf, end).end() != len(buf):
+            raise self._error(skip(buf, end).end(), "o fim do documento")
+
+
+def scan_offsets(buf: bytes) -> Tuple[List[Tuple[str, int, int]], List[Tuple[str, int, int]]]:
+
+    scanner = _OffsetScanner(buf)
+    try:
+        scanner.scan_root()
+    except IndexError:
+        # O buffer acabou no meio de um objeto ou array
+        raise scanner._error(len(buf), "o fim do documento (arquivo truncado)")
+    return scanner.leaves, scanner.containers
+
+
+class FileOffsetIndex:
+    """
+    Índice de posições em bytes dos arquivos de output/, persistido em
+    output/.index/offsets.db. É construído uma vez por versão do arquivo e permite ler
+    uma subárvore ou uma página de chaves achatadas sem reprocessar o documento.
+    """
+
+    def __init__(self, directory: Path = OUTPUT_DIR):
+        self.directory = Path(directory)
+        self.path = self.directory / INDEX_DIR_NAME / OFFSETS_DB
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    file_id INTEGER PRIMARY KEY,
+                    filename TEXT NOT NULL UNIQUE,
+                    version INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    leaves INTEGER NOT NULL
+                )
+            """)
+            # Chaves achatadas em ordem de documento: a posição inicial é a própria ordem
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS leaves (
+                    file_id INTEGER NOT NULL,
+                    start INTEGER NOT NULL,
+                    end INTEGER NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (file_id, start)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS leaves_key ON leaves (file_id, key)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS containers (
+                    file_id INTEGER NOT NULL,
+                    pointer TEXT NOT NULL,
+                    start INTEGER NOT NULL,
+                    end INTEGER NOT NULL,
+                    PRIMARY KEY (file_id, pointer)
+                ) WITHOUT ROWID
+            """)
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def _indexed(self, filename: str) -> Optional[Tuple[int, int]]:
+
+        stat = (self.directory / filename).stat()
+        row = self._query(
+            "SELECT file_id, leaves, version, mtime_ns, size FROM files WHERE filename = ?",
+            (filename,),
+        )
+        if row and row[0][2:] == (OFFSETS_VERSION, stat.st_mtime_ns, stat.st_size):
+            return row[0][:2]
+        return None
+
+    def ensure(self, filename: str) -> Tuple[int, int]:
+
+        indexed = self._indexed(filename)
+        if indexed:
+            return indexed
+
+        with self._build_lock:
+            # Outra thread pode ter indexado o arquivo enquanto esta esperava
+            indexed = self._indexed(filename)
+            if indexed:
+                return indexed
+            path = self.directory / filename
+            stat = path.stat()
+            leaves, containers = scan_offsets(path.read_bytes())
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._delete_rows(conn, filename)
+                    file_id = conn.execute(
+                        "INSERT INTO files (filename, version, mtime_ns, size, leaves) VALUES (?, ?, ?, ?, ?)",
+                        (filename, OFFSETS_VERSION, stat.st_mtime_ns, stat.st_size, len(leaves)),
+                    ).lastrowid
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO leaves (file_id, start, end, key) VALUES (?, ?, ?, ?)",
+                        ((file_id, start, end, key) for key, start, end in leaves),
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO containers (file_id, pointer, start, end) VALUES (?, ?, ?, ?)",
+                        ((file_id, pointer, start, end) for pointer, start, end in containers),
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            return file_id, len(leaves)
+
+    def _delete_rows(self, conn: sqlite3.Connection, filename: str) -> None:
+
+        for (file_id,) in conn.execute("SELECT file_id FROM files WHERE filename = ?", (filename,)).fetchall():
+            conn.execute("DELETE FROM leaves WHERE file_id = ?", (file_id,))
+            conn.execute("DELETE FROM containers WHERE file_id = ?", (file_id,))
+        conn.execute("DELETE FROM files WHERE filename = ?", (filename,))
+
+    def remove(self, filename: str) -> None:
+
+        if not self.path.exists():
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete_rows(conn, filename)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _container(self, file_id: int, pointer: str) -> Optional[Tuple[int, int]]:
+
+        row = self._query("SELECT start, end FROM containers WHERE file_id = ? AND pointer = ?", (file_id, pointer))
+        return row[0] if row else None
+
+    def subtree(self, filename: str, pointer: str) -> Any:
+
+        file_id, _ = self.ensure(filename)
+        tokens = parse_pointer(pointer)
+        # Sobe até o objeto/array indexado mais próximo, lê só o trecho dele e desce o resto
+        span = None
+        for depth in range(len(tokens), -1, -1):
+            span = self._container(file_id, build_pointer(tokens[:depth]))
+            if span:
+                break
+
+        with open(self.directory / filename, 'rb') as f:
+            if span:
+                f.seek(span[0])
+                node = json.loads(f.read(span[1] - span[0]))
+            else:
+                # Raiz é um valor simples
+                node, depth = json.load(f), 0
+
+        for token in tokens[depth:]:
+            try:
+                node = node[int(token)] if isinstance(node, list) else node[token]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise KeyError(pointer)
+        return node
+
+    def entries(
+        self,
+        filename: str,
+        pointer: Optional[str] = None,
+        prefix: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 100,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+
+        file_id, total = self.ensure(filename)
+        where = ["file_id = ?"]
+        params: List[Any] = [file_id]
+        if pointer:
+            span = self._container(file_id, pointer)
+            if not span:
+                # Valor simples ou nó dentro de uma lista-valor: existe, mas não tem chaves achatadas
+                self.subtree(filename, pointer)
+                return [], 0
+            # As chaves de uma subárvore ocupam um intervalo contínuo de posições
+            where.append("start >= ? AND start < ?")
+            params.extend(span)
+        if prefix:
+            where.append("key >= ? AND key < ?")
+            params.extend([prefix, prefix + "\U0010ffff"])
+
+        clause = " AND ".join(where)
+        indexed_by = ""
+        if len(where) > 1:
+            matched = self._query(f"SELECT COUNT(*) FROM leaves WHERE {clause}", tuple(params))[0][0]
+            # Prefixo seletivo: buscar pelo índice de chaves e ordenar o resultado sai mais barato
+            # que percorrer o arquivo inteiro em ordem (o planner não sabe estimar isso sozinho)
+            if prefix and not pointer and matched * 10 < total:
+                indexed_by = "INDEXED BY leaves_key"
+            total = matched
+        rows = self._query(
+            f"SELECT key, start, end FROM leaves {indexed_by} WHERE {clause} ORDER BY start LIMIT ? OFFSET ?",
+            tuple(params) + (page_size, (page - 1) * page_size),
+        )
+
+        entries = []
+        with open(self.directory / filename, 'rb') as f:
+            for key, start, end in rows:
+                f.seek(start)
+                entries.append({"key": key, "value": json.loads(f.read(end - start))})
+        return entries, total
@@ -0,0 +1,225 @@
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.file_lock import exclusive_file_lock
+
+
+CHECKPOINT_DIR = Path(os.getenv("JOB_CHECKPOINT_DIR", "output/.checkpoints"))
+
+PLAN_FILE = "plan.json"
+JOURNAL_FILE = "journal.jsonl"
+CANCEL_FILE = "cancel.json"
+RESUME_LOCK_FILE = ".resume.lock"
+# Diretório só com o pedido de cancelamento (o job terminou antes do pedido): removido na subida após esse tempo
+ORPHAN_CANCEL_SECONDS = int(os.getenv("JOB_ORPHAN_CANCEL_SECONDS", "3600"))
+
+
+class JobCheckpoint:
+    """
+    Armazenamento durável de um job: o plano (parâmetros, JSON de origem e batches)
+    e um journal append-only com cada tradução paga e cada batch concluído.
+    """
+
+    def __init__(self, job_id: str, directory: Optional[Path] = None):
+        self.job_id = job_id
+        self.path = Path(directory or CHECKPOINT_DIR) / job_id
+        self._journal = None
+
+    @property
+    def plan_path(self) -> Path:
+        return self.path / PLAN_FILE
+
+    @property
+    def journal_path(self) -> Path:
+        return self.path / JOURNAL_FILE
+
+    def exists(self) -> bool:
+        return self.plan_path.exists()
+
+    def save_plan(self, plan: Dict[str, Any]) -> None:
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.plan_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(plan, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.plan_path)
+
+    def load_plan(self) -> Optional[Dict[str, Any]]:
+
+        try:
+            with open(self.plan_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def update_plan(self, **fields: Any) -> None:
+
+        plan = self.load_plan()
+        if plan is None:
+            return
+        plan.update(fields)
+        plan["updated_at"] = time.time()
+        self.save_plan(plan)
+
+    def _append(self, record: Dict[str, Any], durable: bool = False) -> None:
+
+        if self._journal is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        if durable:
+            os.fsync(self._journal.fileno())
+
+    def record_translation(self, original: str, translated: str) -> None:
+
+        self._append({"t": "cache", "s": original, "v": translated})
+
+    def record_batch(self, batch_num: int, results: List[Dict[str, Any]], stats: Dict[str, Any]) -> None:
+
+        self._append({
+            "t": "batch",
+            "n": batch_num,
+            "r": [[r["key"], r["translated"]] for r in results],
+            "stats": stats,
+        }, durable=True)
+
+    def load_journal(self) -> Dict[str, Any]:
+
+        state = {"cache": {}, "batches": {}, "stats": None}
+        if not self.journal_path.exists():
+            return state
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha truncada por um crash no meio da escrita
+                    continue
+                if record.get("t") == "cache":
+                    state["cache"][record["s"]] = record["v"]
+                elif record.get("t") == "batch":
+                    state["batches"][record["n"]] = [
+                        {"key": key, "translated": value} for key, value in record["r"]
+                    ]
+                    state["stats"] = record.get("stats") or state["stats"]
+        return state
+
+    def request_cancel(self, keep_partial: bool = True) -> None:
+
+        # Marcador no disco: visível ao processo worker (ou a outro worker da API) que executa o job
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / CANCEL_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"keep_partial": keep_partial, "requested_at": time.time()}, f)
+
+    def cancel_request(self) -> Optional[Dict[str, Any]]:
+
+        try:
+            with open(self.path / CANCEL_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            # Marcador sendo escrito: o pedido existe mesmo sem as opções
+            return {"keep_partial": True}
+
+    def close(self) -> None:
+
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def remove(self) -> None:
+
+        self.close()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def is_orphan_cancel(self, min_age: float = 0.0) -> bool:
+
+        # Sem plano, só o marcador: o job já terminou (ou nunca começou) e ninguém vai ler o pedido
+        if self.plan_path.exists():
+            return False
+        try:
+            age = time.time() - (self.path / CANCEL_FILE).stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return age >= min_age and not self.journal_path.exists()
+
+
+class CheckpointedCache(dict):
+    """Cache de traduções que registra cada nova entrada no journal do job."""
+
+    def __init__(self, checkpoint: JobCheckpoint, initial: Optional[Dict[str, str]] = None):
+        super().__init__(initial or {})
+        self.checkpoint = checkpoint
+
+    def __setitem__(self, original: str, translated: str) -> None:
+        if self.get(original) != translated:
+            self.checkpoint.record_translation(original, translated)
+        super().__setitem__(original, translated)
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _resume_lock(base: Path) -> Iterator[None]:
+
+    # Serializa a retomada entre processos da API que sobem ao mesmo tempo
+    with exclusive_file_lock(base / RESUME_LOCK_FILE):
+        yield
+
+
+def list_interrupted_checkpoints(directory: Optional[Path] = None) -> List[JobCheckpoint]:
+
+    base = Path(directory or CHECKPOINT_DIR)
+    if not base.exists():
+        return []
+
+    interrupted = []
+    for job_dir in sorted(base.iterdir()):
+        if not job_dir.is_dir():
+            continue
+        checkpoint = JobCheckpoint(job_dir.name, base)
+        plan = checkpoint.load_plan()
+        # Planos com dono vivo pertencem a outro processo (ex.: outro worker do uvicorn)
+        if plan and plan.get("status") in ("pending", "processing") and not _process_alive(plan.get("owner_pid")):
+            interrupted.append(checkpoint)
+    return interrupted
+
+
+def claim_interrupted_checkpoints(directory: Optional[Path] = None) -> List[JobCheckpoint]:
+
+    base = Path(directory or CHECKPOINT_DIR)
+    if not base.exists():
+        return []
+
+    with _resume_lock(base):
+        for job_dir in base.iterdir():
+            checkpoint = JobCheckpoint(job_dir.name, base)
+            # Um job enfileirado ainda pode ler um pedido recente: só marcadores antigos saem
+            if job_dir.is_dir() and checkpoint.is_orphan_cancel(ORPHAN_CANCEL_SECONDS):
+                checkpoint.remove()
+        claimed = list_interrupted_checkpoints(base)
+        for checkpoint in claimed:
+            # O processo que retoma vira dono até o worker que executa o job assumir
+            checkpoint.update_plan(owner_pid=os.getpid())
+    return claimed
@@ -0,0 +1,100 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Eventos de batch guardados por assinante entre duas entregas (os mais antigos são descartados)
+MAX_PENDING_EVENTS = 100
+
+
+class JobEventStream:
+    """
+    Assinatura dos eventos de um job. Eventos publicados entre duas leituras são
+    acumulados e entregues juntos, para que batches rápidos não inundem o cliente.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._pending: deque = deque(maxlen=MAX_PENDING_EVENTS)
+        self._dropped = 0
+        self._signal = asyncio.Event()
+
+    def push(self, event: Dict[str, Any]) -> None:
+
+        if len(self._pending) == self._pending.maxlen:
+            self._dropped += 1
+        self._pending.append(event)
+        self._signal.set()
+
+    async def wait(self, timeout: float) -> bool:
+
+        try:
+            await asyncio.wait_for(self._signal.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def drain(self) -> Dict[str, Any]:
+
+        events = list(self._pending)
+        dropped = self._dropped
+        self._pending.clear()
+        self._dropped = 0
+        self._signal.clear()
+        return {"events": events, "dropped": dropped}
+
+
+_subscribers: Dict[str, List[JobEventStream]] = {}
+
+# Em processos worker, os eventos são encaminhados ao processo da API em vez de entregues localmente
+_forwarder: Optional[Callable[[str, Dict[str, Any]], None]] = None
+
+
+# Chamados a cada evento entregue localmente (ex.: persistir o snapshot no store compartilhado)
+_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+
+
+def add_listener(listener: Callable[[str, Dict[str, Any]], None]) -> None:
+
+    _listeners.append(listener)
+
+
+def set_forwarder(forwarder: Optional[Callable[[str, Dict[str, Any]], None]]) -> None:
+
+    global _forwarder
+    _forwarder = forwarder
+
+
+def subscribe(job_id: str) -> JobEventStream:
+
+    stream = JobEventStream(job_id)
+    _subscribers.setdefault(job_id, []).append(stream)
+    return stream
+
+
+def unsubscribe(stream: JobEventStream) -> None:
+
+    streams = _subscribers.get(stream.job_id)
+    if not streams:
+        return
+    if stream in streams:
+        streams.remove(stream)
+    if not streams:
+        del _subscribers[stream.job_id]
+
+
+def publish(job_id: str, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+
+    event = {"type": event_type, **(data or {})}
+    if _forwarder is not None:
+        _forwarder(job_id, event)
+        return
+
+    for listener in _listeners:
+        listener(job_id, event)
+
+    streams = _subscribers.get(job_id)
+    if not streams:
+        return
+    for stream in streams:
+        stream.push(event)
@@ -0,0 +1,417 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from core.payload_cache import CompressedPayload, SpilledPayload
+
+
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", str(6 * 3600)))
+JOB_STORE_MAX_FINISHED = int(os.getenv("JOB_STORE_MAX_FINISHED", "200"))
+JOB_STORE_MEMORY_BUDGET_MB = int(os.getenv("JOB_STORE_MEMORY_BUDGET_MB", "256"))
+RESULT_SPILL_DIR = Path(os.getenv("RESULT_SPILL_DIR", "output/.results"))
+# Resultados menores que isso ficam sempre em memória
+RESULT_SPILL_MIN_BYTES = 256 * 1024
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+# Jobs que ainda respondem a um pedido idêntico: em andamento, ou concluídos com resultado
+REUSABLE_STATUSES = ("pending", "queued", "processing", "completed")
+
+# "memory" (um processo) ou "sqlite" (estado compartilhado entre workers do uvicorn)
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "memory")
+JOB_STORE_PATH = Path(os.getenv("JOB_STORE_PATH", "output/.jobs.db"))
+
+
+class JobStore:
+    """
+    Armazena jobs em memória com limites: jobs finalizados expiram após o TTL, são
+    descartados por LRU acima de `max_finished`, e resultados grandes são despejados
+    em disco quando a memória estimada passa do orçamento.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = JOB_TTL_SECONDS,
+        max_finished: int = JOB_STORE_MAX_FINISHED,
+        memory_budget_bytes: int = JOB_STORE_MEMORY_BUDGET_MB * 1024 * 1024,
+        spill_dir: Path = RESULT_SPILL_DIR,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self.memory_budget_bytes = memory_budget_bytes
+        self.spill_dir = Path(spill_dir)
+        self._jobs: "OrderedDict[str, Any]" = OrderedDict()
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def add(self, job: Any) -> None:
+
+        self._jobs[job.job_id] = job
+        self._jobs.move_to_end(job.job_id)
+        self.evict()
+
+    def save(self, job: Any) -> None:
+
+        # Em memória o próprio objeto é o estado
+        pass
+
+    def is_local(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def get(self, job_id: str) -> Optional[Any]:
+
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if self._is_expired(job, time.time()):
+            self._remove(job_id)
+            return None
+        self._jobs.move_to_end(job_id)
+        return job
+
+    def list(self) -> List[Any]:
+
+        self.evict()
+        return list(self._jobs.values())
+
+    def find_by_request_key(self, request_key: str) -> Optional[Any]:
+
+        now = time.time()
+        for job in reversed(self._jobs.values()):
+            if (job.config or {}).get("request_key") != request_key or job.status not in REUSABLE_STATUSES:
+                continue
+            if self._is_expired(job, now):
+                continue
+            if job.status == "completed" and job.result_payload is None and job.result_data is None:
+                continue
+            return job
+        return None
+
+    def delete(self, job_id: str) -> bool:
+
+        if job_id not in self._jobs:
+            return False
+        self._remove(job_id)
+        return True
+
+    def pop(self, job_id: str) -> Optional[Any]:
+
+        # Remove sem apagar resultado despejado em disco (o dono passa a ser outro processo)
+        return self._jobs.pop(job_id, None)
+
+    def _remove(self, job_id: str) -> None:
+
+        job = self._jobs.pop(job_id)
+        if isinstance(job.result_payload, SpilledPayload):
+            job.result_payload.remove()
+
+    def _is_expired(self, job: Any, now: float) -> bool:
+
+        return (
+            job.status in FINISHED_STATUSES and
+            job.end_time is not None and
+            now - job.end_time > self.ttl_seconds
+        )
+
+    def memory_usage(self, job: Any) -> int:
+
+        # Corpo comprimido + JSON serializado como proxy do dict, se o resultado ainda estiver em memória
+        payload = job.result_payload
+        if not isinstance(payload, CompressedPayload):
+            return 0
+        return payload.compressed_size + (payload.size if job.result_data is not None else 0)
+
+    def stats(self) -> Dict[str, Any]:
+
+        return {
+            "backend": "memory",
+            "jobs": len(self._jobs),
+            "finished": sum(1 for j in self._jobs.values() if j.status in FINISHED_STATUSES),
+            "spilled": sum(1 for j in self._jobs.values() if isinstance(j.result_payload, SpilledPayload)),
+            "memory_bytes": sum(self.memory_usage(j) for j in self._jobs.values()),
+            "memory_budget_bytes": self.memory_budget_bytes,
+        }
+
+    def spill(self, job: Any) -> None:
+
+        if not isinstance(job.result_payload, CompressedPayload):
+            return
+        job.result_payload = job.result_payload.spill(self.spill_dir / f"{job.job_id}.json.gz")
+        job.result_data = None
+
+    def evict(self) -> None:
+
+        now = time.time()
+        for job_id in [j for j, job in self._jobs.items() if self._is_expired(job, now)]:
+            self._remove(job_id)
+
+        # LRU: o início do OrderedDict é o job acessado há mais tempo
+        finished = [j for j, job in self._jobs.items() if job.status in FINISHED_STATUSES]
+        while len(finished) > self.max_finished:
+            self._remove(finished.pop(0))
+
+        usage = sum(self.memory_usage(job) for job in self._jobs.values())
+        if usage <= self.memory_budget_bytes:
+            return
+        for job_id in finished:
+            job = self._jobs[job_id]
+            size = self.memory_usage(job)
+            if size >= RESULT_SPILL_MIN_BYTES:
+                self.spill(job)
+                usage -= size
+                if usage <= self.memory_budget_bytes:
+                    return
+
+        # Ainda acima do orçamento só com resultados pequenos: descarta os menos usados
+        for job_id in finished:
+            if usage <= self.memory_budget_bytes:
+                break
+            size = self.memory_usage(self._jobs[job_id]) if job_id in self._jobs else 0
+            if size > 0:
+                usage -= size
+                self._remove(job_id)
+
+
+class StoredPayload:
+    """Resultado comprimido guardado no SQLite; o blob só é lido quando o corpo é pedido."""
+
+    def __init__(self, store: "SQLiteJobStore", job_id: str, etag: str, size: int):
+        self.store = store
+        self.job_id = job_id
+        self.etag = etag
+        self.size = size
+
+    @property
+    def compressed_size(self) -> int:
+        return 0
+
+    def _load(self) -> CompressedPayload:
+
+        gzip_body = self.store.load_result(self.job_id)
+        if gzip_body is None:
+            raise FileNotFoundError(f"Resultado do job {self.job_id} não está mais disponível")
+        return CompressedPayload.from_compressed(gzip_body, self.etag, self.size)
+
+    def body(self) -> bytes:
+        return self._load().body()
+
+    def encoded(self, encoding: str) -> bytes:
+        return self._load().encoded(encoding)
+
+
+class SQLiteJobStore:
+    """
+    Jobs num SQLite compartilhado pelos processos da API (ex.: `uvicorn --workers N`).
+    O processo dono mantém o job vivo em memória e grava um snapshot a cada evento;
+    os demais reconstroem o job a partir da linha, então status, resultado e exclusão
+    funcionam em qualquer worker.
+    """
+
+    def __init__(
+        self,
+        job_factory: Callable[[str], Any],
+        path: Path = JOB_STORE_PATH,
+        ttl_seconds: int = JOB_TTL_SECONDS,
+        max_finished: int = JOB_STORE_MAX_FINISHED,
+    ):
+        self.job_factory = job_factory
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self._local: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+
+        # Conexão aberta sob demanda: processos worker que nunca usam o store não tocam no arquivo
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    snapshot TEXT NOT NULL,
+                    config TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    end_time REAL,
+                    result_etag TEXT,
+                    result_size INTEGER,
+                    result_gzip BLOB
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_updated ON jobs (status, updated_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_request_key ON jobs (json_extract(config, '$.request_key'))")
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+
+        with self._lock:
+            return self._connection().execute(sql, params)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._local
+
+    def __len__(self) -> int:
+        return self._execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def is_local(self, job_id: str) -> bool:
+        return job_id in self._local
+
+    def add(self, job: Any) -> None:
+
+        now = time.time()
+        self._local[job.job_id] = job
+        self._execute(
+            "INSERT OR REPLACE INTO jobs (job_id, status, snapshot, config, created_at, updated_at, end_time) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job.job_id, job.status, json.dumps(job.snapshot()), json.dumps(job.config), now, now, job.end_time),
+        )
+        self.evict()
+
+    def save(self, job: Any) -> None:
+
+        if job.job_id not in self._local:
+            return
+
+        cursor = self._execute(
+            "UPDATE jobs SET status = ?, snapshot = ?, config = ?, updated_at = ?, end_time = ? WHERE job_id = ?",
+            (job.status, json.dumps(job.snapshot()), json.dumps(job.config), time.time(), job.end_time, job.job_id),
+        )
+        if cursor.rowcount == 0:
+            # Excluído por outro processo
+            self._local.pop(job.job_id, None)
+            return
+
+        payload = job.result_payload
+        if job.status in FINISHED_STATUSES and payload is not None:
+            self._execute(
+                "UPDATE jobs SET result_etag = ?, result_size = ?, result_gzip = ? WHERE job_id = ?",
+                (payload.etag, payload.size, payload.encoded("gzip"), job.job_id),
+            )
+            if isinstance(payload, SpilledPayload):
+                payload.remove()
+        if job.status in FINISHED_STATUSES:
+            # Finalizado e gravado: daqui em diante qualquer processo lê do banco
+            self._local.pop(job.job_id, None)
+
+    def _build(self, row: tuple) -> Any:
+
+        job_id, status, snapshot, config, result_etag, result_size = row
+        job = self.job_factory(job_id)
+        job.apply_snapshot(json.loads(snapshot))
+        job.config = json.loads(config) if config else None
+        if result_etag is not None:
+            job.result_payload = StoredPayload(self, job_id, result_etag, result_size)
+        return job
+
+    def get(self, job_id: str) -> Optional[Any]:
+
+        row = self._execute(
+            "SELECT job_id, status, snapshot, config, result_etag, result_size, end_time FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            self._local.pop(job_id, None)
+            return None
+        end_time = row[-1]
+        if row[1] in FINISHED_STATUSES and end_time is not None and time.time() - end_time > self.ttl_seconds:
+            self.delete(job_id)
+            return None
+        job = self._local.get(job_id)
+        if job is not None:
+            return job
+        return self._build(row[:-1])
+
+    def load_result(self, job_id: str) -> Optional[bytes]:
+
+        row = self._execute("SELECT result_gzip FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def list(self) -> List[Any]:
+
+        self.evict()
+        rows = self._execute(
+            "SELECT job_id, status, snapshot, config, result_etag, result_size FROM jobs ORDER BY created_at"
+        ).fetchall()
+        return [self._local.get(row[0]) or self._build(row) for row in rows]
+
+    def find_by_request_key(self, request_key: str) -> Optional[Any]:
+
+        # Busca no banco: o job idêntico pode ter sido criado por outro worker da API
+        placeholders = ", ".join("?" for _ in REUSABLE_STATUSES)
+        row = self._execute(
+            f"SELECT job_id FROM jobs WHERE json_extract(config, '$.request_key') = ? AND status IN ({placeholders}) "
+            f"AND (status != 'completed' OR result_etag IS NOT NULL) ORDER BY updated_at DESC LIMIT 1",
+            (request_key, *REUSABLE_STATUSES),
+        ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def delete(self, job_id: str) -> bool:
+
+        cursor = self._execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        job = self._local.pop(job_id, None)
+        if job is not None and isinstance(job.result_payload, SpilledPayload):
+            job.result_payload.remove()
+        return cursor.rowcount > 0 or job is not None
+
+    def pop(self, job_id: str) -> Optional[Any]:
+
+        return self._local.pop(job_id, None)
+
+    def evict(self) -> None:
+
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        self._execute(
+            f"DELETE FROM jobs WHERE status IN ({placeholders}) AND end_time < ?",
+            (*FINISHED_STATUSES, time.time() - self.ttl_seconds),
+        )
+        # Sem registro de acesso compartilhado: descarta os finalizados há mais tempo
+        self._execute(
+            f"DELETE FROM jobs WHERE job_id IN (SELECT job_id FROM jobs WHERE status IN ({placeholders}) "
+            f"ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (*FINISHED_STATUSES, self.max_finished),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        total, finished, result_bytes = self._execute(
+            f"SELECT COUNT(*), SUM(status IN ({placeholders})), COALESCE(SUM(LENGTH(result_gzip)), 0) FROM jobs",
+            FINISHED_STATUSES,
+        ).fetchone()
+        return {
+            "backend": "sqlite",
+            "path": str(self.path),
+            "jobs": total,
+            "finished": finished or 0,
+            "local_jobs": len(self._local),
+            "result_bytes": result_bytes,
+        }
+
+
+def create_job_store(job_factory: Callable[[str], Any], backend: str = JOB_STORE_BACKEND) -> Any:
+
+    if backend == "sqlite":
+        return SQLiteJobStore(job_factory)
+    if backend == "memory":
+        return JobStore()
+    raise ValueError(f"JOB_STORE_BACKEND inválido: {backend} (use 'memory' ou 'sqlite')")
+
+
+def load_payload_result_data(payload: Any) -> Any:
+
+    return json.loads(payload.body())["data"]
@@ -0,0 +1,358 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from scripts.script_openai import hash_source_value
+
+
+COMPARE_CACHE_PATH = Path(os.getenv("COMPARE_CACHE_PATH", "output/.compare.db"))
+# Quantas comparações (pares de documentos) ficam guardadas; as menos usadas saem primeiro
+COMPARE_CACHE_MAX = int(os.getenv("COMPARE_CACHE_MAX", "20"))
+DIFF_STATUSES = ("added", "removed", "modified", "keyChanged", "emptyValue", "unchanged")
+INSERT_CHUNK_SIZE = 5000
+
+_encode_entry = json.JSONEncoder(ensure_ascii=False).encode
+
+# (caminho, caminho do objeto pai, chave, valor)
+Leaf = Tuple[str, str, str, Any]
+
+
+def value_type(value: Any) -> str:
+
+    # Mesmos nomes de tipo que o frontend exibe (typeof do JavaScript)
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def value_signature(value: Any) -> Tuple[str, str]:
+
+    # O tipo entra na assinatura: "1" e 1 têm o mesmo hash de conteúdo
+    return value_type(value), hash_source_value(value)
+
+
+def values_equal(old_value: Any, new_value: Any) -> bool:
+
+    # Caso comum (duas strings) sem serializar nem calcular hash
+    if type(old_value) is str and type(new_value) is str:
+        return old_value == new_value
+    return value_signature(old_value) == value_signature(new_value)
+
+
+def document_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def build_compare_id(left_hash: str, right_hash: str) -> str:
+    return f"{left_hash[:24]}-{right_hash[:24]}"
+
+
+def flatten_leaves(obj: Any, prefix: str = "") -> Iterator[Leaf]:
+
+    # Objetos são percorridos; arrays e escalares são folhas (como na comparação do frontend)
+    items = obj.items() if isinstance(obj, dict) else ((str(i), item) for i, item in enumerate(obj))
+    for key, value in items:
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict) and value:
+            yield from flatten_leaves(value, path)
+        else:
+            yield path, prefix, key, value
+
+
+def _pair_renames(
+    removed: List[Leaf],
+    added: List[Leaf],
+    group_by: int,
+) -> List[Tuple[Leaf, Leaf]]:
+
+    # Casa cada chave removida com a primeira adicionada de mesmo valor (hash) e mesmo grupo;
+    # group_by=1 agrupa pelo objeto pai, group_by=2 pelo nome da chave
+    candidates: Dict[Tuple[str, Tuple[str, str]], Deque[Leaf]] = defaultdict(deque)
+    for leaf in added:
+        candidates[(leaf[group_by], value_signature(leaf[3]))].append(leaf)
+
+    pairs = []
+    for leaf in removed:
+        queue = candidates.get((leaf[group_by], value_signature(leaf[3])))
+        if queue:
+            pairs.append((leaf, queue.popleft()))
+    return pairs
+
+
+def diff_documents(left: Any, right: Any) -> List[Dict[str, Any]]:
+
+    if not isinstance(left, (dict, list)) or not isinstance(right, (dict, list)):
+        raise ValueError("JSON deve ser um objeto ou array")
+
+    left_leaves = {leaf[0]: leaf for leaf in flatten_leaves(left)}
+    right_leaves = {leaf[0]: leaf for leaf in flatten_leaves(right)}
+    entries: List[Dict[str, Any]] = []
+
+    for path, (_, _, _, old_value) in left_leaves.items():
+        if path not in right_leaves:
+            continue
+        new_value = right_leaves[path][3]
+        if old_value == "" or new_value == "":
+            entries.append({
+                "status": "emptyValue",
+                "path": path,
+                "oldValue": old_value,
+                "newValue": new_value,
+                "oldType": value_type(old_value),
+                "newType": value_type(new_value),
+                "isEmptyInFile1": old_value == "",
+                "isEmptyInFile2": new_value == "",
+            })
+        elif values_equal(old_value, new_value):
+            entries.append({"status": "unchanged", "path": path, "value": old_value})
+        else:
+            entries.append({
+                "status": "modified",
+                "path": path,
+                "oldValue": old_value,
+                "newValue": new_value,
+                "oldType": value_type(old_value),
+                "newType": value_type(new_value),
+            })
+
+    # Renomeações: primeiro dentro do mesmo objeto, depois chaves de mesmo nome movidas
+    # para outro objeto. Valores vazios não servem de evidência e ficam de fora.
+    removed = [leaf for path, leaf in left_leaves.items() if path not in right_leaves and leaf[3] != ""]
+    added = [leaf for path, leaf in right_leaves.items() if path not in left_leaves and leaf[3] != ""]
+    renamed: List[Tuple[Leaf, Leaf]] = []
+    for group_by in (1, 2):
+        pairs = _pair_renames(removed, added, group_by)
+        matched_old = {old[0] for old, _ in pairs}
+        matched_new = {new[0] for _, new in pairs}
+        removed = [leaf for leaf in removed if leaf[0] not in matched_old]
+        added = [leaf for leaf in added if leaf[0] not in matched_new]
+        renamed.extend(pairs)
+
+    old_renamed = {old[0] for old, _ in renamed}
+    new_renamed = {new[0] for _, new in renamed}
+    for old, new in renamed:
+        entries.append({
+            "status": "keyChanged",
+            "path": new[0],
+            "oldPath": old[0],
+            "oldKey": old[2],
+            "newKey": new[2],
+            "oldValue": old[3],
+            "newValue": new[3],
+            "type": value_type(new[3]),
+        })
+    for path, (_, _, _, value) in left_leaves.items():
+        if path not in right_leaves and path not in old_renamed:
+            entries.append({"status": "removed", "path": path, "value": value, "type": value_type(value), "isEmpty": value == ""})
+    for path, (_, _, _, value) in right_leaves.items():
+        if path not in left_leaves and path not in new_renamed:
+            entries.append({"status": "added", "path": path, "value": value, "type": value_type(value), "isEmpty": value == ""})
+
+    entries.sort(key=lambda entry: entry["path"])
+    return entries
+
+
+class CompareCache:
+    """
+    Resultados de comparação guardados em SQLite (output/.compare.db), um por par de hashes
+    dos documentos. As diferenças ficam numeradas por categoria, então qualquer página é
+    lida direto pela chave primária, inclusive por outros workers da API.
+    """
+
+    def __init__(self, path: Path = COMPARE_CACHE_PATH, max_results: int = COMPARE_CACHE_MAX):
+        self.path = Path(path)
+        self.max_results = max_results
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    result_id INTEGER PRIMARY KEY,
+                    compare_id TEXT NOT NULL UNIQUE,
+                    summary TEXT NOT NULL,
+                    used_at REAL NOT NULL
+                )
+            """)
+            # seq: posição na listagem completa (ordenada por caminho); rank: posição na categoria
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS diffs (
+                    result_id INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (result_id, status, rank)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS diffs_seq ON diffs (result_id, seq)")
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def _lookup(self, compare_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+
+        rows = self._query("SELECT result_id, summary FROM results WHERE compare_id = ?", (compare_id,))
+        if not rows:
+            return None
+        with self._lock:
+            self._connection().execute("UPDATE results SET used_at = ? WHERE result_id = ?", (time.time(), rows[0][0]))
+        return rows[0][0], json.loads(rows[0][1])
+
+    def get(self, compare_id: str) -> Optional[Dict[str, Any]]:
+
+        found = self._lookup(compare_id)
+        return found[1] if found else None
+
+    def compare(
+        self,
+        left_raw: bytes,
+        right_raw: bytes,
+        left_name: Optional[str] = None,
+        right_name: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+
+        left_hash = document_hash(left_raw)
+        right_hash = document_hash(right_raw)
+        compare_id = build_compare_id(left_hash, right_hash)
+
+        cached = self.get(compare_id)
+        if cached:
+            return cached, True
+
+        with self._build_lock:
+            # Outra requisição pode ter calculado o mesmo par enquanto esta esperava
+            cached = self.get(compare_id)
+            if cached:
+                return cached, True
+
+            left = json.loads(left_raw)
+            right = json.loads(right_raw)
+            entries = diff_documents(left, right)
+
+            counts = {status: 0 for status in DIFF_STATUSES}
+            rows = []
+            for seq, entry in enumerate(entries):
+                status = entry.pop("status")
+                rows.append((status, counts[status], seq, _encode_entry(entry)))
+                counts[status] += 1
+            summary = {
+                "compare_id": compare_id,
+                "left": {"name": left_name, "hash": left_hash},
+                "right": {"name": right_name, "hash": right_hash},
+                "summary": {**counts, "total": len(entries)},
+            }
+            self._store(compare_id, summary, rows)
+        return summary, False
+
+    def _store(self, compare_id: str, summary: Dict[str, Any], rows: List[Tuple[str, int, int, str]]) -> None:
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result_id = conn.execute(
+                    "INSERT INTO results (compare_id, summary, used_at) VALUES (?, ?, ?)",
+                    (compare_id, json.dumps(summary, ensure_ascii=False), time.time()),
+                ).lastrowid
+                for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                    conn.executemany(
+                        "INSERT INTO diffs (result_id, status, rank, seq, data) VALUES (?, ?, ?, ?, ?)",
+                        ((result_id, *row) for row in rows[start:start + INSERT_CHUNK_SIZE]),
+                    )
+                stale = [
+                    row[0] for row in conn.execute(
+                        "SELECT result_id FROM results ORDER BY used_at DESC LIMIT -1 OFFSET ?",
+                        (self.max_results,),
+                    ).fetchall()
+                ]
+                for stale_id in stale:
+                    conn.execute("DELETE FROM diffs WHERE result_id = ?", (stale_id,))
+                    conn.execute("DELETE FROM results WHERE result_id = ?", (stale_id,))
+                conn.execute("COMMIT")
+            except sqlite3.IntegrityError:
+                # Outro processo da API gravou o mesmo par primeiro
+                conn.execute("ROLLBACK")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def page(
+        self,
+        compare_id: str,
+        status: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 200,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+
+        found = self._lookup(compare_id)
+        if not found:
+            raise KeyError(compare_id)
+        result_id, summary = found
+
+        start = (page - 1) * page_size
+        if status:
+            total = summary["summary"][status]
+            rows = self._query(
+                "SELECT status, data FROM diffs WHERE result_id = ? AND status = ? AND rank >= ? AND rank < ? ORDER BY rank",
+                (result_id, status, start, start + page_size),
+            )
+        else:
+            total = summary["summary"]["total"]
+            rows = self._query(
+                "SELECT status, data FROM diffs WHERE result_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (result_id, start, start + page_size),
+            )
+        return [{"status": row[0], **json.loads(row[1])} for row in rows], total
+
+    def report(self, compare_id: str) -> Dict[str, Any]:
+
+        found = self._lookup(compare_id)
+        if not found:
+            raise KeyError(compare_id)
+        result_id, summary = found
+
+        differences: Dict[str, List[Dict[str, Any]]] = {status: [] for status in DIFF_STATUSES}
+        for status, data in self._query(
+            "SELECT status, data FROM diffs WHERE result_id = ? ORDER BY status, rank", (result_id,),
+        ):
+            entry = json.loads(data)
+            if status == "keyChanged":
+                # No relatório a chave nova aparece como newPath, ao lado de oldPath
+                entry = {"oldPath": entry.pop("oldPath"), "newPath": entry.pop("path"), **entry}
+            differences[status].append(entry)
+        return {
+            "metadata": {
+                "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "file1": summary["left"]["name"],
+                "file2": summary["right"]["name"],
+                "totalEntries": summary["summary"]["total"],
+            },
+            "summary": {status: summary["summary"][status] for status in DIFF_STATUSES},
+            "differences": differences,
+        }
@@ -0,0 +1,308 @@
+import asyncio
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets (segundos) para latência de chamadas e batches, e para jobs inteiros
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+JOB_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+
+def _escape(value: str) -> str:
+
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Metric(ABC):
+    """Série de valores por combinação de labels; a combinação vazia é a métrica sem labels."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _label_text(self, labels: Tuple[str, ...], extra: str = "") -> str:
+
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+    # Os workers do pool mandam delta() e o processo da API aplica com merge()
+    @abstractmethod
+    def delta(self) -> Dict[Tuple[str, ...], Any]:
+        ...
+
+    @abstractmethod
+    def merge(self, changes: Dict[Tuple[str, ...], Any]) -> None:
+        ...
+
+
+class Counter(Metric):
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._sent: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_text(labels)} {_format_value(value)}" for labels, value in items]
+
+    def delta(self) -> Dict[Tuple[str, ...], float]:
+
+        with self._lock:
+            changes = {
+                labels: value - self._sent.get(labels, 0.0)
+                for labels, value in self._values.items()
+                if value != self._sent.get(labels, 0.0)
+            }
+            self._sent.update({labels: self._values[labels] for labels in changes})
+        return changes
+
+    def merge(self, changes: Dict[Tuple[str, ...], float]) -> None:
+
+        with self._lock:
+            for labels, amount in changes.items():
+                self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(Counter):
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        # Valor lido na hora da coleta (ex.: profundidade da fila do dispatcher)
+        self.callback = callback
+
+    def dec(self, amount: float = 1.0, *labels: str) -> None:
+
+        self.inc(-amount, *labels)
+
+    def set(self, value: float, *labels: str) -> None:
+
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self) -> List[str]:
+
+        if self.callback is not None:
+            self.set(self.callback())
+        return super()._samples()
+
+
+class Histogram(Metric):
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Por série: contagem por bucket (não cumulativa, o último é +Inf), soma
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+        self._sent: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def _samples(self) -> List[str]:
+
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = []
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{self._label_text(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._label_text(labels)} {cumulative}")
+        return lines
+
+    def delta(self) -> Dict[Tuple[str, ...], List[Any]]:
+
+        changes = {}
+        with self._lock:
+            for labels, (counts, total) in self._series.items():
+                sent_counts, sent_total = self._sent.get(labels, ([0] * len(counts), 0.0))
+                if counts == sent_counts:
+                    continue
+                changes[labels] = [[c - s for c, s in zip(counts, sent_counts)], total - sent_total]
+                self._sent[labels] = (list(counts), total)
+        return changes
+
+    def merge(self, changes: Dict[Tuple[str, ...], List[Any]]) -> None:
+
+        with self._lock:
+            for labels, (counts, total) in changes.items():
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+                series[0] = [a + b for a, b in zip(series[0], counts)]
+                series[1] += total
+
+
+class Registry:
+    """
+    Métricas do processo, no formato texto do Prometheus. Os workers do pool mandam só
+    o que mudou desde o último envio (delta) e o processo da API soma nas suas séries.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def delta(self) -> Dict[str, Dict[Tuple[str, ...], Any]]:
+
+        changes = {}
+        for name, metric in self._metrics.items():
+            if isinstance(metric, Gauge) and metric.callback is not None:
+                continue
+            metric_changes = metric.delta()
+            if metric_changes:
+                changes[name] = metric_changes
+        return changes
+
+    def merge(self, changes: Optional[Dict[str, Dict[Tuple[str, ...], Any]]]) -> None:
+
+        for name, metric_changes in (changes or {}).items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(metric_changes)
+
+
+REGISTRY = Registry()
+
+BATCH_SECONDS = REGISTRY.register(Histogram(
+    "translator_batch_duration_seconds", "Duração de cada batch de tradução.", ("backend", "model"),
+))
+API_CALL_SECONDS = REGISTRY.register(Histogram(
+    "translator_api_call_duration_seconds", "Duração de cada chamada à API da OpenAI.", ("model",),
+))
+API_CALLS = REGISTRY.register(Counter(
+    "translator_api_calls_total", "Chamadas à API da OpenAI por resultado.", ("model", "result"),
+))
+TOKENS = REGISTRY.register(Counter(
+    "translator_tokens_total", "Tokens cobrados pela API, por direção (input/output).", ("model", "direction"),
+))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "translator_cache_lookups_total", "Consultas ao cache de traduções (hit/miss).", ("backend", "result"),
+))
+RETRIES = REGISTRY.register(Counter(
+    "translator_retries_total",
+    "Retraduções e reparos por motivo (missing_key, placeholder_loss, concatenation, parse_failure).",
+    ("reason",),
+))
+API_IN_FLIGHT = REGISTRY.register(Gauge(
+    "translator_api_requests_in_flight", "Chamadas à API da OpenAI em andamento.",
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "translator_http_requests_in_flight", "Requisições HTTP sendo atendidas pela API.",
+))
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "translator_job_queue_depth", "Jobs enviados ao pool de workers que ainda não terminaram.",
+))
+LOOP_LAG = REGISTRY.register(Histogram(
+    "translator_event_loop_lag_seconds", "Atraso do event loop da API em acordar um timer.",
+    buckets=LOOP_LAG_BUCKETS,
+))
+JOB_SECONDS = REGISTRY.register(Histogram(
+    "translator_job_duration_seconds", "Duração dos jobs de tradução por status final.", ("backend", "status"),
+    buckets=JOB_BUCKETS,
+))
+
+
+class InFlightMiddleware:
+    """Middleware ASGI que mantém o gauge de requisições HTTP em andamento (inclui streams)."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+
+    # Um timer que acorda atrasado mede quanto o loop ficou ocupado com outra coisa
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        LOOP_LAG.observe(max(0.0, loop.time() - started - interval))
@@ -0,0 +1,193 @@
+import gzip
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class CompressedPayload:
+    """
+    Corpo JSON serializado uma única vez e guardado comprimido (gzip).
+    Variantes em outras codificações (brotli) são geradas sob demanda e memorizadas.
+    """
+
+    def __init__(self, body: bytes, etag: Optional[str] = None):
+        self.size = len(body)
+        self.etag = etag or f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self._variants: Dict[str, bytes] = {
+            "gzip": gzip.compress(body, compresslevel=GZIP_LEVEL),
+        }
+
+    @classmethod
+    def from_compressed(cls, gzip_body: bytes, etag: str, size: int) -> "CompressedPayload":
+
+        payload = cls.__new__(cls)
+        payload.size = size
+        payload.etag = etag
+        payload._variants = {"gzip": gzip_body}
+        return payload
+
+    @property
+    def compressed_size(self) -> int:
+        return len(self._variants["gzip"])
+
+    def body(self) -> bytes:
+        return gzip.decompress(self._variants["gzip"])
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding == "identity":
+            return self.body()
+        if encoding not in self._variants:
+            if encoding == "br" and brotli is not None:
+                self._variants["br"] = brotli.compress(self.body(), quality=BROTLI_QUALITY)
+            else:
+                raise ValueError(f"Codificação não suportada: {encoding}")
+        return self._variants[encoding]
+
+    def spill(self, path: Path) -> "SpilledPayload":
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(self._variants["gzip"])
+        os.replace(tmp_path, path)
+        return SpilledPayload(path, self.etag, self.size)
+
+
+class SpilledPayload:
+    """Payload comprimido que foi despejado em disco; lido em streaming sob demanda."""
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, path: Path, etag: str, size: int):
+        self.path = Path(path)
+        self.etag = etag
+        self.size = size
+
+    @property
+    def compressed_size(self) -> int:
+        # Não ocupa memória
+        return 0
+
+    def body(self) -> bytes:
+        with gzip.open(self.path, 'rb') as f:
+            return f.read()
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding == "gzip":
+            return self.path.read_bytes()
+        if encoding == "identity":
+            return self.body()
+        if encoding == "br" and brotli is not None:
+            return brotli.compress(self.body(), quality=BROTLI_QUALITY)
+        raise ValueError(f"Codificação não suportada: {encoding}")
+
+    def iter_encoded(self, encoding: str) -> Iterator[bytes]:
+
+        if encoding not in ("gzip", "identity"):
+            yield self.encoded(encoding)
+            return
+
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == "identity" else None
+        with open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor:
+            yield decompressor.flush()
+
+    def remove(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def iter_compressed(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+
+    # Comprime em streaming, sem montar o corpo inteiro em memória
+    if encoding == "identity":
+        yield from chunks
+        return
+    if encoding == "gzip":
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        compress, finish = compressor.compress, compressor.flush
+    elif encoding == "br" and brotli is not None:
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        raise ValueError(f"Codificação não suportada: {encoding}")
+
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def iter_file_chunks(path: Path, chunk_size: int = SpilledPayload.CHUNK_SIZE) -> Iterator[bytes]:
+
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def encode_json_payload(data: Any, etag: Optional[str] = None) -> CompressedPayload:
+
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return CompressedPayload(body, etag)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+
+    if not accept_encoding:
+        return "identity"
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0)) > 0:
+        return "gzip"
+    return "identity"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any((c[2:] if c.startswith("W/") else c) == bare for c in candidates)
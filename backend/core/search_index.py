@@ -0,0 +1,237 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.file_index import OUTPUT_DIR, INDEX_DIR_NAME
+from core.translation_cache import load_language_caches
+from scripts.script_openai import flatten_object
+
+
+SEARCH_DB = "search.db"
+SEARCH_FIELDS = ("key", "value", "source")
+SNIPPET_TOKENS = 12
+INSERT_CHUNK_SIZE = 5000
+
+
+def build_match_query(text: str, field: Optional[str] = None) -> str:
+
+    # Cada termo vira uma frase entre aspas (sem operadores do FTS5); o último casa por prefixo
+    terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+    if not terms:
+        return ""
+    terms[-1] += "*"
+    query = " ".join(terms)
+    return f"{field} : ({query})" if field else query
+
+
+class SearchIndex:
+    """
+    Índice invertido (SQLite FTS5) das chaves, traduções e textos de origem dos arquivos
+    de output/, em output/.index/search.db. É atualizado arquivo a arquivo ao salvar ou
+    excluir; mudanças feitas por fora são sincronizadas a partir do FileIndex.
+    """
+
+    def __init__(self, directory: Path = OUTPUT_DIR):
+        self.directory = Path(directory)
+        self.path = self.directory / INDEX_DIR_NAME / SEARCH_DB
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    file_id INTEGER PRIMARY KEY,
+                    filename TEXT NOT NULL UNIQUE,
+                    language_code TEXT,
+                    mtime_ns INTEGER,
+                    size INTEGER,
+                    entries INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    doc_id INTEGER PRIMARY KEY,
+                    file_id INTEGER NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    source TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS docs_file ON docs (file_id)")
+            # Tabela FTS5 de conteúdo externo: o texto fica só em docs e o índice é mantido em
+            # lote por arquivo (bem mais rápido que um trigger por linha)
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+                    key, value, source,
+                    content='docs', content_rowid='doc_id',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='2 3'
+                )
+            """)
+            self._conn = conn
+        return self._conn
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def _delete_rows(self, conn: sqlite3.Connection, filename: str) -> None:
+
+        for (file_id,) in conn.execute("SELECT file_id FROM files WHERE filename = ?", (filename,)).fetchall():
+            conn.execute("""
+                INSERT INTO docs_fts (docs_fts, rowid, key, value, source)
+                SELECT 'delete', doc_id, key, value, source FROM docs WHERE file_id = ?
+            """, (file_id,))
+            conn.execute("DELETE FROM docs WHERE file_id = ?", (file_id,))
+        conn.execute("DELETE FROM files WHERE filename = ?", (filename,))
+
+    def index_file(self, filename: str, data: Any, language_code: Optional[str] = None) -> int:
+
+        path = self.directory / filename
+        stat = path.stat() if path.exists() else None
+        # O arquivo salvo só tem as traduções; o texto de origem vem do cache do idioma
+        sources: Dict[str, str] = {}
+        if language_code:
+            sources = {translated: original for original, translated in load_language_caches(language_code).items()}
+
+        rows = []
+        for entry in flatten_object(data):
+            value = entry["value"]
+            if isinstance(value, str):
+                text = value
+            elif value is None or isinstance(value, bool):
+                continue
+            else:
+                text = json.dumps(value, ensure_ascii=False)
+            rows.append((entry["key"], text, sources.get(text) if isinstance(value, str) else None))
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete_rows(conn, filename)
+                file_id = conn.execute(
+                    "INSERT INTO files (filename, language_code, mtime_ns, size, entries) VALUES (?, ?, ?, ?, ?)",
+                    (filename, language_code, stat.st_mtime_ns if stat else None, stat.st_size if stat else None, len(rows)),
+                ).lastrowid
+                for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                    conn.executemany(
+                        "INSERT INTO docs (file_id, key, value, source) VALUES (?, ?, ?, ?)",
+                        ((file_id, *row) for row in rows[start:start + INSERT_CHUNK_SIZE]),
+                    )
+                conn.execute("""
+                    INSERT INTO docs_fts (rowid, key, value, source)
+                    SELECT doc_id, key, value, source FROM docs WHERE file_id = ?
+                """, (file_id,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def remove(self, filename: str) -> None:
+
+        if not self.path.exists():
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._delete_rows(conn, filename)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def sync(self, files: Dict[str, Dict[str, Any]]) -> int:
+
+        # files: entradas do FileIndex (filename -> metadados); só arquivos novos ou alterados são relidos
+        indexed = {
+            filename: (mtime_ns, size)
+            for filename, mtime_ns, size in self._query("SELECT filename, mtime_ns, size FROM files")
+        }
+        for filename in set(indexed) - set(files):
+            self.remove(filename)
+
+        updated = 0
+        for filename, entry in files.items():
+            if indexed.get(filename) == (entry.get("mtime_ns"), entry.get("size")):
+                continue
+            try:
+                with open(self.directory / filename, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            self.index_file(filename, data, entry.get("language_code"))
+            updated += 1
+        return updated
+
+    def search(
+        self,
+        text: str,
+        field: Optional[str] = None,
+        language: Optional[str] = None,
+        filename: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+
+        match = build_match_query(text, field)
+        if not match:
+            return [], 0
+
+        where = ["docs_fts MATCH ?"]
+        params: List[Any] = [match]
+        if language:
+            where.append("files.language_code = ?")
+            params.append(language)
+        if filename:
+            where.append("files.filename = ?")
+            params.append(filename)
+        joins = """
+            FROM docs_fts
+            JOIN docs ON docs.doc_id = docs_fts.rowid
+            JOIN files ON files.file_id = docs.file_id
+        """
+        clause = " AND ".join(where)
+
+        total = self._query(f"SELECT COUNT(*) {joins} WHERE {clause}", tuple(params))[0][0]
+        rows = self._query(
+            f"""
+            SELECT files.filename, files.language_code, docs.key, docs.value, docs.source,
+                   snippet(docs_fts, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS})
+            {joins}
+            WHERE {clause}
+            ORDER BY bm25(docs_fts)
+            LIMIT ? OFFSET ?
+            """,
+            tuple(params) + (page_size, (page - 1) * page_size),
+        )
+        results = [
+            {
+                "filename": row[0],
+                "language_code": row[1],
+                "key": row[2],
+                "value": row[3],
+                "source": row[4],
+                "snippet": row[5],
+            }
+            for row in rows
+        ]
+        return results, total
+
+    def stats(self) -> Dict[str, int]:
+
+        if not self.path.exists():
+            return {"files": 0, "entries": 0}
+        files, entries = self._query("SELECT COUNT(*), COALESCE(SUM(entries), 0) FROM files")[0]
+        return {"files": files, "entries": entries}
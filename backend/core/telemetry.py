@@ -0,0 +1,205 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+TELEMETRY_DB_PATH = Path(os.getenv("TELEMETRY_DB_PATH", "output/.telemetry.db"))
+# Quantos batches recentes de cada modelo entram no ajuste e no erro reportado
+FIT_WINDOW = int(os.getenv("TELEMETRY_FIT_WINDOW", "300"))
+# Linhas mantidas no total; as mais antigas saem primeiro
+TELEMETRY_MAX_ROWS = int(os.getenv("TELEMETRY_MAX_ROWS", "20000"))
+# Abaixo disso o modelo padrão continua valendo (e o ajuste por concorrência usa todos os batches)
+MIN_FIT_SAMPLES = 5
+# Peso do modelo padrão no ajuste, em "batches": com poucas medições ele segura os coeficientes
+PRIOR_WEIGHT = 10.0
+
+LATENCY_TERMS = ("intercept", "per_input_token", "per_output_token")
+
+
+def predict_batch_seconds(latency: Dict[str, float], calls: float, input_tokens: float, output_tokens: float) -> float:
+
+    return (
+        latency["intercept"] * calls
+        + latency["per_input_token"] * input_tokens
+        + latency["per_output_token"] * output_tokens
+    )
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> Optional[List[float]]:
+
+    # Eliminação de Gauss com pivô parcial (sistemas de no máximo 3x3)
+    size = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(size)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(col + 1, size):
+            factor = rows[r][col] / rows[col][col]
+            for c in range(col, size + 1):
+                rows[r][c] -= factor * rows[col][c]
+    solution = [0.0] * size
+    for r in reversed(range(size)):
+        solution[r] = (rows[r][size] - sum(rows[r][c] * solution[c] for c in range(r + 1, size))) / rows[r][r]
+    return solution
+
+
+def fit_latency(samples: Sequence[Tuple[float, float, float, float]], prior: Dict[str, float]) -> Dict[str, float]:
+
+    # seconds ~ intercept * chamadas + per_input_token * entrada + per_output_token * saída,
+    # em mínimos quadrados puxados para o modelo padrão (ridge centrado no prior)
+    fitted = dict(prior)
+    if not samples:
+        return fitted
+    active = [i for i in range(3) if any(sample[i] for sample in samples)]
+    if not active:
+        return fitted
+    n = len(samples)
+    while active:
+        matrix = [[sum(s[i] * s[j] for s in samples) for j in active] for i in active]
+        vector = [sum(s[i] * s[3] for s in samples) for i in active]
+        for k, i in enumerate(active):
+            # O prior vale PRIOR_WEIGHT batches típicos em cada termo
+            weight = PRIOR_WEIGHT * matrix[k][k] / n
+            matrix[k][k] += weight
+            vector[k] += weight * prior[LATENCY_TERMS[i]]
+        solution = _solve(matrix, vector)
+        if solution is None:
+            return dict(prior)
+        if min(solution) >= 0:
+            for k, i in enumerate(active):
+                fitted[LATENCY_TERMS[i]] = solution[k]
+            return fitted
+        # Coeficiente negativo não tem sentido físico: o termo sai (fica em zero) e o resto é reajustado
+        dropped = active[solution.index(min(solution))]
+        fitted[LATENCY_TERMS[dropped]] = 0.0
+        active.remove(dropped)
+    return fitted
+
+
+def holdout_error(samples: Sequence[Tuple[float, float, float, float]], prior: Dict[str, float]) -> Optional[float]:
+
+    # Erro fora da amostra: o ajuste com os batches mais antigos prevê os mais recentes
+    # (samples vem do mais novo para o mais antigo)
+    if not samples:
+        return None
+    held = max(1, len(samples) // 5)
+    recent, older = samples[:held], samples[held:]
+    latency = fit_latency(older, prior) if len(older) >= MIN_FIT_SAMPLES else prior
+    errors = [abs(predict_batch_seconds(latency, *sample[:3]) - sample[3]) / sample[3] for sample in recent if sample[3] > 0]
+    return round(sum(errors) / len(errors), 4) if errors else None
+
+
+class LatencyTelemetry:
+    """
+    Latência medida de cada batch concluído (chamadas, tokens, modelo, backend e
+    concorrência) em SQLite (output/.telemetry.db), compartilhada entre os workers.
+    """
+
+    def __init__(self, path: Path = TELEMETRY_DB_PATH):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._inserts = 0
+
+    def _connection(self) -> sqlite3.Connection:
+
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS batches (
+                    id INTEGER PRIMARY KEY,
+                    backend TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    concurrency INTEGER NOT NULL,
+                    calls INTEGER NOT NULL,
+                    input_tokens INTEGER NOT NULL,
+                    output_tokens INTEGER NOT NULL,
+                    seconds REAL NOT NULL,
+                    job_id TEXT,
+                    recorded_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS batches_model ON batches (backend, model, id)")
+            self._conn = conn
+        return self._conn
+
+    def _samples(self, backend: str, model: str, concurrency: Optional[int] = None) -> List[Tuple]:
+
+        sql = (
+            "SELECT calls, input_tokens, output_tokens, seconds FROM batches "
+            "WHERE backend = ? AND model = ?"
+        )
+        params: Tuple = (backend, model)
+        if concurrency is not None:
+            sql += " AND concurrency = ?"
+            params += (concurrency,)
+        sql += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            return self._connection().execute(sql, params + (FIT_WINDOW,)).fetchall()
+
+    def fit(self, backend: str, model: str, concurrency: Optional[int], prior: Dict[str, float]) -> Dict[str, Any]:
+
+        rows = self._samples(backend, model, concurrency) if concurrency is not None else []
+        if len(rows) < MIN_FIT_SAMPLES:
+            # Pouca medição nessa concorrência: usa todas as do modelo
+            rows = self._samples(backend, model)
+        fitted = len(rows) >= MIN_FIT_SAMPLES
+        latency = fit_latency(rows, prior) if fitted else dict(prior)
+        return {
+            "latency": {term: latency[term] for term in LATENCY_TERMS},
+            "source": "fitted" if fitted else "default",
+            "samples": len(rows),
+            # Erro relativo médio por batch, medido fora da amostra
+            "error": holdout_error(rows, prior),
+        }
+
+    def record(
+        self,
+        backend: str,
+        model: str,
+        concurrency: int,
+        calls: int,
+        input_tokens: int,
+        output_tokens: int,
+        seconds: float,
+        job_id: Optional[str] = None,
+    ) -> None:
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT INTO batches (backend, model, concurrency, calls, input_tokens, output_tokens, seconds, "
+                "job_id, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (backend, model, concurrency, calls, input_tokens, output_tokens, seconds, job_id, time.time()),
+            )
+            self._inserts += 1
+            if self._inserts % 500 == 0:
+                conn.execute(
+                    "DELETE FROM batches WHERE id <= (SELECT MAX(id) FROM batches) - ?", (TELEMETRY_MAX_ROWS,)
+                )
+
+    def models(self) -> List[Tuple[str, str, int]]:
+
+        with self._lock:
+            return self._connection().execute(
+                "SELECT backend, model, COUNT(*) FROM batches GROUP BY backend, model ORDER BY backend, model"
+            ).fetchall()
+
+
+_telemetry: Optional[LatencyTelemetry] = None
+
+
+def get_telemetry() -> LatencyTelemetry:
+
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = LatencyTelemetry()
+    return _telemetry
@@ -0,0 +1,166 @@
+import contextlib
+import contextvars
+import heapq
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+JOB_TRACE_DIR = Path(os.getenv("JOB_TRACE_DIR", "output/.traces"))
+# Quantos arquivos de trace ficam em disco; os mais antigos saem primeiro
+JOB_TRACE_MAX = int(os.getenv("JOB_TRACE_MAX", "50"))
+# Perfis de CPU/alocação dos jobs iniciados com "profile": true
+JOB_PROFILE_DIR = Path(os.getenv("JOB_PROFILE_DIR", "output/.profiles"))
+JOB_PROFILE_MAX = int(os.getenv("JOB_PROFILE_MAX", "20"))
+# Acima disso só os totais por fase continuam sendo somados
+TRACE_MAX_EVENTS = 200_000
+
+# Faixa (tid) em que os spans da tarefa atual são desenhados: 0 é o job, 1..N os slots de batch
+_lane: contextvars.ContextVar = contextvars.ContextVar("trace_lane", default=0)
+
+
+class JobTrace:
+    """
+    Spans aninhados de um job (fases e batches), no formato de eventos do Chrome
+    (chrome://tracing, Perfetto). Batches paralelos ocupam faixas próprias, então os
+    spans de cada faixa se aninham pelo tempo.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.origin = time.perf_counter()
+        self.started_at = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self.totals: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._free_lanes: List[int] = []
+        self._lanes = 0
+
+    def add(self, name: str, start: float, end: Optional[float] = None, **args: Any) -> None:
+
+        end = time.perf_counter() if end is None else end
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": 1,
+            "tid": _lane.get(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if len(self.events) < TRACE_MAX_EVENTS:
+                self.events.append(event)
+            else:
+                self.dropped += 1
+            self._count(name, end - start)
+
+    def count(self, name: str, seconds: float) -> None:
+
+        # Só entra nos totais (ex.: espera no semáforo, que se sobrepõe entre batches)
+        with self._lock:
+            self._count(name, seconds)
+
+    def _count(self, name: str, seconds: float) -> None:
+
+        total = self.totals.setdefault(name, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, **args)
+
+    @contextlib.contextmanager
+    def lane(self) -> Iterator[int]:
+
+        with self._lock:
+            if self._free_lanes:
+                lane = heapq.heappop(self._free_lanes)
+            else:
+                self._lanes += 1
+                lane = self._lanes
+        token = _lane.set(lane)
+        try:
+            yield lane
+        finally:
+            _lane.reset(token)
+            with self._lock:
+                heapq.heappush(self._free_lanes, lane)
+
+    def summary(self) -> Dict[str, Any]:
+
+        # Fases de batch somam o tempo de todos os batches (paralelos inclusive)
+        with self._lock:
+            phases = {
+                name: {"seconds": round(seconds, 3), "count": count}
+                for name, (seconds, count) in self.totals.items()
+            }
+        return {"wall_seconds": round(time.perf_counter() - self.origin, 3), "phases": phases}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+
+        metadata = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"job {self.job_id}"}}]
+        metadata.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": "job"}})
+        for lane in range(1, self._lanes + 1):
+            metadata.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lane, "args": {"name": f"slot {lane}"}})
+        with self._lock:
+            events = list(self.events)
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "job_id": self.job_id,
+                "started_at": self.started_at,
+                "dropped_events": self.dropped,
+            },
+        }
+
+
+def get_trace_path(job_id: str) -> Path:
+
+    return JOB_TRACE_DIR / f"{job_id}.json"
+
+
+def save_trace(trace: JobTrace) -> Path:
+
+    JOB_TRACE_DIR.mkdir(parents=True, exist_ok=True)
+    path = get_trace_path(trace.job_id)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(trace.chrome_trace(), f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    traces = sorted(JOB_TRACE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in traces[JOB_TRACE_MAX:]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+def get_profile_files(job_id: str) -> Dict[str, Path]:
+
+    # Mesmos nomes que RunProfiler.save gera a partir de <dir>/<job_id>
+    return {
+        "pstats": JOB_PROFILE_DIR / f"{job_id}.prof",
+        "text": JOB_PROFILE_DIR / f"{job_id}.prof.txt",
+        "alloc": JOB_PROFILE_DIR / f"{job_id}.alloc.txt",
+    }
+
+
+def save_profile(job_id: str, profiler: Any) -> Dict[str, str]:
+
+    files = profiler.save(JOB_PROFILE_DIR / job_id)
+    profiles = sorted(JOB_PROFILE_DIR.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in profiles[JOB_PROFILE_MAX:]:
+        for path in get_profile_files(old.stem).values():
+            path.unlink(missing_ok=True)
+    return files
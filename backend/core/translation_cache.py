@@ -0,0 +1,78 @@
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.file_lock import exclusive_file_lock
+from scripts.script_openai import write_json_atomic, DEFAULT_MODEL, DEFAULT_ON_FAILURE
+
+
+# Cache de traduções da API por idioma, método e modelo, compartilhado entre jobs (mesmo formato do cache da CLI)
+API_CACHE_DIR = Path(os.getenv("API_CACHE_DIR", "output/.cache"))
+
+
+def get_cache_scope(method: str = "openai", model: Optional[str] = None) -> str:
+
+    # Traduções de um backend (ou modelo) não contam como cache de outro
+    if method == "google":
+        return "google"
+    return "openai_" + re.sub(r"[^A-Za-z0-9._-]", "_", model or DEFAULT_MODEL)
+
+
+def get_translation_cache_path(target_language: str, method: str = "openai", model: Optional[str] = None) -> Path:
+
+    return API_CACHE_DIR / f".translate_cache_{target_language}.{get_cache_scope(method, model)}.json"
+
+
+def read_cache_file(path: Path) -> Dict[str, str]:
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def load_translation_cache(target_language: str, method: str = "openai", model: Optional[str] = None) -> Dict[str, str]:
+
+    return read_cache_file(get_translation_cache_path(target_language, method, model))
+
+
+def load_language_caches(target_language: str) -> Dict[str, str]:
+
+    # Todos os métodos e modelos do idioma (ex.: para achar o texto de origem de uma tradução)
+    merged: Dict[str, str] = {}
+    for path in sorted(API_CACHE_DIR.glob(f".translate_cache_{target_language}.*.json")):
+        merged.update(read_cache_file(path))
+    return merged
+
+
+def is_cacheable(original: str, translated: Optional[str]) -> bool:
+
+    # Falhas, placeholders perdidos e o próprio original (erro devolvido como "tradução") não entram
+    return bool(translated) and translated != DEFAULT_ON_FAILURE and "__PH_" not in translated and translated != original
+
+
+def merge_translation_cache(
+    target_language: str,
+    entries: Dict[str, str],
+    method: str = "openai",
+    model: Optional[str] = None,
+) -> int:
+
+    entries = {original: translated for original, translated in entries.items() if is_cacheable(original, translated)}
+    if not entries:
+        return 0
+
+    path = get_translation_cache_path(target_language, method, model)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Vários processos worker podem terminar jobs do mesmo idioma ao mesmo tempo
+    with exclusive_file_lock(path.with_suffix(".lock")):
+        cache = read_cache_file(path)
+        added = {k: v for k, v in entries.items() if cache.get(k) != v}
+        if added:
+            cache.update(added)
+            write_json_atomic(path, cache, indent=None)
+    return len(added)
@@ -1,22 +1,23 @@
 import json
 import os
 import asyncio
+import hashlib
+import sqlite3
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
-from openai import OpenAI
-from deep_translator import GoogleTranslator
-
 
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from scripts.profiling import RunProfiler
 from scripts.script_openai import (
     flatten_object,
+    write_json_atomic,
     reconstruct_json_preserving_order,
     mask_placeholders,
     restore_placeholders,
@@ -28,20 +29,71 @@ from scripts.script_openai import (
     DEFAULT_MODEL,
     DEFAULT_PARALLEL,
     DEFAULT_ON_FAILURE,
+    select_entries_to_translate,
+    active_client,
+    create_openai_client,
+    has_openai_key,
+    record_batch_usage,
+    track_batch_usage,
+    active_trace,
+    count_retry,
+    set_metric_hooks,
+    plan_bundle_batches,
+    run_planned_batches_async,
+    build_bundle_outputs,
+    load_json_bundle_zip,
 )
+from core.payload_cache import encode_json_payload
+from core.job_store import JobStore, create_job_store, FINISHED_STATUSES, load_payload_result_data
+from core import job_events
+from core import metrics
+from core.translation_cache import load_translation_cache, merge_translation_cache
+from core.estimator import estimate_translation_plan, resolve_latency, predict_batch_durations, JobEta
+from core.telemetry import get_telemetry
+from core.tracing import JobTrace, save_trace, save_profile
+from core.job_checkpoint import JobCheckpoint, CheckpointedCache, claim_interrupted_checkpoints
 
 load_dotenv()
 
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY não encontrada no arquivo .env")
+def _observe_api_call(model: str, seconds: float, result: str) -> None:
+    
+    metrics.API_IN_FLIGHT.dec()
+    metrics.API_CALL_SECONDS.observe(seconds, model)
+    metrics.API_CALLS.inc(1, model, result)
+
+
+def _observe_tokens(model: str, input_tokens: int, output_tokens: int) -> None:
+    
+    metrics.TOKENS.inc(input_tokens, model, "input")
+    metrics.TOKENS.inc(output_tokens, model, "output")
+
+
+def _observe_cache_lookups(backend: str, hits: int, misses: int) -> None:
+    
+    metrics.CACHE_LOOKUPS.inc(hits, backend, "hit")
+    metrics.CACHE_LOOKUPS.inc(misses, backend, "miss")
+
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# O script não conhece core.metrics: a API registra aqui os callbacks (também nos workers, que importam este módulo)
+set_metric_hooks(
+    retry=lambda reason: metrics.RETRIES.inc(1, reason),
+    api_call_started=lambda model: metrics.API_IN_FLIGHT.inc(),
+    api_call_finished=_observe_api_call,
+    tokens=_observe_tokens,
+    cache_lookups=_observe_cache_lookups,
+)
 
 
 class TranslationJob:
     
+    # Campos de progresso copiados entre processos (worker -> API)
+    SNAPSHOT_FIELDS = (
+        "status", "progress", "total_strings", "translated_strings", "cached_strings",
+        "current_batch", "total_batches", "stats", "start_time", "end_time",
+        "error_message", "estimated_cost", "actual_cost", "eta_seconds",
+        "estimated_total_seconds", "target_language", "model", "files", "timings",
+    )
     
     def __init__(self, job_id: str):
         self.job_id = job_id
@@ -65,6 +117,8 @@ class TranslationJob:
         self.end_time = None
         self.error_message = None
         self.result_data = None
+        self.result_payload = None
+        self.source_manifest = None
         self.estimated_cost = 0.0
         self.actual_cost = 0.0
         self.eta_seconds = None
@@ -72,9 +126,91 @@ class TranslationJob:
         self.config = None
         self.target_language = None
         self.model = None
+        self.cancel_request = None
+        # Jobs em lote: progresso por arquivo
+        self.files = None
+        # Tempo por fase do job (spans do trace), atualizado a cada batch
+        self.timings = None
+    
+    def snapshot(self) -> Dict[str, Any]:
+        
+        return {name: getattr(self, name) for name in self.SNAPSHOT_FIELDS}
+    
+    def apply_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        
+        for name in self.SNAPSHOT_FIELDS:
+            if name in snapshot:
+                setattr(self, name, snapshot[name])
+
+
+_job_store = create_job_store(TranslationJob)
 
 
-_active_jobs: Dict[str, TranslationJob] = {}
+def _persist_job_event(job_id: str, event: Dict[str, Any]) -> None:
+    
+    job = _job_store.get(job_id)
+    if job is not None:
+        _job_store.save(job)
+
+
+job_events.add_listener(_persist_job_event)
+
+
+class JobCancelled(Exception):
+    """Cancelamento pedido para o job; ele termina com status "cancelled"."""
+
+
+# Intervalo de verificação do pedido de cancelamento enquanto os batches rodam
+CANCEL_POLL_SECONDS = 0.25
+
+
+async def run_until_cancelled(
+    work: Any,
+    cancel_request: Callable[[], Optional[Dict[str, Any]]],
+    on_cancel: Optional[Callable[[], None]] = None,
+) -> Any:
+    
+    if cancel_request() is not None:
+        work.close()
+        raise JobCancelled()
+    
+    task = asyncio.ensure_future(work)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=CANCEL_POLL_SECONDS)
+        if done:
+            return task.result()
+        if cancel_request() is not None:
+            # Fecha o cliente primeiro: requisições em andamento falham na hora em vez de terminar
+            if on_cancel is not None:
+                on_cancel()
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+            raise JobCancelled()
+
+
+def cancel_request_reader(
+    job: "TranslationJob", checkpoint: Optional[JobCheckpoint]
+) -> Callable[[], Optional[Dict[str, Any]]]:
+    
+    def cancel_request() -> Optional[Dict[str, Any]]:
+        if job.cancel_request is not None:
+            return job.cancel_request
+        return checkpoint.cancel_request() if checkpoint is not None else None
+    
+    return cancel_request
+
+
+def calculate_job_cost(method: str, model: str, stats: Dict[str, Any]) -> float:
+    
+    if method != "openai" or model not in MODEL_PRICING:
+        return 0.0
+    pricing = MODEL_PRICING[model]
+    input_cost = (stats.get("total_prompt_tokens", 0) / 1_000_000) * pricing["input"]
+    output_cost = (stats.get("total_completion_tokens", 0) / 1_000_000) * pricing["output"]
+    return input_cost + output_cost
 
 
 def validate_json(data: Any) -> Tuple[bool, Optional[str]]:
@@ -89,79 +225,140 @@ def validate_json(data: Any) -> Tuple[bool, Optional[str]]:
         return False, str(e)
 
 
-def estimate_translation(
-    json_data: Dict[str, Any],
-    target_language: str,
-    method: str = "openai",
-    model: str = DEFAULT_MODEL,
-    batch_size: int = DEFAULT_BATCH_SIZE,
-    parallel: int = DEFAULT_PARALLEL,
-) -> Dict[str, Any]:
+def summarize_result_failures(result_data: Any) -> Dict[str, List[str]]:
     
+    needs_review_keys = []
+    empty_keys = []
+    
+    for entry in flatten_object(result_data):
+        value = entry["value"]
+        if isinstance(value, str):
+            if value == DEFAULT_ON_FAILURE:
+                needs_review_keys.append(entry["key"])
+            elif value.strip() == "":
+                empty_keys.append(entry["key"])
+    
+    return {
+        "needs_review_keys": needs_review_keys,
+        "empty_keys": empty_keys,
+    }
 
-    flat_data = flatten_object(json_data)
+
+def build_result_payload(job: TranslationJob) -> Dict[str, Any]:
+    
+    summary = summarize_result_failures(job.result_data)
+    failed_keys = summary["needs_review_keys"] + summary["empty_keys"]
     
+    return {
+        "success": True,
+        "job_id": job.job_id,
+        "data": job.result_data,
+        "stats": {
+            "total_strings": job.total_strings,
+            "translated": job.translated_strings,
+            "cached": job.cached_strings,
+            "cost_usd": job.actual_cost,
+            "tokens": job.stats["total_tokens"],
+            "errors": job.stats.get("errors", 0),
+            "failed_keys": failed_keys[:50],
+            "failed_count": len(failed_keys),
+            "needs_review_count": len(summary["needs_review_keys"]),
+            "empty_count": len(summary["empty_keys"]),
+        },
+        "timings": job.timings,
+        "error_message": job.error_message,
+    }
+
+
+def record_batch_latency(
+    method: str,
+    model: str,
+    parallel: int,
+    usage: Dict[str, int],
+    seconds: float,
+    job_id: Optional[str] = None,
+) -> None:
+
+    # Batch resolvido todo pelo cache não diz nada sobre a latência da API
+    if not usage["calls"]:
+        return
+    backend, name = job_backend(method), ("Google Translate" if method == "google" else model)
+    try:
+        get_telemetry().record(
+            backend, name, parallel, usage["calls"], usage["input_tokens"], usage["output_tokens"], seconds, job_id,
+        )
+    except sqlite3.Error as e:
+        print(f"⚠️  Telemetria de latência não gravada: {e}")
+
 
-    all_strings = [
-        e for e in flat_data
-        if isinstance(e["value"], str) and e["value"].strip()
-    ]
+def finish_job_trace(job: TranslationJob, trace: JobTrace) -> None:
     
-    total_strings = len(all_strings)
+    job.timings = trace.summary()
+    try:
+        save_trace(trace)
+    except OSError as e:
+        print(f"⚠️  Não foi possível salvar o trace do job {job.job_id}: {e}")
+
+
+def start_job_profile(job: TranslationJob, memory: bool) -> Optional[RunProfiler]:
     
+    profiler = RunProfiler(memory)
+    if profiler.start():
+        return profiler
+    # cProfile/tracemalloc são do processo: com outro job perfilado aqui, este segue sem perfil
+    job.stats["profile"] = {"error": "Outro job já está sendo perfilado neste processo"}
+    return None
+
 
-    num_batches = (total_strings + batch_size - 1) // batch_size if total_strings > 0 else 0
+def finish_job_profile(job: TranslationJob, profiler: Optional[RunProfiler]) -> None:
     
-    if method == "google":
-        estimated_time_per_string = 0.8
-        estimated_time_seconds = int(total_strings * estimated_time_per_string)
-        
-        return {
-            "total_strings": total_strings,
-            "total_entries": len(flat_data),
-            "estimated_batches": num_batches,
-            "estimated_tokens_input": 0,
-            "estimated_tokens_output": 0,
-            "estimated_cost_usd": 0.0,
-            "estimated_time_seconds": estimated_time_seconds,
-            "method": method,
-            "model": "Google Translate",
-            "batch_size": batch_size,
-            "parallel": 1,  # Google Translate não suporta paralelismo real
-        }
-    else:
-        # OpenAI: cálculo com tokens e custo
-        estimated_chars = sum(len(str(e["value"])) for e in all_strings)
-        estimated_tokens_input = estimated_chars // 4
-        estimated_tokens_output = int(estimated_tokens_input * 1.2)
-        
+    if profiler is None:
+        return
+    profiler.stop()
+    try:
+        job.stats["profile"] = {"seconds": round(profiler.seconds, 3), "files": sorted(save_profile(job.job_id, profiler))}
+    except OSError as e:
+        job.stats["profile"] = {"error": str(e)}
+        print(f"⚠️  Não foi possível salvar o perfil do job {job.job_id}: {e}")
+
+
+def job_backend(method: str) -> str:
+
+    return "google" if method == "google" else "openai"
+
+
+def observe_job_duration(job: TranslationJob, method: str) -> None:
+
+    if job.start_time and job.end_time:
+        metrics.JOB_SECONDS.observe(job.end_time - job.start_time, job_backend(method), job.status)
 
-        estimated_cost = 0.0
-        if model in MODEL_PRICING:
-            pricing = MODEL_PRICING[model]
-            input_cost = (estimated_tokens_input / 1_000_000) * pricing["input"]
-            output_cost = (estimated_tokens_output / 1_000_000) * pricing["output"]
-            estimated_cost = input_cost + output_cost
-        
-
-        # Tempo estimado: cada batch leva tempo, dividido pelo paralelismo
-        # Tempo por batch varia, mas estimamos ~5-10 segundos por batch dependendo do tamanho
-        estimated_time_per_batch = max(5.0, batch_size * 0.05)  # Mínimo 5s, ou 0.05s por string
-        estimated_time_seconds = int((num_batches * estimated_time_per_batch) / parallel)
-        
-        return {
-            "total_strings": total_strings,
-            "total_entries": len(flat_data),
-            "estimated_batches": num_batches,
-            "estimated_tokens_input": estimated_tokens_input,
-            "estimated_tokens_output": estimated_tokens_output,
-            "estimated_cost_usd": round(estimated_cost, 6),
-            "estimated_time_seconds": estimated_time_seconds,
-            "method": method,
-            "model": model,
-            "batch_size": batch_size,
-            "parallel": parallel,
-        }
+
+def raise_if_all_batches_failed(job: TranslationJob, batches: List[Any]) -> None:
+
+    # Sem nenhuma tradução nova (chave inválida, backend fora do ar) o job falhou: não "conclui" devolvendo a origem
+    if batches and job.stats.get("translated", 0) == 0 and job.stats.get("errors", 0) > 0:
+        raise RuntimeError(f"Todas as chamadas de tradução falharam ({job.stats['errors']} erros)")
+
+
+def estimate_translation(
+    json_data: Dict[str, Any],
+    target_language: str,
+    method: str = "openai",
+    model: str = DEFAULT_MODEL,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    parallel: int = DEFAULT_PARALLEL,
+) -> Dict[str, Any]:
+    
+    # Simula o plano do job com o cache atual do idioma (o mesmo que o job vai usar)
+    return estimate_translation_plan(
+        json_data,
+        target_language,
+        method=method,
+        model=model,
+        batch_size=batch_size,
+        parallel=parallel,
+        cache=load_translation_cache(target_language, method, model),
+    )
 
 
 async def translate_batch_google_async(
@@ -178,6 +375,8 @@ async def translate_batch_google_async(
     Google Translate traduz uma string por vez, então fazemos isso em loop.
     """
     results = []
+    # Import tardio: quem só usa a OpenAI não paga a importação do deep_translator
+    from deep_translator import GoogleTranslator
     translator = GoogleTranslator(source='en', target=target_language)
     
     for item in items:
@@ -186,6 +385,7 @@ async def translate_batch_google_async(
         
         # Verificar cache
         if original in cache:
+            metrics.CACHE_LOOKUPS.inc(1, "google", "hit")
             results.append({
                 "key": key,
                 "translated": cache[original]
@@ -201,6 +401,8 @@ async def translate_batch_google_async(
         try:
             # Executar em thread pool para não bloquear o event loop
             loop = asyncio.get_event_loop()
+            metrics.CACHE_LOOKUPS.inc(1, "google", "miss")
+            record_batch_usage(1)
             translated = await loop.run_in_executor(
                 None, 
                 translator.translate, 
@@ -223,11 +425,10 @@ async def translate_batch_google_async(
             await asyncio.sleep(0.1)
             
         except Exception as e:
-            # Em caso de erro, manter o original
-            cache[original] = original
+            # Falha fica marcada para revisão e fora do cache: o original não é uma tradução
             results.append({
                 "key": key,
-                "translated": original
+                "translated": DEFAULT_ON_FAILURE
             })
             
             if lock:
@@ -249,23 +450,59 @@ async def translate_json_async(
     parallel: int = DEFAULT_PARALLEL,
     existing_data: Optional[Dict[str, Any]] = None,
     cache: Optional[Dict[str, str]] = None,
+    existing_manifest: Optional[Dict[str, str]] = None,
+    checkpoint: Optional[JobCheckpoint] = None,
+    profile: bool = False,
+    profile_memory: bool = False,
+    job_config: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     
-    job = _active_jobs.get(job_id)
+    job = _job_store.get(job_id)
     if not job:
         raise ValueError(f"Job {job_id} não encontrado")
     
     job.status = "processing"
     job.start_time = time.time()
+    profiler = start_job_profile(job, profile_memory) if profile else None
+    
+    cancel_request = cancel_request_reader(job, checkpoint)
+    
+    # Cliente próprio do job: fechá-lo aborta as requisições em andamento no cancelamento.
+    # Criado já dentro do try: sem chave ou sem o pacote openai, o job termina como "failed"
+    job_client = None
+    client_token = active_client.set(None)
+    # Spans por fase e por batch; vão para job.timings e para o trace do job
+    trace = JobTrace(job_id)
+    trace_token = active_trace.set(trace)
+    
+    # Sem cache explícito, usa o cache persistente do idioma e grava nele as novas traduções
+    shared_cache = cache is None
+    known_cache = {}
     
     try:
-
-        if cache is None:
-            cache = {}
+        if method == "openai":
+            # Fora do event loop: o primeiro job do processo ainda importa o pacote openai
+            job_client = await asyncio.to_thread(create_openai_client)
+            active_client.set(job_client)
+
+        with trace.span("load_cache"):
+            if cache is None:
+                cache = load_translation_cache(target_language, method, model)
+                known_cache = dict(cache)
+            
+            # Retomada: traduções já pagas voltam para o cache e batches concluídos são pulados
+            completed_batches = {}
+            if checkpoint is not None:
+                journal = checkpoint.load_journal()
+                cache = CheckpointedCache(checkpoint, {**cache, **journal["cache"]})
+                completed_batches = journal["batches"]
+                if journal["stats"]:
+                    job.stats.update(journal["stats"])
         
 
-        flat_base = flatten_object(json_data)
-        flat_existing = {e["key"]: e["value"] for e in flatten_object(existing_data or {})}
+        with trace.span("flatten"):
+            flat_base = flatten_object(json_data)
+            flat_existing = {e["key"]: e["value"] for e in flatten_object(existing_data or {})}
         
 
         all_strings = [
@@ -274,10 +511,13 @@ async def translate_json_async(
         ]
         
 
-        to_translate = [
-            e for e in all_strings
-            if (e["key"] not in flat_existing or flat_existing[e["key"]] == e["value"])
-        ]
+        with trace.span("select"):
+            to_translate, source_manifest, source_diff = select_entries_to_translate(
+                flat_base, flat_existing, existing_manifest if flat_existing else None
+            )
+        job.source_manifest = source_manifest
+        if source_diff is not None:
+            job.stats["source_diff"] = {name: len(keys) for name, keys in source_diff.items()}
         
 
         cached_count = sum(1 for e in to_translate if e["value"] in cache)
@@ -296,7 +536,37 @@ async def translate_json_async(
             batch_num = i // batch_size + 1
             all_batches.append((batch, batch_num))
         
+        if checkpoint is not None:
+            plan = checkpoint.load_plan()
+            if plan is None:
+                checkpoint.save_plan({
+                    "job_id": job_id,
+                    "status": "processing",
+                    "owner_pid": os.getpid(),
+                    "created_at": time.time(),
+                    "params": {
+                        "target_language": target_language,
+                        "method": method,
+                        "model": model,
+                        "batch_size": batch_size,
+                        "parallel": parallel,
+                    },
+                    "json_data": json_data,
+                    "batches": [[e["key"] for e in batch] for batch, _ in all_batches],
+                    # request_key (dedup) e source_filename (índice de arquivos) voltam na retomada
+                    "config": job_config,
+                })
+            else:
+                # O plano gravado manda: os mesmos batches, com a mesma numeração
+                entries_by_key = {e["key"]: e for e in to_translate}
+                all_batches = [
+                    ([entries_by_key[key] for key in keys if key in entries_by_key], i + 1)
+                    for i, keys in enumerate(plan.get("batches", []))
+                ]
+                checkpoint.update_plan(status="processing", owner_pid=os.getpid())
+        
         job.total_batches = len(all_batches)
+        job_events.publish(job.job_id, "started", {"total_batches": job.total_batches})
         
         # Para Google Translate, limitar paralelismo devido a rate limits
         effective_parallel = parallel if method == "openai" else min(parallel, 2)
@@ -304,6 +574,32 @@ async def translate_json_async(
         translated_entries = []
         lock = asyncio.Lock()
         
+        for batch_num, results in completed_batches.items():
+            for r in results:
+                translated_entries.append({
+                    "key": r["key"],
+                    "value": r["translated"]
+                })
+        if completed_batches:
+            all_batches = [(batch, batch_num) for batch, batch_num in all_batches if batch_num not in completed_batches]
+            job.translated_strings = job.stats.get("translated", 0)
+            job.cached_strings = job.stats.get("cached", 0)
+            job.current_batch = max(completed_batches)
+        
+        # ETA pela duração prevista de cada batch (modelo de latência calibrado pela telemetria)
+        with trace.span("predict"):
+            latency_info = await asyncio.to_thread(resolve_latency, method, model, effective_parallel)
+            latency = latency_info["latency"]
+            predicted = await asyncio.to_thread(
+                predict_batch_durations, [batch for batch, _ in all_batches], dict(cache),
+                target_language, method, model, effective_parallel, latency,
+            )
+        eta = JobEta({batch_num: seconds for (_, batch_num), seconds in zip(all_batches, predicted)}, effective_parallel)
+        job.eta_seconds = int(eta.remaining())
+        job.estimated_total_seconds = int(time.time() - job.start_time + job.eta_seconds)
+        job.stats["latency_model"] = {name: latency_info[name] for name in ("source", "samples", "error")}
+        job.stats["predicted_seconds"] = job.estimated_total_seconds
+        
 
         async def process_batches_parallel():
             nonlocal translated_entries
@@ -311,73 +607,63 @@ async def translate_json_async(
             
             async def process_single_batch(batch_data):
                 batch, batch_num = batch_data
+                queued = time.perf_counter()
                 async with semaphore:
-                    if method == "google":
-                        results = await translate_batch_google_async(
-                            batch, cache, target_language,
-                            job.stats, batch_num, job.total_batches, lock
-                        )
-                    else:
-                        results = await translate_batch_async(
-                            batch, cache, target_language, model,
-                            job.stats, batch_num, job.total_batches, False, lock
-                        )
-                    
-
-                    async with lock:
-                        job.translated_strings = job.stats.get("translated", 0)
-                        job.cached_strings = job.stats.get("cached", 0)
-                        job.current_batch = batch_num
-                        
-                        processed = job.translated_strings + job.cached_strings
-                        job.progress = processed / job.total_strings if job.total_strings > 0 else 0.0
-                        
-
-                        # Calcular custo apenas para OpenAI
-                        if method == "openai" and model in MODEL_PRICING and job.stats.get("api_calls", 0) > 0:
-                            pricing = MODEL_PRICING[model]
-                            input_cost = (job.stats.get("total_prompt_tokens", 0) / 1_000_000) * pricing["input"]
-                            output_cost = (job.stats.get("total_completion_tokens", 0) / 1_000_000) * pricing["output"]
-                            job.actual_cost = input_cost + output_cost
-                        elif method == "google":
-                            job.actual_cost = 0.0  # Google Translate é gratuito
+                    wait_seconds = time.perf_counter() - queued
+                    trace.count("semaphore_wait", wait_seconds)
+                    with trace.lane(), trace.span("batch", batch=batch_num, size=len(batch), wait_seconds=round(wait_seconds, 3)):
+                        eta.start(batch_num)
+                        batch_start = time.time()
+                        with track_batch_usage() as usage:
+                            if method == "google":
+                                results = await translate_batch_google_async(
+                                    batch, cache, target_language,
+                                    job.stats, batch_num, job.total_batches, lock
+                                )
+                            else:
+                                results = await translate_batch_async(
+                                    batch, cache, target_language, model,
+                                    job.stats, batch_num, job.total_batches, False, lock
+                                )
                         
 
-                        elapsed = time.time() - job.start_time
-                        if processed > 0 and job.total_strings > 0:
-
-                            progress_ratio = processed / job.total_strings
+                        batch_seconds = round(time.time() - batch_start, 3)
+                        metrics.BATCH_SECONDS.observe(batch_seconds, job_backend(method), job.model)
+                        async with lock:
+                            if checkpoint is not None:
+                                checkpoint.record_batch(batch_num, results, job.stats)
+                            job.translated_strings = job.stats.get("translated", 0)
+                            job.cached_strings = job.stats.get("cached", 0)
+                            job.current_batch = batch_num
+                            
+                            processed = job.translated_strings + job.cached_strings
+                            job.progress = processed / job.total_strings if job.total_strings > 0 else 0.0
                             
-                            if progress_ratio > 0:
-
-                                avg_time_per_string = elapsed / processed
-                                remaining_strings = job.total_strings - processed
-                                
-
-                                # Para Google Translate, usar paralelismo limitado
-                                eta_parallel = effective_parallel if method == "openai" else min(effective_parallel, 2)
-                                if eta_parallel > 0:
-
-                                    job.eta_seconds = int((remaining_strings * avg_time_per_string) / eta_parallel)
-                                else:
-                                    job.eta_seconds = int(remaining_strings * avg_time_per_string)
-                                
 
-                                if progress_ratio > 0.01:
-                                    job.estimated_total_seconds = int(elapsed / progress_ratio)
-                                else:
+                            # Calcular custo apenas para OpenAI
+                            if method == "openai" and model in MODEL_PRICING and job.stats.get("api_calls", 0) > 0:
+                                pricing = MODEL_PRICING[model]
+                                input_cost = (job.stats.get("total_prompt_tokens", 0) / 1_000_000) * pricing["input"]
+                                output_cost = (job.stats.get("total_completion_tokens", 0) / 1_000_000) * pricing["output"]
+                                job.actual_cost = input_cost + output_cost
+                            elif method == "google":
+                                job.actual_cost = 0.0  # Google Translate é gratuito
+                            
 
-                                    num_batches = job.total_batches
-                                    estimated_time_per_batch = 3.0
-                                    job.estimated_total_seconds = int((num_batches / parallel) * estimated_time_per_batch)
-                            else:
-                                job.eta_seconds = None
-                                job.estimated_total_seconds = None
-                        else:
-                            job.eta_seconds = None
-                            job.estimated_total_seconds = None
-                    
-                    return results
+                            eta.finish(batch_num, batch_seconds)
+                            job.eta_seconds = int(eta.remaining())
+                            job.estimated_total_seconds = int(time.time() - job.start_time + job.eta_seconds)
+                            job.timings = trace.summary()
+                        
+                        await asyncio.to_thread(
+                            record_batch_latency, method, model, effective_parallel, usage, batch_seconds, job.job_id
+                        )
+                        job_events.publish(job.job_id, "batch", {
+                            "batch": batch_num,
+                            "size": len(batch),
+                            "seconds": batch_seconds,
+                        })
+                        return results
             
 
             tasks = [process_single_batch(batch_data) for batch_data in all_batches]
@@ -394,67 +680,69 @@ async def translate_json_async(
                     })
         
 
-        if effective_parallel > 1:
-            await process_batches_parallel()
-        else:
-
+        async def process_batches_serial():
             for batch, batch_num in all_batches:
-                if method == "google":
-                    results = await translate_batch_google_async(
-                        batch, cache, target_language,
-                        job.stats, batch_num, job.total_batches, None
-                    )
-                else:
-                    results = await translate_batch_async(
-                        batch, cache, target_language, model,
-                        job.stats, batch_num, job.total_batches, False, None
-                    )
-                for r in results:
-                    translated_entries.append({
-                        "key": r["key"],
-                        "value": r["translated"]
-                    })
-                
+                with trace.lane(), trace.span("batch", batch=batch_num, size=len(batch)):
+                    eta.start(batch_num)
+                    batch_start = time.time()
+                    with track_batch_usage() as usage:
+                        if method == "google":
+                            results = await translate_batch_google_async(
+                                batch, cache, target_language,
+                                job.stats, batch_num, job.total_batches, None
+                            )
+                        else:
+                            results = await translate_batch_async(
+                                batch, cache, target_language, model,
+                                job.stats, batch_num, job.total_batches, False, None
+                            )
+                    for r in results:
+                        translated_entries.append({
+                            "key": r["key"],
+                            "value": r["translated"]
+                        })
+                    if checkpoint is not None:
+                        checkpoint.record_batch(batch_num, results, job.stats)
+                    batch_seconds = round(time.time() - batch_start, 3)
+                    metrics.BATCH_SECONDS.observe(batch_seconds, job_backend(method), job.model)
+                    
 
-                job.translated_strings = job.stats.get("translated", 0)
-                job.cached_strings = job.stats.get("cached", 0)
-                job.current_batch = batch_num
-                processed = job.translated_strings + job.cached_strings
-                job.progress = processed / job.total_strings if job.total_strings > 0 else 0.0
-                
+                    job.translated_strings = job.stats.get("translated", 0)
+                    job.cached_strings = job.stats.get("cached", 0)
+                    job.current_batch = batch_num
+                    processed = job.translated_strings + job.cached_strings
+                    job.progress = processed / job.total_strings if job.total_strings > 0 else 0.0
+                    
 
-                elapsed = time.time() - job.start_time
-                if processed > 0 and job.total_strings > 0:
-                    progress_ratio = processed / job.total_strings
+                    eta.finish(batch_num, batch_seconds)
+                    job.eta_seconds = int(eta.remaining())
+                    job.estimated_total_seconds = int(time.time() - job.start_time + job.eta_seconds)
+                    job.timings = trace.summary()
                     
-                    if progress_ratio > 0:
-                        avg_time_per_string = elapsed / processed
-                        remaining_strings = job.total_strings - processed
-                        
-                        effective_parallel = min(parallel, job.total_batches - job.current_batch)
-                        if effective_parallel > 0:
-                            job.eta_seconds = int((remaining_strings * avg_time_per_string) / effective_parallel)
-                        else:
-                            job.eta_seconds = int(remaining_strings * avg_time_per_string)
-                        
-                        if progress_ratio > 0.01:
-                            job.estimated_total_seconds = int(elapsed / progress_ratio)
-                        else:
-                            num_batches = job.total_batches
-                            estimated_time_per_batch = 3.0
-                            job.estimated_total_seconds = int((num_batches / parallel) * estimated_time_per_batch)
-                    else:
-                        job.eta_seconds = None
-                        job.estimated_total_seconds = None
-                else:
-                    job.eta_seconds = None
-                    job.estimated_total_seconds = None
+                    await asyncio.to_thread(
+                        record_batch_latency, method, model, effective_parallel, usage, batch_seconds, job.job_id
+                    )
+                    job_events.publish(job.job_id, "batch", {
+                        "batch": batch_num,
+                        "size": len(batch),
+                        "seconds": batch_seconds,
+                    })
         
 
-        translated_dict = {e["key"]: e["value"] for e in translated_entries}
+        batches_work = process_batches_parallel() if effective_parallel > 1 else process_batches_serial()
+        with trace.span("batches", count=len(all_batches), parallel=effective_parallel):
+            await run_until_cancelled(batches_work, cancel_request, job_client.close if job_client else None)
+        raise_if_all_batches_failed(job, all_batches)
         
 
-        flat_base = flatten_object(json_data)
+        translated_dict = {e["key"]: e["value"] for e in translated_entries}
+        
+        # Chaves não retraduzidas mantêm a tradução existente
+        for entry in all_strings:
+            key = entry["key"]
+            if key not in translated_dict and key in flat_existing and flat_existing[key] != DEFAULT_ON_FAILURE:
+                translated_dict[key] = flat_existing[key]
+        
         missing_keys = []
         for entry in flat_base:
             if isinstance(entry["value"], str) and len(entry["value"]) > 0:
@@ -463,16 +751,24 @@ async def translate_json_async(
                 elif not translated_dict[entry["key"]] or len(translated_dict[entry["key"]]) == 0:
                     missing_keys.append(entry["key"])
         
+        repair_started = time.perf_counter()
         if missing_keys:
 
+            missing_key_set = set(missing_keys)
             retry_items = []
             for entry in flat_base:
-                if entry["key"] in missing_keys and isinstance(entry["value"], str) and len(entry["value"]) > 0:
+                if entry["key"] in missing_key_set and isinstance(entry["value"], str) and len(entry["value"]) > 0:
                     retry_items.append(entry)
             
             if retry_items:
 
                 for entry in retry_items:
+                    if cancel_request() is not None:
+                        raise JobCancelled()
+                    if entry["value"] in cache and "__PH_" not in cache[entry["value"]]:
+                        translated_dict[entry["key"]] = cache[entry["value"]]
+                        continue
+                    count_retry("missing_key")
                     try:
                         masked, placeholder_map = mask_placeholders(entry["value"])
                         local_stats = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
@@ -500,6 +796,7 @@ async def translate_json_async(
                                     continue
                             
                             translated_dict[entry["key"]] = translated
+                            cache[entry["value"]] = translated
                             
 
                             job.stats["total_prompt_tokens"] = job.stats.get("total_prompt_tokens", 0) + retry_tokens["prompt_tokens"]
@@ -515,9 +812,14 @@ async def translate_json_async(
                         translated_dict[entry["key"]] = DEFAULT_ON_FAILURE
                         job.stats["errors"] = job.stats.get("errors", 0) + 1
         
-        output_data = reconstruct_json_preserving_order(json_data, translated_dict)
+        if missing_keys:
+            trace.add("repair", repair_started, keys=len(missing_keys))
+        
+        with trace.span("reconstruct"):
+            output_data = reconstruct_json_preserving_order(json_data, translated_dict)
         
 
+        validate_started = time.perf_counter()
         final_missing = []
         placeholder_errors = []
         
@@ -562,6 +864,7 @@ async def translate_json_async(
                 job.error_message += f" | {len(placeholder_errors)} chaves com placeholders corrigidos"
             else:
                 job.error_message = f"{len(placeholder_errors)} chaves com placeholders corrigidos"
+        trace.add("validate", validate_started)
         
 
         if model in MODEL_PRICING:
@@ -571,17 +874,341 @@ async def translate_json_async(
             job.actual_cost = input_cost + output_cost
         
         job.result_data = output_data
-        job.status = "completed"
         job.progress = 1.0
+        job.eta_seconds = 0
         job.end_time = time.time()
+        # Erro da previsão feita no início do job, para acompanhar a calibração
+        actual_seconds = job.end_time - job.start_time
+        if actual_seconds > 0:
+            job.stats["eta_error"] = round(abs(job.stats["predicted_seconds"] - actual_seconds) / actual_seconds, 4)
+        
+        if shared_cache:
+            with trace.span("save_cache"):
+                merge_translation_cache(target_language, {k: v for k, v in cache.items() if known_cache.get(k) != v}, method, model)
+        
+        # Corpo do /result serializado e comprimido uma única vez
+        job.timings = trace.summary()
+        with trace.span("encode_result"):
+            job.result_payload = encode_json_payload(build_result_payload(job))
+        # O payload comprimido passa a ser a única cópia (get_result_data decodifica sob demanda)
+        job.result_data = None
+        job.status = "completed"
+        observe_job_duration(job, method)
+        if checkpoint is not None:
+            checkpoint.remove()
+        finish_job_trace(job, trace)
+        finish_job_profile(job, profiler)
+        _job_store.evict()
+        job_events.publish(job.job_id, "completed")
         
         return output_data
+    
+    except JobCancelled:
+        job.status = "cancelled"
+        job.end_time = time.time()
+        observe_job_duration(job, method)
+        job.eta_seconds = None
+        job.actual_cost = calculate_job_cost(method, model, job.stats)
+        # Traduções já pagas ficam no cache do idioma, salvo pedido contrário
+        if shared_cache and (cancel_request() or {}).get("keep_partial", True):
+            job.stats["kept_in_cache"] = merge_translation_cache(
+                target_language, {k: v for k, v in cache.items() if known_cache.get(k) != v}, method, model
+            )
+        if checkpoint is not None:
+            checkpoint.remove()
+        finish_job_trace(job, trace)
+        finish_job_profile(job, profiler)
+        _job_store.evict()
+        job_events.publish(job.job_id, "cancelled", {"actual_cost": job.actual_cost})
+        raise
+        
+    except Exception as e:
+        job.status = "failed"
+        job.error_message = str(e)
+        job.end_time = time.time()
+        observe_job_duration(job, method)
+        if checkpoint is not None:
+            checkpoint.remove()
+        finish_job_trace(job, trace)
+        finish_job_profile(job, profiler)
+        job_events.publish(job.job_id, "failed", {"error": str(e)})
+        raise
+    
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        active_trace.reset(trace_token)
+        active_client.reset(client_token)
+        if job_client is not None:
+            job_client.close()
+
+
+async def translate_bundle_async(
+    files: Dict[str, Any],
+    target_language: str,
+    job_id: str,
+    method: str = "openai",
+    model: str = DEFAULT_MODEL,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    parallel: int = DEFAULT_PARALLEL,
+    checkpoint: Optional[JobCheckpoint] = None,
+    profile: bool = False,
+    profile_memory: bool = False,
+    job_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Traduz vários arquivos JSON num único job: textos repetidos entre arquivos são
+    traduzidos uma vez, e todos os batches passam pelo mesmo pool, maiores primeiro.
+    """
+    
+    job = _job_store.get(job_id)
+    if not job:
+        raise ValueError(f"Job {job_id} não encontrado")
+    
+    job.status = "processing"
+    job.start_time = time.time()
+    profiler = start_job_profile(job, profile_memory) if profile else None
+    cancel_request = cancel_request_reader(job, checkpoint)
+    
+    job_client = None
+    client_token = active_client.set(None)
+    trace = JobTrace(job_id)
+    trace_token = active_trace.set(trace)
+    
+    try:
+        if method == "openai":
+            job_client = await asyncio.to_thread(create_openai_client)
+            active_client.set(job_client)
+        with trace.span("load_cache"):
+            cache = load_translation_cache(target_language, method, model)
+            known_cache = dict(cache)
+            # Retomada: as traduções do journal entram no cache e o plano refeito já as pula
+            if checkpoint is not None:
+                journal = checkpoint.load_journal()
+                cache = CheckpointedCache(checkpoint, {**cache, **journal["cache"]})
+                if journal["stats"]:
+                    job.stats.update(journal["stats"])
+        
+        with trace.span("plan"):
+            plan = plan_bundle_batches(files, cache, batch_size)
+        batches = plan["batches"]
+        
+        if checkpoint is not None:
+            if checkpoint.load_plan() is None:
+                checkpoint.save_plan({
+                    "job_id": job_id,
+                    "status": "processing",
+                    "owner_pid": os.getpid(),
+                    "created_at": time.time(),
+                    "params": {
+                        "target_language": target_language,
+                        "method": method,
+                        "model": model,
+                        "batch_size": batch_size,
+                        "parallel": parallel,
+                    },
+                    "files": files,
+                    "config": job_config,
+                })
+            else:
+                checkpoint.update_plan(status="processing", owner_pid=os.getpid())
+        
+        job.target_language = target_language
+        job.model = model if method == "openai" else "Google Translate"
+        job.total_strings = plan["total_strings"]
+        job.total_batches = len(batches)
+        job.stats["files"] = len(files)
+        job.stats["unique_strings"] = plan["unique_strings"]
+        job.stats["duplicate_strings"] = plan["total_strings"] - plan["unique_strings"]
+        
+        remaining = {name: len(entries) for name, entries in plan["string_entries"].items()}
+        for value, counts in plan["value_files"].items():
+            if value in cache and "__PH_" not in cache[value]:
+                for name, count in counts.items():
+                    remaining[name] -= count
+        job.files = {
+            name: {"total": len(entries), "done": len(entries) - remaining[name]}
+            for name, entries in plan["string_entries"].items()
+        }
+        job.cached_strings = sum(info["done"] for info in job.files.values())
+        job.progress = job.cached_strings / job.total_strings if job.total_strings > 0 else 0.0
+        job_events.publish(job.job_id, "started", {"total_batches": job.total_batches, "files": len(files)})
+        
+        done_batches = 0
+        
+        def on_batch(batch_num, batch, results, seconds):
+            nonlocal done_batches
+            done_batches += 1
+            metrics.BATCH_SECONDS.observe(seconds, job_backend(method), job.model)
+            if checkpoint is not None:
+                checkpoint.record_batch(batch_num, results, job.stats)
+            for entry in batch:
+                for name, count in plan["value_files"][entry["value"]].items():
+                    job.files[name]["done"] += count
+                    job.translated_strings += count
+                    if job.files[name]["done"] == job.files[name]["total"]:
+                        job_events.publish(job.job_id, "file", {"file": name})
+            
+            job.current_batch = done_batches
+            processed = job.translated_strings + job.cached_strings
+            job.progress = processed / job.total_strings if job.total_strings > 0 else 0.0
+            job.actual_cost = calculate_job_cost(method, model, job.stats)
+            # O tempo decorrido já reflete o paralelismo do pool
+            elapsed = time.time() - job.start_time
+            job.eta_seconds = int(elapsed / done_batches * (job.total_batches - done_batches))
+            job.estimated_total_seconds = int(elapsed + job.eta_seconds)
+            job.timings = trace.summary()
+            
+            job_events.publish(job.job_id, "batch", {
+                "batch": batch_num,
+                "size": len(batch),
+                "seconds": round(seconds, 3),
+            })
+        
+        async def translate_batch(batch, batch_num, total, lock):
+            with trace.lane(), trace.span("batch", batch=batch_num, size=len(batch)):
+                if method == "google":
+                    return await translate_batch_google_async(
+                        batch, cache, target_language, job.stats, batch_num, total, lock
+                    )
+                return await translate_batch_async(
+                    batch, cache, target_language, model, job.stats, batch_num, total, False, lock
+                )
         
+        effective_parallel = parallel if method == "openai" else min(parallel, 2)
+        with trace.span("batches", count=len(batches), parallel=effective_parallel):
+            await run_until_cancelled(
+                run_planned_batches_async(
+                    batches, cache, target_language, model, job.stats,
+                    effective_parallel, False, on_batch, translate_batch
+                ),
+                cancel_request,
+                job_client.close if job_client else None,
+            )
+        raise_if_all_batches_failed(job, batches)
+        
+        with trace.span("reconstruct"):
+            outputs = build_bundle_outputs(files, plan, cache)
+        failures = 0
+        for name, data in outputs.items():
+            job.files[name]["failed"] = len(summarize_result_failures(data)["needs_review_keys"])
+            failures += job.files[name]["failed"]
+        if failures:
+            job.stats["validation_errors"] = failures
+            job.error_message = f"{failures} chaves não foram traduzidas e foram marcadas como '{DEFAULT_ON_FAILURE}'"
+        
+        job.actual_cost = calculate_job_cost(method, model, job.stats)
+        job.result_data = outputs
+        job.progress = 1.0
+        job.eta_seconds = 0
+        job.end_time = time.time()
+        
+        with trace.span("save_cache"):
+            merge_translation_cache(target_language, {k: v for k, v in cache.items() if known_cache.get(k) != v}, method, model)
+        job.timings = trace.summary()
+        with trace.span("encode_result"):
+            job.result_payload = encode_json_payload(build_result_payload(job))
+        # O payload comprimido passa a ser a única cópia (get_result_data decodifica sob demanda)
+        job.result_data = None
+        job.status = "completed"
+        observe_job_duration(job, method)
+        if checkpoint is not None:
+            checkpoint.remove()
+        finish_job_trace(job, trace)
+        finish_job_profile(job, profiler)
+        _job_store.evict()
+        job_events.publish(job.job_id, "completed")
+        
+        return outputs
+    
+    except JobCancelled:
+        job.status = "cancelled"
+        job.end_time = time.time()
+        observe_job_duration(job, method)
+        job.eta_seconds = None
+        job.actual_cost = calculate_job_cost(method, model, job.stats)
+        if (cancel_request() or {}).get("keep_partial", True):
+            job.stats["kept_in_cache"] = merge_translation_cache(
+                target_language, {k: v for k, v in cache.items() if known_cache.get(k) != v}, method, model
+            )
+        if checkpoint is not None:
+            checkpoint.remove()
+        finish_job_trace(job, trace)
+        finish_job_profile(job, profiler)
+        _job_store.evict()
+        job_events.publish(job.job_id, "cancelled", {"actual_cost": job.actual_cost})
+        raise
+    
     except Exception as e:
         job.status = "failed"
         job.error_message = str(e)
         job.end_time = time.time()
+        observe_job_duration(job, method)
+        if checkpoint is not None:
+            checkpoint.remove()
+        finish_job_trace(job, trace)
+        finish_job_profile(job, profiler)
+        job_events.publish(job.job_id, "failed", {"error": str(e)})
         raise
+    
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        active_trace.reset(trace_token)
+        active_client.reset(client_token)
+        if job_client is not None:
+            job_client.close()
+
+
+def get_job_runner(params: Dict[str, Any]) -> Callable[..., Any]:
+    
+    # Jobs com vários arquivos ("files") têm um executor próprio
+    return translate_bundle_async if "files" in params else translate_json_async
+
+
+_background_tasks = set()
+
+
+def _discard_background_task(task: asyncio.Task) -> None:
+    
+    _background_tasks.discard(task)
+    if not task.cancelled():
+        # Falhas já ficam registradas no job; só evita o aviso de exceção não lida
+        task.exception()
+
+
+def launch_job_in_process(job: TranslationJob, params: Dict[str, Any]) -> None:
+    
+    task = asyncio.create_task(get_job_runner(params)(
+        job_id=job.job_id,
+        checkpoint=JobCheckpoint(job.job_id),
+        **params,
+    ))
+    _background_tasks.add(task)
+    task.add_done_callback(_discard_background_task)
+
+
+def resume_interrupted_jobs(
+    launcher: Optional[Callable[[TranslationJob, Dict[str, Any]], None]] = None
+) -> List[str]:
+    
+    launcher = launcher or launch_job_in_process
+    resumed = []
+    for checkpoint in claim_interrupted_checkpoints():
+        if checkpoint.job_id in _job_store:
+            continue
+        plan = checkpoint.load_plan()
+        
+        job = create_job(checkpoint.job_id)
+        job.target_language = plan["params"]["target_language"]
+        job.config = plan.get("config")
+        
+        # Lotes guardam "files"; jobs de um arquivo, "json_data"
+        source = {"files": plan["files"]} if "files" in plan else {"json_data": plan["json_data"]}
+        launcher(job, {**source, **plan["params"], "job_config": job.config})
+        resumed.append(job.job_id)
+    
+    return resumed
 
 
 def create_job(job_id: Optional[str] = None) -> TranslationJob:
@@ -591,24 +1218,90 @@ def create_job(job_id: Optional[str] = None) -> TranslationJob:
         job_id = str(uuid.uuid4())
     
     job = TranslationJob(job_id)
-    _active_jobs[job_id] = job
+    _job_store.add(job)
     return job
 
 
+def build_request_key(source: Any, options: Dict[str, Any]) -> str:
+    
+    # Mesmo documento (na mesma ordem de chaves) + mesmas opções que afetam o resultado
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps(source, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def find_duplicate_job(request_key: str) -> Optional[TranslationJob]:
+    
+    return _job_store.find_by_request_key(request_key)
+
+
 def get_job(job_id: str) -> Optional[TranslationJob]:
     
-    return _active_jobs.get(job_id)
+    return _job_store.get(job_id)
 
 
 def list_jobs() -> List[TranslationJob]:
     
-    return list(_active_jobs.values())
+    return _job_store.list()
 
 
 def delete_job(job_id: str) -> bool:
     
-    if job_id in _active_jobs:
-        del _active_jobs[job_id]
-        return True
-    return False
+    return _job_store.delete(job_id)
+
+
+def save_job(job: TranslationJob) -> None:
+    
+    _job_store.save(job)
+
+
+def is_job_local(job_id: str) -> bool:
+    
+    return _job_store.is_local(job_id)
+
+
+def set_job_store(store: Any) -> None:
+    
+    global _job_store
+    _job_store = store
+
+
+def request_job_cancel(job_id: str, keep_partial: bool = True) -> Optional[TranslationJob]:
+    
+    job = _job_store.get(job_id)
+    if job is None or job.status in FINISHED_STATUSES:
+        return job
+    job.cancel_request = {"keep_partial": keep_partial}
+    # O job pode estar num processo worker (ou em outro worker da API): o pedido vai pelo disco
+    checkpoint = JobCheckpoint(job_id)
+    checkpoint.request_cancel(keep_partial)
+    # Corrida com o fim do job: ele já removeu o checkpoint e o marcador ficaria órfão
+    current = _job_store.get(job_id)
+    if (current is None or current.status in FINISHED_STATUSES) and checkpoint.is_orphan_cancel():
+        checkpoint.remove()
+    return job
+
+
+def get_result_data(job: TranslationJob) -> Optional[Dict[str, Any]]:
+    
+    if job.result_data is not None:
+        return job.result_data
+    if job.result_payload is not None:
+        return load_payload_result_data(job.result_payload)
+    return None
+
+
+def get_job_store_stats() -> Dict[str, Any]:
+    
+    return _job_store.stats()
+
+
+def evict_jobs() -> None:
+    
+    _job_store.evict()
+
+
+def release_job(job_id: str) -> Optional[TranslationJob]:
+    
+    return _job_store.pop(job_id)
 
@@ -0,0 +1,161 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from core import job_events
+from core import metrics
+from core import translator_service
+from core.job_checkpoint import JobCheckpoint
+from core.job_store import JobStore
+
+
+# 0 desliga o pool e roda os jobs no event loop da API (comportamento antigo)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", str(os.cpu_count() or 1)))
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue: Any) -> None:
+
+    global _progress_queue
+    _progress_queue = progress_queue
+    job_events.set_forwarder(_forward_event)
+    # O estado compartilhado é mantido pelo processo da API; o worker só guarda o job que executa
+    translator_service.set_job_store(JobStore())
+
+
+def _forward_event(job_id: str, event: Dict[str, Any]) -> None:
+
+    job = translator_service.get_job(job_id)
+    # As métricas do worker vão junto, só o que mudou desde o último evento
+    _progress_queue.put((job_id, event, job.snapshot() if job else None, metrics.REGISTRY.delta()))
+
+
+def _run_job_in_worker(job_id: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Any, Dict[str, Any]]:
+
+    job = translator_service.create_job(job_id)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(translator_service.get_job_runner(params)(
+            job_id=job_id,
+            checkpoint=JobCheckpoint(job_id),
+            **params,
+        ))
+    except Exception:
+        # O erro já está registrado no job (status "failed" ou "cancelled")
+        pass
+    finally:
+        # Ao contrário de asyncio.run, não espera as threads de requisições abortadas num cancelamento
+        loop.close()
+        translator_service.release_job(job_id)
+
+    return job.snapshot(), job.result_payload, metrics.REGISTRY.delta()
+
+
+class JobDispatcher:
+    """
+    Executa jobs de tradução num pool de processos. A API só enfileira, espelha o
+    progresso recebido dos workers e serve o resultado comprimido devolvido no fim.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        context = multiprocessing.get_context("spawn")
+        self._queue = context.Queue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._queue,),
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[threading.Thread] = None
+        self._pending = 0
+        self._futures: Dict[str, Any] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+
+        self._loop = loop
+        self._listener = threading.Thread(target=self._listen, name="job-progress-listener", daemon=True)
+        self._listener.start()
+
+    def _listen(self) -> None:
+
+        while True:
+            message = self._queue.get()
+            if message is None:
+                break
+            self._loop.call_soon_threadsafe(self._apply_progress, *message)
+
+    def _apply_progress(
+        self,
+        job_id: str,
+        event: Dict[str, Any],
+        snapshot: Optional[Dict[str, Any]],
+        metrics_delta: Dict[str, Any],
+    ) -> None:
+
+        metrics.REGISTRY.merge(metrics_delta)
+        job = translator_service.get_job(job_id)
+        if job is None:
+            return
+        if snapshot is not None:
+            if snapshot["status"] in translator_service.FINISHED_STATUSES:
+                # O estado final só vale quando o resultado chegar junto (ver _finish)
+                snapshot = {k: v for k, v in snapshot.items() if k not in ("status", "end_time")}
+            job.apply_snapshot(snapshot)
+        if event["type"] not in translator_service.FINISHED_STATUSES:
+            data = {k: v for k, v in event.items() if k != "type"}
+            job_events.publish(job_id, event["type"], data)
+
+    def submit(self, job: Any, params: Dict[str, Any]) -> None:
+
+        job.status = "queued"
+        self._pending += 1
+        future = self._executor.submit(_run_job_in_worker, job.job_id, params)
+        self._futures[job.job_id] = future
+        asyncio.ensure_future(self._finish(job.job_id, asyncio.wrap_future(future)))
+
+    async def _finish(self, job_id: str, future: "asyncio.Future") -> None:
+
+        try:
+            snapshot, payload, metrics_delta = await future
+            metrics.REGISTRY.merge(metrics_delta)
+        except asyncio.CancelledError:
+            # Cancelado ainda na fila, antes de chegar a um worker
+            snapshot, payload = {"status": "cancelled", "end_time": time.time()}, None
+            JobCheckpoint(job_id).remove()
+        except Exception as e:
+            snapshot, payload = {"status": "failed", "error_message": f"Worker falhou: {e}"}, None
+        finally:
+            self._pending -= 1
+            self._futures.pop(job_id, None)
+
+        job = translator_service.get_job(job_id)
+        if job is None:
+            return
+        job.result_payload = payload
+        job.apply_snapshot(snapshot)
+        translator_service.evict_jobs()
+        job_events.publish(job_id, job.status, {"error": job.error_message} if job.status == "failed" else None)
+
+    def cancel(self, job_id: str) -> bool:
+
+        # Só tem efeito para jobs que ainda não começaram; os em execução param pelo pedido no disco
+        future = self._futures.get(job_id)
+        return future is not None and future.cancel()
+
+    def shutdown(self) -> None:
+
+        # Workers ainda rodando são encerrados: o checkpoint permite retomar no próximo start
+        for process in list(getattr(self._executor, "_processes", {}).values()):
+            process.terminate()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._queue.put(None)
@@ -0,0 +1,119 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+# Funções listadas nos relatórios em texto
+PROFILE_TOP = 40
+# Linhas de código com mais memória alocada no relatório de alocações
+ALLOC_TOP = 30
+ALLOC_FRAMES = 5
+
+# O cProfile só admite um profiler ativo por thread e o tracemalloc é global: uma execução por vez
+_active_lock = threading.Lock()
+
+
+class RunProfiler:
+    """
+    Perfil de CPU (cProfile) de uma execução e, opcionalmente, das alocações (tracemalloc).
+    Mede só a thread que chamou start(): chamadas à API em threads aparecem como espera.
+    """
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.profile = cProfile.Profile()
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.peak_bytes = 0
+        self.started = 0.0
+        self.seconds = 0.0
+        self.running = False
+
+    def start(self) -> bool:
+
+        if not _active_lock.acquire(blocking=False):
+            return False
+        if self.memory:
+            tracemalloc.start(ALLOC_FRAMES)
+        self.started = time.perf_counter()
+        self.profile.enable()
+        self.running = True
+        return True
+
+    def stop(self) -> None:
+
+        if not self.running:
+            return
+        self.profile.disable()
+        self.seconds = time.perf_counter() - self.started
+        if self.memory:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.running = False
+        _active_lock.release()
+
+    def cpu_report(self, limit: int = PROFILE_TOP) -> str:
+
+        out = io.StringIO()
+        out.write(f"Tempo total: {self.seconds:.3f}s\n\n")
+        stats = pstats.Stats(self.profile, stream=out).strip_dirs()
+        for order in ("cumulative", "tottime"):
+            out.write(f"=== Ordenado por {order} ===\n")
+            stats.sort_stats(order).print_stats(limit)
+        return out.getvalue()
+
+    def alloc_report(self, limit: int = ALLOC_TOP) -> str:
+
+        if self.snapshot is None:
+            return ""
+        snapshot = self.snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        top = snapshot.statistics("lineno")
+        lines = [
+            f"Pico de memória rastreada: {self.peak_bytes / 1024 / 1024:.1f} MB",
+            f"Ainda alocado no fim: {sum(stat.size for stat in top) / 1024 / 1024:.1f} MB",
+            "",
+            f"=== {limit} linhas com mais memória alocada (ainda viva no fim) ===",
+        ]
+        for stat in top[:limit]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:>10.1f} KB {stat.count:>8} blocos  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, base_path: Path) -> Dict[str, str]:
+
+        # <base>.prof (pstats: snakeviz, gprof2dot, python -m pstats), <base>.prof.txt e <base>.alloc.txt
+        base_path = Path(base_path)
+        base_path.parent.mkdir(parents=True, exist_ok=True)
+        files = {
+            "pstats": base_path.with_name(base_path.name + ".prof"),
+            "text": base_path.with_name(base_path.name + ".prof.txt"),
+        }
+        self.profile.dump_stats(str(files["pstats"]))
+        files["text"].write_text(self.cpu_report(), encoding="utf-8")
+        if self.snapshot is not None:
+            files["alloc"] = base_path.with_name(base_path.name + ".alloc.txt")
+            files["alloc"].write_text(self.alloc_report(), encoding="utf-8")
+        return {kind: str(path) for kind, path in files.items()}
+
+
+def run_profiled(func: Callable[[], Any], base_path: Path, memory: bool = False) -> Any:
+
+    profiler = RunProfiler(memory)
+    profiler.start()
+    try:
+        return func()
+    finally:
+        profiler.stop()
+        files = profiler.save(base_path)
+        print(f"\n🔬 Perfil salvo ({profiler.seconds:.1f}s):")
+        for path in files.values():
+            print(f"   {path}")
+        print(f"   Abra com: python -m pstats {files['pstats']}  (ou snakeviz)")
@@ -225,21 +225,36 @@ def translate_json_file(
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Uso: python script.py <arquivo_json> [idioma_destino] [arquivo_saida]")
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not positional:
+        print("Uso: python script.py <arquivo_json> [idioma_destino] [arquivo_saida] [--profile] [--profile-memory]")
+        print("\nOpções:")
+        print("  --profile          Salva o perfil de CPU ao lado do arquivo de saída (.prof e .prof.txt)")
+        print("  --profile-memory   Com --profile, também salva as alocações (.alloc.txt)")
         print("\nExemplos:")
         print("  python script.py en.json pt")
         print("  python script.py en.json pt pt.json")
         print("  python script.py en.json es es.json")
+        print("  python script.py en.json pt --profile")
         print("\nIdiomas suportados: pt (português), es (espanhol), fr (francês), etc.")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    target_language = sys.argv[2] if len(sys.argv) > 2 else 'pt'
-    output_file = sys.argv[3] if len(sys.argv) > 3 else None
+    input_file = positional[0]
+    target_language = positional[1] if len(positional) > 1 else 'pt'
+    output_file = positional[2] if len(positional) > 2 else None
     
     try:
-        translate_json_file(input_file, output_file, target_language)
+        if "--profile" in sys.argv or "--profile-memory" in sys.argv:
+            from profiling import run_profiled
+            input_path = Path(input_file)
+            profile_base = Path(output_file) if output_file else input_path.parent / f"{input_path.stem}_{target_language}{input_path.suffix}"
+            run_profiled(
+                lambda: translate_json_file(input_file, output_file, target_language),
+                profile_base,
+                memory="--profile-memory" in sys.argv,
+            )
+        else:
+            translate_json_file(input_file, output_file, target_language)
     except KeyboardInterrupt:
         print("\n\n⚠️  Processo interrompido pelo usuário")
         sys.exit(1)
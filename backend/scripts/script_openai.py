@@ -5,31 +5,117 @@ import json
 import sys
 import os
 import re
+import hashlib
 import shutil
+import subprocess
+import threading
 import asyncio
+import contextlib
+import contextvars
 import time
+import zipfile
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
 from dotenv import load_dotenv
 
-try:
-    from openai import OpenAI
-except ImportError:
-    print("ERRO: Biblioteca 'openai' não instalada.")
-    print("Execute: pip install openai python-dotenv")
-    sys.exit(1)
-
 load_dotenv()
 
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    print("ERRO: OPENAI_API_KEY não encontrada no arquivo .env")
-    print("Crie um arquivo .env com: OPENAI_API_KEY=sk-...")
-    sys.exit(1)
+# Criado na primeira chamada à API: importar o pacote openai e montar o cliente custa ~1s,
+# e a análise, o --dry sem chave e os jobs do Google Translate não precisam dele
+client = None
+_client_lock = threading.Lock()
+
+# Cliente próprio de um job (a API usa um por job e o fecha ao cancelar, abortando requisições em andamento)
+active_client: contextvars.ContextVar = contextvars.ContextVar("active_openai_client", default=None)
+
+
+def has_openai_key() -> bool:
+    
+    return bool(os.getenv("OPENAI_API_KEY"))
+
+
+def create_openai_client() -> Any:
+    
+    try:
+        from openai import OpenAI
+    except ImportError:
+        raise RuntimeError("Biblioteca 'openai' não instalada. Execute: pip install openai python-dotenv")
+    
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY não encontrada no arquivo .env")
+    return OpenAI(api_key=api_key)
+
+
+def get_active_client() -> Any:
+    
+    global client
+    job_client = active_client.get()
+    if job_client is not None:
+        return job_client
+    # As chamadas rodam em threads: o lock evita montar dois clientes na primeira rodada
+    with _client_lock:
+        if client is None:
+            client = create_openai_client()
+    return client
+
+
+# Chamadas e tokens do batch em andamento (a API registra a latência de cada batch contra eles)
+batch_usage: contextvars.ContextVar = contextvars.ContextVar("batch_usage", default=None)
+
+
+def record_batch_usage(calls: int = 1, input_tokens: int = 0, output_tokens: int = 0) -> None:
+    
+    usage = batch_usage.get()
+    if usage is not None:
+        usage["calls"] += calls
+        usage["input_tokens"] += input_tokens
+        usage["output_tokens"] += output_tokens
+
+
+# Callbacks de métricas registrados pela API (core.translator_service); a CLI roda sem eles
+_metric_hooks: Dict[str, Callable[..., None]] = {}
+
+
+def set_metric_hooks(**hooks: Callable[..., None]) -> None:
+    
+    _metric_hooks.update(hooks)
+
+
+def emit_metric(name: str, *args: Any) -> None:
+    
+    hook = _metric_hooks.get(name)
+    if hook is not None:
+        hook(*args)
+
+
+def count_retry(reason: str) -> None:
+    
+    emit_metric("retry", reason)
+
+
+# Trace do job em andamento (a API abre um por job; sem ele os spans não fazem nada)
+active_trace: contextvars.ContextVar = contextvars.ContextVar("active_trace", default=None)
 
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+def trace_span(name: str, **args: Any):
+    
+    trace = active_trace.get()
+    if trace is None:
+        return contextlib.nullcontext()
+    return trace.span(name, **args)
+
+
+@contextlib.contextmanager
+def track_batch_usage():
+    
+    usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+    token = batch_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        batch_usage.reset(token)
 
 
 DEFAULT_BATCH_SIZE = 50
@@ -38,6 +124,10 @@ DEFAULT_PARALLEL = 3
 
 DEFAULT_ON_FAILURE = "NEEDS_MANUAL_REVIEW"
 
+# Manifesto com hash do valor de origem de cada chave, salvo ao lado do arquivo de saída
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
 
 MODEL_PRICING = {
     "gpt-4o-mini": {"input": 0.15, "output": 0.60},
@@ -59,6 +149,13 @@ def parse_args() -> Dict[str, Any]:
         "model": DEFAULT_MODEL,
         "verbose": False,
         "parallel": DEFAULT_PARALLEL,
+        "watch": False,
+        "git_base": None,
+        "locales": [],
+        "target_pattern": None,
+        "dir": False,
+        "profile": False,
+        "profile_memory": False,
     }
     
     if len(sys.argv) < 2:
@@ -66,16 +163,42 @@ def parse_args() -> Dict[str, Any]:
     
     args["input_file"] = sys.argv[1]
     
-    if len(sys.argv) > 2:
+    if len(sys.argv) > 2 and not sys.argv[2].startswith("-"):
         args["target_language"] = sys.argv[2]
     
-    if len(sys.argv) > 3:
+    if len(sys.argv) > 3 and not sys.argv[3].startswith("-") and not sys.argv[2].startswith("-"):
         args["output_file"] = sys.argv[3]
     
+    if "--watch" in sys.argv:
+        args["watch"] = True
+    
+    if "--dir" in sys.argv:
+        args["dir"] = True
+    
+    if "--git-base" in sys.argv:
+        idx = sys.argv.index("--git-base")
+        if idx + 1 < len(sys.argv):
+            args["git_base"] = sys.argv[idx + 1]
+    
+    if "--locales" in sys.argv:
+        idx = sys.argv.index("--locales")
+        if idx + 1 < len(sys.argv):
+            args["locales"] = [lang.strip() for lang in sys.argv[idx + 1].split(",") if lang.strip()]
+    
+    if "--target-pattern" in sys.argv:
+        idx = sys.argv.index("--target-pattern")
+        if idx + 1 < len(sys.argv):
+            args["target_pattern"] = sys.argv[idx + 1]
+    
 
     if "--dry" in sys.argv:
         args["dry_run"] = True
     
+    # --profile-memory já liga o perfil de CPU
+    if "--profile" in sys.argv or "--profile-memory" in sys.argv:
+        args["profile"] = True
+        args["profile_memory"] = "--profile-memory" in sys.argv
+    
     if "--batch" in sys.argv:
         idx = sys.argv.index("--batch")
         if idx + 1 < len(sys.argv):
@@ -132,6 +255,98 @@ def flatten_object(obj: Any, prefix: str = "") -> List[Dict[str, Any]]:
     return entries
 
 
+def hash_source_value(value: Any) -> str:
+    
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def build_source_manifest(flat_entries: List[Dict[str, Any]]) -> Dict[str, str]:
+    
+    return {e["key"]: hash_source_value(e["value"]) for e in flat_entries}
+
+
+def get_manifest_path(output_path: Path) -> Path:
+    
+    return output_path.with_name(output_path.name + MANIFEST_SUFFIX)
+
+
+def load_source_manifest(manifest_path: Path) -> Optional[Dict[str, str]]:
+    
+    if not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION or not isinstance(data.get("hashes"), dict):
+            return None
+        return data["hashes"]
+    except Exception:
+        return None
+
+
+def save_source_manifest(manifest_path: Path, manifest: Dict[str, str], source_file: Optional[str] = None) -> None:
+    
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "version": MANIFEST_VERSION,
+            "source": source_file,
+            "hashes": manifest,
+        }, f, ensure_ascii=False)
+
+
+def diff_source_manifest(
+    previous: Dict[str, str],
+    current: Dict[str, str]
+) -> Dict[str, List[str]]:
+    
+    added = []
+    changed = []
+    for key, digest in current.items():
+        previous_digest = previous.get(key)
+        if previous_digest is None:
+            added.append(key)
+        elif previous_digest != digest:
+            changed.append(key)
+    
+    removed = [key for key in previous if key not in current]
+    
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+def select_entries_to_translate(
+    flat_base: List[Dict[str, Any]],
+    flat_existing: Dict[str, Any],
+    previous_manifest: Optional[Dict[str, str]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, str], Optional[Dict[str, List[str]]]]:
+    
+    current_manifest = build_source_manifest(flat_base)
+    diff = None
+    if previous_manifest is not None:
+        diff = diff_source_manifest(previous_manifest, current_manifest)
+    changed_keys = set(diff["changed"]) if diff else set()
+    
+    to_translate = []
+    for e in flat_base:
+        if not (isinstance(e["value"], str) and len(e["value"]) > 0):
+            continue
+        key = e["key"]
+        existing_val = flat_existing.get(key)
+        
+        if key not in flat_existing or existing_val == DEFAULT_ON_FAILURE:
+            to_translate.append(e)
+        elif diff is not None:
+            # Com manifesto: só retraduz o que mudou na origem desde a última execução
+            if key in changed_keys:
+                to_translate.append(e)
+        elif existing_val == e["value"]:
+            # Sem manifesto: heurística antiga (valor idêntico ao original = não traduzido)
+            to_translate.append(e)
+    
+    return to_translate, current_manifest, diff
+
+
 def reconstruct_json_preserving_order(
     original_obj: Any,
     translated_dict: Dict[str, str],
@@ -245,12 +460,7 @@ def call_openai_single_key(
     return translated_value, token_usage
 
 
-def call_openai_batch_json(
-    items_dict: Dict[str, str], 
-    model: str = DEFAULT_MODEL, 
-    target_lang: str = "pt",
-    stats: Optional[Dict] = None
-) -> Tuple[Dict[str, str], Dict[str, int]]:
+def build_translation_messages(items_dict: Dict[str, str], target_lang: str = "pt") -> List[Dict[str, str]]:
     
     lang_names = {
         "es": "Spanish", "pt": "Brazilian Portuguese", "fr": "French", "de": "German",
@@ -306,17 +516,44 @@ def call_openai_batch_json(
         "Remember: Each key maps to ONE value. Do not mix them up."
     )
     
-    try:
-        response = client.chat.completions.create(
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def create_chat_completion(messages: List[Dict[str, str]], model: str) -> Any:
+    
+    def create():
+        return get_active_client().chat.completions.create(
             model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+            messages=messages,
             temperature=0.0,
             max_tokens=8000,
             response_format={"type": "json_object"}
         )
+    
+    with trace_span("api_call", model=model):
+        emit_metric("api_call_started", model)
+        started = time.perf_counter()
+        result = "error"
+        try:
+            response = create()
+            result = "ok"
+            return response
+        finally:
+            emit_metric("api_call_finished", model, time.perf_counter() - started, result)
+
+
+def call_openai_batch_json(
+    items_dict: Dict[str, str], 
+    model: str = DEFAULT_MODEL, 
+    target_lang: str = "pt",
+    stats: Optional[Dict] = None
+) -> Tuple[Dict[str, str], Dict[str, int]]:
+    
+    try:
+        response = create_chat_completion(build_translation_messages(items_dict, target_lang), model)
         
 
         usage = response.usage
@@ -325,6 +562,8 @@ def call_openai_batch_json(
             "completion_tokens": usage.completion_tokens if hasattr(usage, 'completion_tokens') else usage.output_tokens,
             "total_tokens": usage.total_tokens
         }
+        record_batch_usage(1, token_usage["prompt_tokens"], token_usage["completion_tokens"])
+        emit_metric("tokens", model, token_usage["prompt_tokens"], token_usage["completion_tokens"])
         
 
         if stats:
@@ -373,6 +612,7 @@ def call_openai_batch_json(
                 print(f"\n⚠️  AVISO: {len(deep_keys)} chaves aninhadas profundas detectadas. Verifique se todas foram retornadas.")
             
         except json.JSONDecodeError as e:
+            count_retry("parse_failure")
             print(f"\n❌ Erro ao decodificar JSON da API: {e}")
             print(f"   Resposta recebida: {translated_json_str[:500]}...")
 
@@ -382,10 +622,25 @@ def call_openai_batch_json(
     
     except Exception as e:
         print(f"\n❌ Erro ao chamar OpenAI API: {e}")
+        record_batch_usage(1)
 
         return {}, {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
 
 
+def should_translate_individually(key: str, original: str) -> bool:
+    
+    # Chaves aninhadas e textos curtos com pontuação nas bordas vão numa chamada própria
+    is_nested_object = key.count('.') >= 2
+    is_short_string = len(original) <= 20
+    has_edge_punctuation = original.strip() != original
+    
+    return (
+        is_nested_object or
+        (is_short_string and has_edge_punctuation) or
+        (is_short_string and key.count('.') >= 1)
+    )
+
+
 async def translate_batch_async(
     items: List[Dict[str, Any]],
     cache: Dict[str, str],
@@ -403,6 +658,9 @@ async def translate_batch_async(
 
     items_to_translate_map = {}
     items_for_individual_translation = []
+    cache_hits = 0
+    trace = active_trace.get()
+    mask_started = time.perf_counter()
     
     for item in items:
         original = str(item["value"])
@@ -416,6 +674,7 @@ async def translate_batch_async(
                 del cache[original]
             else:
                 stats["cached"] = stats.get("cached", 0) + 1
+                cache_hits += 1
                 results.append({ "key": key, "translated": cached_translation, "fromCache": True })
                 continue
         
@@ -423,18 +682,7 @@ async def translate_batch_async(
         masked, placeholder_map = mask_placeholders(original)
         
 
-        is_nested_object = key.count('.') >= 2
-        is_short_string = len(original) <= 20
-        has_edge_punctuation = original.strip() != original
-        
-
-        should_translate_individually = (
-            is_nested_object or
-            (is_short_string and has_edge_punctuation) or
-            (is_short_string and key.count('.') >= 1)
-        )
-        
-        if should_translate_individually:
+        if should_translate_individually(key, original):
             items_for_individual_translation.append({
                 "key": key,
                 "original": original,
@@ -448,13 +696,18 @@ async def translate_batch_async(
                 "placeholder_map": placeholder_map
             }
     
+    if trace is not None:
+        trace.add("mask", mask_started, items=len(items), cached=cache_hits)
+    emit_metric("cache_lookups", "openai", cache_hits, len(items) - cache_hits)
+    
 
     for item_data in items_for_individual_translation:
         try:
             local_stats = {}
-            translated_masked, token_usage = await asyncio.to_thread(
-                call_openai_single_key, item_data["key"], item_data["masked"], model, target_lang, local_stats
-            )
+            with trace_span("individual", key=item_data["key"]):
+                translated_masked, token_usage = await asyncio.to_thread(
+                    call_openai_single_key, item_data["key"], item_data["masked"], model, target_lang, local_stats
+                )
             
 
             if lock and stats:
@@ -469,6 +722,7 @@ async def translate_batch_async(
                 
 
                 if "__PH_" in translated:
+                    count_retry("placeholder_loss")
                     for ph_item in item_data["placeholder_map"]:
                         translated = translated.replace(ph_item["token"], ph_item["original"])
                     if "__PH_" in translated:
@@ -539,9 +793,10 @@ async def translate_batch_async(
     try:
         local_stats = {}
         
-        translated_dict, token_usage = await asyncio.to_thread(
-            call_openai_batch_json, input_json_dict, model, target_lang, local_stats
-        )
+        with trace_span("batch_call", keys=len(input_json_dict)):
+            translated_dict, token_usage = await asyncio.to_thread(
+                call_openai_batch_json, input_json_dict, model, target_lang, local_stats
+            )
         
 
         if verbose:
@@ -569,15 +824,17 @@ async def translate_batch_async(
             
 
             if not translated_masked or len(translated_masked) == 0:
+                count_retry("missing_key")
                 if verbose: 
                     print(f"  ⚠️  Chave '{key}' não encontrada na resposta do batch, traduzindo individualmente...")
                 
 
                 try:
                     local_stats = {}
-                    translated_masked, retry_tokens = await asyncio.to_thread(
-                        call_openai_single_key, key, item_data["masked"], model, target_lang, local_stats
-                    )
+                    with trace_span("retry", key=key, reason="missing_key"):
+                        translated_masked, retry_tokens = await asyncio.to_thread(
+                            call_openai_single_key, key, item_data["masked"], model, target_lang, local_stats
+                        )
                     
 
                     if lock and stats:
@@ -615,6 +872,7 @@ async def translate_batch_async(
             original_len = len(original)
             translated_len = len(translated)
             if translated_len > original_len * 3 and original_len > 0:
+                count_retry("concatenation")
                 if verbose:
                     print(f"  ⚠️  VALOR CONCATENADO DETECTADO em '{key}':")
                     print(f"      Original ({original_len} chars): {original[:50]}...")
@@ -623,9 +881,10 @@ async def translate_batch_async(
                 
 
                 try:
-                    retry_masked, retry_tokens = await asyncio.to_thread(
-                        call_openai_single_key, key, item_data["masked"], model, target_lang, {}
-                    )
+                    with trace_span("retry", key=key, reason="concatenation"):
+                        retry_masked, retry_tokens = await asyncio.to_thread(
+                            call_openai_single_key, key, item_data["masked"], model, target_lang, {}
+                        )
                     
                     if retry_masked and len(retry_masked) > 0:
                         retry_translated = restore_placeholders(retry_masked, placeholder_map)
@@ -673,6 +932,7 @@ async def translate_batch_async(
             
 
             if "__PH_" in translated:
+                count_retry("placeholder_loss")
 
                 for ph_item in placeholder_map:
                     token = ph_item["token"]
@@ -729,6 +989,659 @@ async def translate_batch_async(
     return results
 
 
+async def translate_entries_async(
+    entries: List[Dict[str, Any]],
+    cache: Dict[str, str],
+    target_lang: str,
+    model: str,
+    stats: Dict[str, Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    parallel: int = DEFAULT_PARALLEL,
+    verbose: bool = False
+) -> Dict[str, str]:
+    
+    batches = [entries[i:i + batch_size] for i in range(0, len(entries), batch_size)]
+    lock = asyncio.Lock()
+    semaphore = asyncio.Semaphore(max(1, parallel))
+    
+    async def run_batch(batch, batch_num):
+        async with semaphore:
+            return await translate_batch_async(
+                batch, cache, target_lang, model,
+                stats, batch_num, len(batches), verbose, lock
+            )
+    
+    all_results = await asyncio.gather(
+        *(run_batch(batch, i + 1) for i, batch in enumerate(batches)),
+        return_exceptions=True
+    )
+    
+    translated = {}
+    for batch, result in zip(batches, all_results):
+        if isinstance(result, Exception):
+            if verbose: print(f"\n❌ Erro no batch: {result}")
+            for item in batch:
+                translated[item["key"]] = DEFAULT_ON_FAILURE
+            continue
+        for r in result:
+            translated[r["key"]] = r["translated"]
+    
+    return translated
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def repair_translations(
+    flat_base: List[Dict[str, Any]],
+    translated_dict: Dict[str, str],
+    cache: Dict[str, str],
+    model: str,
+    target_lang: str,
+    stats: Dict[str, Any],
+    verbose: bool = False
+) -> Tuple[int, List[str]]:
+    
+    # Retraduz chaves sem tradução uma a uma e valida o resultado final (placeholders, falhas)
+    flat_base_map = {e["key"]: e for e in flat_base}
+    final_errors = 0
+    placeholder_errors_final = []
+    
+    missing_keys = []
+    for entry in flat_base:
+        key = entry["key"]
+        if isinstance(entry["value"], str) and len(entry["value"]) > 0:
+            if key not in translated_dict or not translated_dict[key] or len(translated_dict[key]) == 0:
+                missing_keys.append(key)
+    
+    if missing_keys:
+        print(f"⚠️  {len(missing_keys)} chaves sem tradução válida, tentando retraduzir...")
+        
+
+        for key in missing_keys:
+            entry = flat_base_map.get(key)
+            if not entry:
+                continue
+            
+            try:
+                masked, placeholder_map = mask_placeholders(entry["value"])
+                local_stats = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+                
+
+                translated_masked, retry_tokens = call_openai_single_key(
+                    entry["key"], masked, model, target_lang, local_stats
+                )
+                
+
+                if translated_masked and len(translated_masked) > 0:
+                    translated = restore_placeholders(translated_masked, placeholder_map)
+                    
+
+                    if "__PH_" in translated:
+
+                        for ph_item in placeholder_map:
+                            translated = translated.replace(ph_item["token"], ph_item["original"])
+                        
+
+                        if "__PH_" in translated:
+                            if verbose:
+                                print(f"  ⚠️  Placeholders não restaurados em '{entry['key']}' (retry), marcando como falha")
+                            translated_dict[entry["key"]] = DEFAULT_ON_FAILURE
+                            stats["errors"] = stats.get("errors", 0) + 1
+                            continue
+                    
+                    translated_dict[entry["key"]] = translated
+                    cache[entry["value"]] = translated
+                    
+
+                    stats["total_prompt_tokens"] = stats.get("total_prompt_tokens", 0) + retry_tokens["prompt_tokens"]
+                    stats["total_completion_tokens"] = stats.get("total_completion_tokens", 0) + retry_tokens["completion_tokens"]
+                    stats["total_tokens"] = stats.get("total_tokens", 0) + retry_tokens["total_tokens"]
+                    stats["api_calls"] = stats.get("api_calls", 0) + 1
+                    stats["translated"] = stats.get("translated", 0) + 1
+                    
+                    if verbose:
+                        print(f"  ✓ Retraduzido: {entry['key']}")
+                else:
+
+                    translated_dict[entry["key"]] = DEFAULT_ON_FAILURE
+                    stats["errors"] = stats.get("errors", 0) + 1
+                    if verbose:
+                        print(f"  ❌ Falha ao retraduzir: {entry['key']}")
+            except Exception as e:
+
+                translated_dict[entry["key"]] = DEFAULT_ON_FAILURE
+                stats["errors"] = stats.get("errors", 0) + 1
+                if verbose:
+                    print(f"  ❌ Erro ao retraduzir {entry['key']}: {e}")
+    
+
+    for entry in flat_base:
+        key = entry["key"]
+        if isinstance(entry["value"], str) and len(entry["value"]) > 0:
+
+            if key not in translated_dict:
+                translated_dict[key] = DEFAULT_ON_FAILURE
+                final_errors += 1
+            elif not translated_dict[key] or len(translated_dict[key]) == 0:
+                translated_dict[key] = DEFAULT_ON_FAILURE
+                final_errors += 1
+            elif "__PH_" in translated_dict[key]:
+
+                placeholder_errors_final.append(key)
+                original_value = entry["value"]
+                masked, placeholder_map = mask_placeholders(original_value)
+                
+
+                restored_value = restore_placeholders(translated_dict[key], placeholder_map)
+                
+
+                if "__PH_" in restored_value:
+                    if verbose:
+                        print(f"  ⚠️  Placeholders não restaurados em '{key}', marcando como falha")
+                    translated_dict[key] = DEFAULT_ON_FAILURE
+                    final_errors += 1
+                else:
+                    translated_dict[key] = restored_value
+    
+    return final_errors, placeholder_errors_final
+
+
+WATCH_POLL_INTERVAL = 0.2
+WATCH_DEBOUNCE_SECONDS = 0.3
+
+
+def watch_mode(
+    args: Dict[str, Any],
+    input_path: Path,
+    output_path: Path,
+    cache_file: Path,
+    manifest_file: Path
+) -> None:
+    
+    target_lang = args["target_language"]
+    model = args["model"]
+    stats = {
+        "translated": 0,
+        "cached": 0,
+        "errors": 0,
+        "total_prompt_tokens": 0,
+        "total_completion_tokens": 0,
+        "total_tokens": 0,
+        "api_calls": 0
+    }
+    
+    cache = {}
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except Exception as e:
+            print(f"⚠️  Não foi possível carregar cache: {e}")
+    
+    # Estado residente: traduções achatadas da saída e manifesto da última origem processada
+    translated_flat = {}
+    if output_path.exists():
+        try:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                translated_flat = {e["key"]: e["value"] for e in flatten_object(json.load(f))}
+        except Exception as e:
+            print(f"⚠️  Não foi possível ler arquivo existente: {e}")
+    snapshot_manifest = load_source_manifest(manifest_file) if translated_flat else None
+    
+    def sync(base_data: Any) -> None:
+        nonlocal snapshot_manifest
+        
+        start = time.time()
+        flat_base = flatten_object(base_data)
+        to_translate, current_manifest, diff = select_entries_to_translate(
+            flat_base, translated_flat, snapshot_manifest
+        )
+        
+        if diff is not None:
+            for key in diff["removed"]:
+                translated_flat.pop(key, None)
+            if not to_translate and not diff["removed"]:
+                snapshot_manifest = current_manifest
+                return
+        
+        calls_before = stats["api_calls"]
+        failures = 0
+        if to_translate:
+            translated_flat.update(asyncio.run(translate_entries_async(
+                to_translate, cache, target_lang, model, stats,
+                args["batch_size"], args["parallel"], args["verbose"]
+            )))
+            # Mesmo reparo do modo normal: retry das chaves sem tradução e validação dos placeholders
+            failures, _ = repair_translations(flat_base, translated_flat, cache, model, target_lang, stats, args["verbose"])
+        
+        output_data = reconstruct_json_preserving_order(base_data, translated_flat)
+        write_json_atomic(output_path, output_data)
+        save_source_manifest(manifest_file, current_manifest, input_path.name)
+        if to_translate:
+            write_json_atomic(cache_file, cache)
+        snapshot_manifest = current_manifest
+        
+        summary = f"{len(to_translate)} traduzidas"
+        if failures:
+            summary += f" ({failures} como '{DEFAULT_ON_FAILURE}')"
+        if diff is not None:
+            summary = (f"+{len(diff['added'])} novas | ~{len(diff['changed'])} alteradas | "
+                       f"-{len(diff['removed'])} removidas | {summary}")
+        print(f"[{time.strftime('%H:%M:%S')}] ✓ {output_path.name}: {summary} | "
+              f"{stats['api_calls'] - calls_before} chamadas | {time.time() - start:.2f}s")
+    
+    def read_source() -> Optional[Any]:
+        try:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            # Editor pode estar no meio da gravação; espera o próximo evento
+            print(f"[{time.strftime('%H:%M:%S')}] ⚠️  JSON inválido em {input_path.name}: {e}")
+            return None
+    
+    print(f"\n👀 Observando {input_path} (Ctrl+C para parar)...")
+    
+    try:
+        watch_loop(input_path, read_source, sync)
+    except KeyboardInterrupt:
+        print(f"\n\n⏹  Observação encerrada | {stats['translated']} traduzidas | {stats['cached']} do cache | "
+              f"{stats['errors']} erros | {stats['api_calls']} chamadas | "
+              f"${calculate_cost({'prompt_tokens': stats['total_prompt_tokens'], 'completion_tokens': stats['total_completion_tokens']}, model):.6f}")
+
+
+def watch_loop(input_path: Path, read_source: Callable[[], Optional[Any]], sync: Callable[[Any], None]) -> None:
+    
+    last_mtime = None
+    while True:
+        try:
+            mtime = input_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            # Alguns editores salvam removendo e recriando o arquivo
+            time.sleep(WATCH_POLL_INTERVAL)
+            continue
+        
+        if mtime != last_mtime:
+            # Debounce: aguarda o arquivo parar de mudar antes de processar
+            time.sleep(WATCH_DEBOUNCE_SECONDS)
+            try:
+                settled_mtime = input_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if settled_mtime != mtime:
+                continue
+            
+            last_mtime = mtime
+            base_data = read_source()
+            if base_data is not None:
+                try:
+                    sync(base_data)
+                except Exception as e:
+                    print(f"[{time.strftime('%H:%M:%S')}] ❌ Erro ao traduzir: {e}")
+        
+        time.sleep(WATCH_POLL_INTERVAL)
+
+
+def read_git_revision(path: Path, ref: str) -> Optional[Any]:
+    
+    result = subprocess.run(
+        ["git", "-C", str(path.parent), "show", f"{ref}:./{path.name}"],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace")
+        if "does not exist" in stderr or "exists on disk, but not in" in stderr:
+            # Arquivo novo: tudo é delta
+            return None
+        raise RuntimeError(f"git show {ref}:{path.name} falhou: {stderr.strip()}")
+    return json.loads(result.stdout.decode("utf-8"))
+
+
+def resolve_locale_path(input_path: Path, lang: str, target_pattern: Optional[str] = None) -> Path:
+    
+    if target_pattern:
+        return Path(target_pattern.format(lang=lang, stem=input_path.stem))
+    
+    sibling = input_path.parent / f"{lang}{input_path.suffix}"
+    if sibling.exists():
+        return sibling
+    return input_path.parent / f"{input_path.stem}_{lang}{input_path.suffix}"
+
+
+def git_delta_mode(args: Dict[str, Any], input_path: Path) -> None:
+    
+    ref = args["git_base"]
+    locales = args["locales"] or [args["target_language"]]
+    
+    base_data = None
+    try:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            base_data = json.load(f)
+        old_data = read_git_revision(input_path, ref)
+    except Exception as e:
+        print(f"ERRO ao ler origem: {e}")
+        sys.exit(1)
+    
+    flat_base = flatten_object(base_data)
+    current_manifest = build_source_manifest(flat_base)
+    diff = diff_source_manifest(build_source_manifest(flatten_object(old_data or {})), current_manifest)
+    delta_keys = set(diff["added"]) | set(diff["changed"])
+    
+    print(f"\n🔀 Delta {ref} → working tree: +{len(diff['added'])} novas | "
+          f"~{len(diff['changed'])} alteradas | -{len(diff['removed'])} removidas")
+    
+    total_errors = 0
+    total_stats = {"total_prompt_tokens": 0, "total_completion_tokens": 0, "api_calls": 0}
+    
+    for lang in locales:
+        target_path = resolve_locale_path(input_path, lang, args["target_pattern"])
+        
+        flat_target = {}
+        if target_path.exists():
+            try:
+                with open(target_path, 'r', encoding='utf-8') as f:
+                    flat_target = {e["key"]: e["value"] for e in flatten_object(json.load(f))}
+            except Exception as e:
+                print(f"⚠️  [{lang}] Não foi possível ler {target_path}: {e}")
+                total_errors += 1
+                continue
+        
+        # Delta do commit + chaves que ainda faltam (ou falharam) neste idioma
+        to_translate = [
+            e for e in flat_base
+            if isinstance(e["value"], str) and len(e["value"]) > 0 and (
+                e["key"] in delta_keys or
+                e["key"] not in flat_target or
+                flat_target[e["key"]] == DEFAULT_ON_FAILURE
+            )
+        ]
+        
+        removed_here = [key for key in diff["removed"] if flat_target.pop(key, None) is not None]
+        
+        if not to_translate and not removed_here:
+            print(f"✓ [{lang}] {target_path.name}: nada a traduzir")
+            continue
+        
+        cache_file = target_path.parent / f".translate_cache_{lang}.json"
+        cache = {}
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except Exception:
+                cache = {}
+        
+        stats = {
+            "translated": 0, "cached": 0, "errors": 0,
+            "total_prompt_tokens": 0, "total_completion_tokens": 0,
+            "total_tokens": 0, "api_calls": 0
+        }
+        start = time.time()
+        if to_translate:
+            flat_target.update(asyncio.run(translate_entries_async(
+                to_translate, cache, lang, args["model"], stats,
+                args["batch_size"], args["parallel"], args["verbose"]
+            )))
+        
+        failures = sum(1 for e in to_translate if flat_target.get(e["key"]) == DEFAULT_ON_FAILURE)
+        total_errors += failures
+        for name in total_stats:
+            total_stats[name] += stats[name]
+        
+        if args["dry_run"]:
+            print(f"🧪 [{lang}] {target_path.name}: {len(to_translate)} chaves traduzidas (dry-run, não salvo)")
+            continue
+        
+        write_json_atomic(target_path, reconstruct_json_preserving_order(base_data, flat_target))
+        save_source_manifest(get_manifest_path(target_path), current_manifest, input_path.name)
+        if to_translate:
+            write_json_atomic(cache_file, cache)
+        
+        print(f"✓ [{lang}] {target_path.name}: {len(to_translate)} traduzidas | "
+              f"{stats['cached']} do cache | {stats['api_calls']} chamadas | "
+              f"{failures} falhas | {time.time() - start:.1f}s")
+    
+    total_cost = calculate_cost({
+        "prompt_tokens": total_stats["total_prompt_tokens"],
+        "completion_tokens": total_stats["total_completion_tokens"],
+    }, args["model"])
+    print(f"\n📊 {len(locales)} idiomas | {total_stats['api_calls']} chamadas | Custo: ${total_cost:.6f}")
+    
+    if total_errors:
+        print(f"⚠️  {total_errors} chaves marcadas como '{DEFAULT_ON_FAILURE}'")
+        sys.exit(2)
+
+
+def load_json_bundle_zip(archive: Any) -> Dict[str, Any]:
+    
+    files = {}
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            name = info.filename.replace("\\", "/")
+            parts = [part for part in name.split("/") if part]
+            if info.is_dir() or not name.endswith(".json"):
+                continue
+            if name.startswith("/") or ".." in parts or parts[0] == "__MACOSX" or parts[-1].startswith("."):
+                continue
+            with zf.open(info) as f:
+                files["/".join(parts)] = json.loads(f.read().decode("utf-8"))
+    return files
+
+
+def load_json_bundle(source: Path) -> Dict[str, Any]:
+    
+    source = Path(source)
+    if source.is_file() and zipfile.is_zipfile(source):
+        return load_json_bundle_zip(source)
+    
+    files = {}
+    for path in sorted(source.rglob("*.json")):
+        relative = path.relative_to(source)
+        # Arquivos ocultos (cache, manifestos) não fazem parte do lote
+        if any(part.startswith(".") for part in relative.parts):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            files[relative.as_posix()] = json.load(f)
+    return files
+
+
+def plan_bundle_batches(files: Dict[str, Any], cache: Dict[str, str], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    
+    string_entries = {}
+    value_files: Dict[str, Dict[str, int]] = {}
+    representatives = {}
+    used_keys = set()
+    
+    for name, data in files.items():
+        entries = [e for e in flatten_object(data) if isinstance(e["value"], str) and len(e["value"]) > 0]
+        string_entries[name] = entries
+        for entry in entries:
+            value = entry["value"]
+            counts = value_files.setdefault(value, {})
+            counts[name] = counts.get(name, 0) + 1
+            
+            # Cada texto é traduzido uma vez só, mesmo repetido em vários arquivos
+            if value in representatives or (value in cache and "__PH_" not in cache[value]):
+                continue
+            key = entry["key"]
+            suffix = 1
+            while key in used_keys:
+                # Mesma chave com textos diferentes em arquivos distintos não pode colidir no batch
+                key = f"{entry['key']}~{suffix}"
+                suffix += 1
+            used_keys.add(key)
+            representatives[value] = {"key": key, "value": value}
+    
+    unique = list(representatives.values())
+    batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+    # Maiores primeiro: batches longos não ficam para o fim e a cauda do pool diminui
+    batches.sort(key=lambda batch: sum(len(e["value"]) for e in batch), reverse=True)
+    
+    return {
+        "string_entries": string_entries,
+        "value_files": value_files,
+        "batches": batches,
+        "total_strings": sum(len(entries) for entries in string_entries.values()),
+        "unique_strings": len(value_files),
+        "to_translate": len(unique),
+    }
+
+
+async def run_planned_batches_async(
+    batches: List[List[Dict[str, Any]]],
+    cache: Dict[str, str],
+    target_lang: str,
+    model: str,
+    stats: Dict[str, Any],
+    parallel: int = DEFAULT_PARALLEL,
+    verbose: bool = False,
+    on_batch: Optional[Callable[[int, List[Dict[str, Any]], List[Dict[str, Any]], float], None]] = None,
+    translate_batch: Optional[Callable[..., Any]] = None,
+) -> None:
+    
+    lock = asyncio.Lock()
+    semaphore = asyncio.Semaphore(max(1, parallel))
+    total_batches = len(batches)
+    
+    if translate_batch is None:
+        async def translate_batch(batch, batch_num, total, batch_lock):
+            return await translate_batch_async(
+                batch, cache, target_lang, model,
+                stats, batch_num, total, verbose, batch_lock
+            )
+    
+    async def run_batch(batch, batch_num):
+        async with semaphore:
+            start = time.time()
+            try:
+                results = await translate_batch(batch, batch_num, total_batches, lock)
+            except Exception as e:
+                if verbose: print(f"\n❌ Erro no batch {batch_num}: {e}")
+                stats["errors"] = stats.get("errors", 0) + len(batch)
+                results = [{"key": item["key"], "translated": DEFAULT_ON_FAILURE, "fromCache": False} for item in batch]
+            if on_batch is not None:
+                on_batch(batch_num, batch, results, time.time() - start)
+    
+    # O semáforo atende na ordem de criação, então a ordem do plano é a ordem de execução
+    await asyncio.gather(*(run_batch(batch, i + 1) for i, batch in enumerate(batches)))
+
+
+def build_bundle_outputs(files: Dict[str, Any], plan: Dict[str, Any], cache: Dict[str, str]) -> Dict[str, Any]:
+    
+    outputs = {}
+    for name, data in files.items():
+        translated = {}
+        for entry in plan["string_entries"][name]:
+            value = cache.get(entry["value"])
+            translated[entry["key"]] = value if value and "__PH_" not in value else DEFAULT_ON_FAILURE
+        outputs[name] = reconstruct_json_preserving_order(data, translated)
+    return outputs
+
+
+def bundle_mode(args: Dict[str, Any], input_path: Path) -> None:
+    
+    lang = args["target_language"]
+    if args["output_file"]:
+        output_dir = Path(args["output_file"])
+    elif input_path.is_dir():
+        output_dir = input_path.parent / lang
+    else:
+        output_dir = input_path.parent / f"{input_path.stem}_{lang}"
+    cache_file = input_path.parent / f".translate_cache_{lang}.json"
+    
+    try:
+        files = load_json_bundle(input_path)
+    except Exception as e:
+        print(f"ERRO ao ler lote: {e}")
+        sys.exit(1)
+    if not files:
+        print(f"ERRO: nenhum arquivo .json em '{input_path}'")
+        sys.exit(1)
+    
+    cache = {}
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except Exception:
+            cache = {}
+    
+    plan = plan_bundle_batches(files, cache, args["batch_size"])
+    print(f"\n📦 {len(files)} arquivos | {plan['total_strings']} strings | "
+          f"{plan['unique_strings']} textos únicos | {plan['to_translate']} a traduzir | "
+          f"{len(plan['batches'])} batches")
+    
+    remaining = {name: len(entries) for name, entries in plan["string_entries"].items()}
+    for value, counts in plan["value_files"].items():
+        if value in cache and "__PH_" not in cache[value]:
+            for name, count in counts.items():
+                remaining[name] -= count
+    done_batches = 0
+    
+    def on_batch(batch_num, batch, results, seconds):
+        nonlocal done_batches
+        done_batches += 1
+        finished = []
+        for entry in batch:
+            for name, count in plan["value_files"][entry["value"]].items():
+                remaining[name] -= count
+                if remaining[name] == 0:
+                    finished.append(name)
+        print(f"  [{done_batches}/{len(plan['batches'])}] batch {batch_num}: {len(batch)} textos em {seconds:.1f}s"
+              + (f" | concluídos: {', '.join(finished)}" if finished else ""))
+    
+    stats = {
+        "translated": 0, "cached": 0, "errors": 0,
+        "total_prompt_tokens": 0, "total_completion_tokens": 0,
+        "total_tokens": 0, "api_calls": 0
+    }
+    start = time.time()
+    if plan["batches"]:
+        asyncio.run(run_planned_batches_async(
+            plan["batches"], cache, lang, args["model"], stats,
+            args["parallel"], args["verbose"], on_batch
+        ))
+    
+    outputs = build_bundle_outputs(files, plan, cache)
+    failures = sum(
+        1 for name, data in outputs.items()
+        for e in flatten_object(data) if e["value"] == DEFAULT_ON_FAILURE
+    )
+    
+    if args["dry_run"]:
+        print(f"\n🧪 Dry-run: {len(outputs)} arquivos não foram salvos")
+    else:
+        for name, data in outputs.items():
+            target_path = output_dir / name
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(target_path, data)
+        if plan["batches"]:
+            write_json_atomic(cache_file, cache)
+        print(f"\n💾 {len(outputs)} arquivos salvos em {output_dir}")
+    
+    cost = calculate_cost({
+        "prompt_tokens": stats["total_prompt_tokens"],
+        "completion_tokens": stats["total_completion_tokens"],
+    }, args["model"])
+    print(f"📊 {stats['api_calls']} chamadas | {time.time() - start:.1f}s | Custo: ${cost:.6f}")
+    
+    if failures:
+        print(f"⚠️  {failures} chaves marcadas como '{DEFAULT_ON_FAILURE}'")
+        sys.exit(2)
+
+
 def calculate_cost(token_usage: Dict[str, int], model: str) -> float:
     
     if model not in MODEL_PRICING:
@@ -741,6 +1654,15 @@ def calculate_cost(token_usage: Dict[str, int], model: str) -> float:
     return input_cost + output_cost
 
 
+def get_profile_base(args: Dict[str, Any]) -> Path:
+    
+    # O perfil fica ao lado da saída: pt.json -> pt.json.prof, pt.json.prof.txt, pt.json.alloc.txt
+    if args["output_file"]:
+        return Path(args["output_file"])
+    input_path = Path(args["input_file"])
+    return input_path.parent / f"{input_path.stem}_{args['target_language']}{input_path.suffix}"
+
+
 def main():
     
     args = parse_args()
@@ -753,10 +1675,21 @@ def main():
         print("  --parallel N       Batches paralelos (padrão: 3, recomendado: 3-5)")
         print("  --model MODEL      Modelo OpenAI (padrão: gpt-4o-mini)")
         print("  --verbose, -v      Logs detalhados (padrão: resumido)")
+        print("  --watch            Observa o arquivo e retraduz só as chaves editadas a cada gravação")
+        print("  --git-base REF     Traduz só o delta entre REF e a working tree (CI)")
+        print("  --locales LISTA    Idiomas a atualizar com --git-base (ex: pt,es,fr)")
+        print("  --target-pattern P Caminho dos arquivos de idioma (ex: locales/{lang}/common.json)")
+        print("  --dir              Traduz um diretório (ou .zip) de JSONs num único lote")
+        print("  --profile          Salva o perfil de CPU ao lado do arquivo de saída (.prof e .prof.txt)")
+        print("  --profile-memory   Com --profile, também salva as alocações (.alloc.txt)")
         print("\nExemplos:")
         print("  python src/script_openai.py en.json pt")
         print("  python src/script_openai.py en.json pt --dry")
         print("  python src/script_openai.py en.json pt pt.json --batch 5")
+        print("  python src/script_openai.py en.json pt pt.json --watch")
+        print("  python src/script_openai.py en.json --git-base origin/main --locales pt,es,fr")
+        print("  python src/script_openai.py locales/en pt locales/pt --dir")
+        print("  python src/script_openai.py en.json pt --profile")
         sys.exit(1)
     
     input_path = Path(args["input_file"])
@@ -764,6 +1697,21 @@ def main():
         print(f"ERRO: Arquivo '{args['input_file']}' não encontrado!")
         sys.exit(1)
     
+    # Sem chave só o --dry de arquivo único roda, e para na análise (sem chamadas à API)
+    analysis_only = args["dry_run"] and not (args["git_base"] or args["dir"] or args["watch"])
+    if not has_openai_key() and not analysis_only:
+        print("ERRO: OPENAI_API_KEY não encontrada no arquivo .env")
+        print("Crie um arquivo .env com: OPENAI_API_KEY=sk-...")
+        sys.exit(1)
+    
+    if args["git_base"]:
+        git_delta_mode(args, input_path)
+        return
+    
+    if args["dir"]:
+        bundle_mode(args, input_path)
+        return
+    
 
     if args["output_file"]:
         output_path = Path(args["output_file"])
@@ -772,6 +1720,7 @@ def main():
     
     cache_file = input_path.parent / f".translate_cache_{args['target_language']}.json"
     backup_file = output_path.with_suffix(output_path.suffix + ".bak")
+    manifest_file = get_manifest_path(output_path)
     
     print("=" * 70)
     print("🤖 TRADUTOR JSON (Modo JSON Otimizado) - OPENAI API")
@@ -786,6 +1735,10 @@ def main():
     print(f"⚠️  Valor em caso de falha: '{DEFAULT_ON_FAILURE}'")
     print("=" * 70)
     
+    if args["watch"]:
+        watch_mode(args, input_path, output_path, cache_file, manifest_file)
+        return
+    
     print(f"\n📖 Lendo arquivo: {input_path}")
     
 
@@ -824,23 +1777,23 @@ def main():
     flat_existing = {e["key"]: e["value"] for e in flatten_object(existing_data)}
     
 
-    to_translate = []
-    for e in flat_base:
-        if isinstance(e["value"], str) and len(e["value"]) > 0:
-            key = e["key"]
-            existing_val = flat_existing.get(key)
-            
-            if (key not in flat_existing or 
-                existing_val == e["value"] or 
-                existing_val == DEFAULT_ON_FAILURE):
-                to_translate.append(e)
-
+    flat_base_map = {e["key"]: e for e in flat_base}
+    
+    previous_manifest = load_source_manifest(manifest_file) if flat_existing else None
+    to_translate, source_manifest, source_diff = select_entries_to_translate(
+        flat_base, flat_existing, previous_manifest
+    )
 
     cached_count = sum(1 for e in to_translate if e["value"] in cache)
     to_translate_count = len(to_translate) - cached_count
     
     print(f"✓ Análise concluída!")
     print(f"  • Total de entradas: {len(flat_base)}")
+    if source_diff is not None:
+        print(f"  • Manifesto de origem: +{len(source_diff['added'])} novas | "
+              f"~{len(source_diff['changed'])} alteradas | -{len(source_diff['removed'])} removidas")
+    elif flat_existing:
+        print(f"  • Sem manifesto ({manifest_file.name}): usando comparação com o original")
     print(f"  • Strings para traduzir (novas/modificadas): {len(to_translate)}")
     print(f"  • Já em cache: {cached_count}")
     print(f"  • Precisam tradução: {to_translate_count}")
@@ -859,6 +1812,9 @@ def main():
         print("\n" + "=" * 70)
         print("🧪 MODO DRY-RUN (não salvará arquivo)")
         print("=" * 70)
+        if not has_openai_key():
+            print("🔑 Sem OPENAI_API_KEY: só a análise acima, nenhuma string foi enviada à API")
+            return
     
 
     start_time = time.time()
@@ -1075,118 +2031,22 @@ def main():
 
     for key, existing_value in flat_existing.items():
 
-        original_entry = next((e for e in flat_base if e["key"] == key), None)
+        original_entry = flat_base_map.get(key)
         if original_entry:
             original_value = original_entry["value"]
 
 
-            if (existing_value != original_value and 
+            # Com manifesto, chaves inalteradas mantêm a tradução existente mesmo se igual ao original
+            if ((existing_value != original_value or source_diff is not None) and 
                 existing_value != DEFAULT_ON_FAILURE and 
                 key not in translated_dict):
                 translated_dict[key] = existing_value
     
 
     print("\n🔍 Validando traduções finais...")
-    final_errors = 0
-    placeholder_errors_final = []
-    
-
-    missing_keys = []
-    for entry in flat_base:
-        key = entry["key"]
-        if isinstance(entry["value"], str) and len(entry["value"]) > 0:
-            if key not in translated_dict or not translated_dict[key] or len(translated_dict[key]) == 0:
-                missing_keys.append(key)
-    
-    if missing_keys:
-        print(f"⚠️  {len(missing_keys)} chaves sem tradução válida, tentando retraduzir...")
-        
-
-        for key in missing_keys:
-            entry = next((e for e in flat_base if e["key"] == key), None)
-            if not entry:
-                continue
-            
-            try:
-                masked, placeholder_map = mask_placeholders(entry["value"])
-                local_stats = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-                
-
-                translated_masked, retry_tokens = call_openai_single_key(
-                    entry["key"], masked, args["model"], args["target_language"], local_stats
-                )
-                
-
-                if translated_masked and len(translated_masked) > 0:
-                    translated = restore_placeholders(translated_masked, placeholder_map)
-                    
-
-                    if "__PH_" in translated:
-
-                        for ph_item in placeholder_map:
-                            translated = translated.replace(ph_item["token"], ph_item["original"])
-                        
-
-                        if "__PH_" in translated:
-                            if args["verbose"]:
-                                print(f"  ⚠️  Placeholders não restaurados em '{entry['key']}' (retry), marcando como falha")
-                            translated_dict[entry["key"]] = DEFAULT_ON_FAILURE
-                            stats["errors"] = stats.get("errors", 0) + 1
-                            continue
-                    
-                    translated_dict[entry["key"]] = translated
-                    cache[entry["value"]] = translated
-                    
-
-                    stats["total_prompt_tokens"] = stats.get("total_prompt_tokens", 0) + retry_tokens["prompt_tokens"]
-                    stats["total_completion_tokens"] = stats.get("total_completion_tokens", 0) + retry_tokens["completion_tokens"]
-                    stats["total_tokens"] = stats.get("total_tokens", 0) + retry_tokens["total_tokens"]
-                    stats["api_calls"] = stats.get("api_calls", 0) + 1
-                    stats["translated"] = stats.get("translated", 0) + 1
-                    
-                    if args["verbose"]:
-                        print(f"  ✓ Retraduzido: {entry['key']}")
-                else:
-
-                    translated_dict[entry["key"]] = DEFAULT_ON_FAILURE
-                    stats["errors"] = stats.get("errors", 0) + 1
-                    if args["verbose"]:
-                        print(f"  ❌ Falha ao retraduzir: {entry['key']}")
-            except Exception as e:
-
-                translated_dict[entry["key"]] = DEFAULT_ON_FAILURE
-                stats["errors"] = stats.get("errors", 0) + 1
-                if args["verbose"]:
-                    print(f"  ❌ Erro ao retraduzir {entry['key']}: {e}")
-    
-
-    for entry in flat_base:
-        key = entry["key"]
-        if isinstance(entry["value"], str) and len(entry["value"]) > 0:
-
-            if key not in translated_dict:
-                translated_dict[key] = DEFAULT_ON_FAILURE
-                final_errors += 1
-            elif not translated_dict[key] or len(translated_dict[key]) == 0:
-                translated_dict[key] = DEFAULT_ON_FAILURE
-                final_errors += 1
-            elif "__PH_" in translated_dict[key]:
-
-                placeholder_errors_final.append(key)
-                original_value = entry["value"]
-                masked, placeholder_map = mask_placeholders(original_value)
-                
-
-                restored_value = restore_placeholders(translated_dict[key], placeholder_map)
-                
-
-                if "__PH_" in restored_value:
-                    if args["verbose"]:
-                        print(f"  ⚠️  Placeholders não restaurados em '{key}', marcando como falha")
-                    translated_dict[key] = DEFAULT_ON_FAILURE
-                    final_errors += 1
-                else:
-                    translated_dict[key] = restored_value
+    final_errors, placeholder_errors_final = repair_translations(
+        flat_base, translated_dict, cache, args["model"], args["target_language"], stats, args["verbose"]
+    )
     
     if final_errors > 0:
         print(f"⚠️  AVISO: {final_errors} chaves não puderam ser traduzidas e foram marcadas como '{DEFAULT_ON_FAILURE}'.")
@@ -1277,6 +2137,12 @@ def main():
         print(f"❌ Erro ao salvar arquivo: {e}")
         sys.exit(1)
     
+    try:
+        save_source_manifest(manifest_file, source_manifest, input_path.name)
+        print(f"✓ Manifesto salvo: {manifest_file}")
+    except Exception as e:
+        print(f"⚠️  Erro ao salvar manifesto: {e}")
+    
     print("\n" + "=" * 70)
     print("🎉 PROCESSO FINALIZADO COM SUCESSO!")
     print("=" * 70)
@@ -1286,7 +2152,12 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        cli_args = parse_args()
+        if cli_args["profile"] and cli_args["input_file"]:
+            from profiling import run_profiled
+            run_profiled(main, get_profile_base(cli_args), cli_args["profile_memory"])
+        else:
+            main()
     except KeyboardInterrupt:
         print("\n\nInterrompido pelo usuário")
         sys.exit(1)
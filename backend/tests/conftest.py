@@ -0,0 +1,17 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Os módulos leem os caminhos de estado no import: os testes não podem escrever em output/ do repositório
+_state_dir = Path(tempfile.mkdtemp(prefix="json-translator-tests-"))
+for name, relative in (
+    ("TELEMETRY_DB_PATH", ".telemetry.db"),
+    ("API_CACHE_DIR", ".cache"),
+    ("JOB_CHECKPOINT_DIR", ".checkpoints"),
+    ("JOB_STORE_PATH", ".jobs.db"),
+    ("RESULT_SPILL_DIR", ".results"),
+    ("JOB_TRACE_DIR", ".traces"),
+    ("JOB_PROFILE_DIR", ".profiles"),
+    ("COMPARE_CACHE_PATH", ".compare.db"),
+):
+    os.environ[name] = str(_state_dir / relative)
@@ -0,0 +1,79 @@
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import script_openai
+from scripts.script_openai import DEFAULT_ON_FAILURE, build_bundle_outputs, load_json_bundle, plan_bundle_batches
+
+
+def test_plan_translates_each_text_once():
+
+    files = {
+        "menu.json": {"title": "Save", "help": "Open"},
+        "home.json": {"title": "Welcome", "button": "Save"},
+    }
+    plan = plan_bundle_batches(files, {"Open": "Abrir"}, batch_size=10)
+
+    planned = [entry for batch in plan["batches"] for entry in batch]
+    assert sorted(entry["value"] for entry in planned) == ["Save", "Welcome"]
+    # "title" aparece nos dois arquivos com textos diferentes: as chaves do batch não colidem
+    assert len({entry["key"] for entry in planned}) == 2
+    assert plan["value_files"]["Save"] == {"menu.json": 1, "home.json": 1}
+    assert (plan["total_strings"], plan["unique_strings"], plan["to_translate"]) == (4, 3, 2)
+
+
+def test_outputs_mark_untranslated_texts():
+
+    files = {"a.json": {"x": "Save", "y": {"z": "Open"}}, "b.json": {"w": "Open"}}
+    plan = plan_bundle_batches(files, {}, batch_size=10)
+    outputs = build_bundle_outputs(files, plan, {"Save": "Salvar", "Open": "__PH_0__"})
+    assert outputs == {
+        "a.json": {"x": "Salvar", "y": {"z": DEFAULT_ON_FAILURE}},
+        "b.json": {"w": DEFAULT_ON_FAILURE},
+    }
+
+
+def test_zip_bundle_skips_hidden_and_unsafe_entries(tmp_path):
+
+    archive = tmp_path / "locales.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("en/menu.json", '{"a": "Save"}')
+        zf.writestr("__MACOSX/en/._menu.json", "{}")
+        zf.writestr("en/.cache.json", "{}")
+        zf.writestr("../evil.json", "{}")
+        zf.writestr("README.md", "hello")
+    assert load_json_bundle(archive) == {"en/menu.json": {"a": "Save"}}
+
+
+def test_dir_mode_writes_every_file_and_shares_the_cache(tmp_path, monkeypatch, capsys):
+
+    source = tmp_path / "en"
+    (source / "pages").mkdir(parents=True)
+    (source / "menu.json").write_text(json.dumps({"save": "Save", "open": "Open"}), encoding="utf-8")
+    (source / "pages" / "home.json").write_text(json.dumps({"cta": "Save"}), encoding="utf-8")
+    translated = []
+
+    async def translate_batch(batch, cache, target_lang, model, stats, *args):
+        translated.extend(item["value"] for item in batch)
+        for item in batch:
+            cache[item["value"]] = item["value"].upper()
+        return [{"key": item["key"], "translated": item["value"].upper()} for item in batch]
+
+    monkeypatch.setattr(script_openai, "translate_batch_async", translate_batch)
+    args = {
+        "target_language": "pt", "output_file": None, "model": "gpt-4o-mini",
+        "batch_size": 10, "parallel": 1, "verbose": False, "dry_run": False,
+    }
+    script_openai.bundle_mode(args, source)
+
+    assert sorted(translated) == ["Open", "Save"]
+    output = tmp_path / "pt"
+    assert json.loads((output / "menu.json").read_text(encoding="utf-8")) == {"save": "SAVE", "open": "OPEN"}
+    assert json.loads((output / "pages" / "home.json").read_text(encoding="utf-8")) == {"cta": "SAVE"}
+    assert json.loads((tmp_path / ".translate_cache_pt.json").read_text(encoding="utf-8")) == {
+        "Save": "SAVE", "Open": "OPEN",
+    }
+    assert "concluídos" in capsys.readouterr().out
@@ -0,0 +1,133 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import job_checkpoint, translator_service
+from core.job_checkpoint import JobCheckpoint
+
+
+def test_resumed_job_keeps_config(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(job_checkpoint, "CHECKPOINT_DIR", tmp_path)
+    config = {"request_key": "key-resume", "source_filename": "menu.json"}
+    # Plano sem dono vivo: o processo que criou o job morreu
+    JobCheckpoint("job-resume").save_plan({
+        "job_id": "job-resume",
+        "status": "processing",
+        "owner_pid": None,
+        "params": {"target_language": "pt"},
+        "json_data": {"a": "hello"},
+        "batches": [["a"]],
+        "config": config,
+    })
+
+    launched = []
+    try:
+        resumed = translator_service.resume_interrupted_jobs(lambda job, params: launched.append((job, params)))
+        assert resumed == ["job-resume"]
+        job, params = launched[0]
+        assert job.config == config
+        assert params["job_config"] == config
+        # Um pedido idêntico feito depois da reinicialização reaproveita o job retomado
+        assert translator_service.find_duplicate_job("key-resume") is job
+    finally:
+        translator_service.release_job("job-resume")
+        translator_service.delete_job("job-resume")
+
+
+def test_resumed_bundle_job_gets_its_files(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(job_checkpoint, "CHECKPOINT_DIR", tmp_path)
+    files = {"menu.json": {"a": "hello"}, "home.json": {"b": "world"}}
+    JobCheckpoint("job-bundle").save_plan({
+        "job_id": "job-bundle",
+        "status": "processing",
+        "owner_pid": None,
+        "params": {"target_language": "pt"},
+        "files": files,
+        "config": None,
+    })
+
+    launched = []
+    try:
+        translator_service.resume_interrupted_jobs(lambda job, params: launched.append(params))
+        assert launched[0]["files"] == files
+        assert "json_data" not in launched[0]
+        assert translator_service.get_job_runner(launched[0]) is translator_service.translate_bundle_async
+    finally:
+        translator_service.release_job("job-bundle")
+        translator_service.delete_job("job-bundle")
+
+
+def test_cancel_after_job_finished_leaves_no_orphan(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(job_checkpoint, "CHECKPOINT_DIR", tmp_path)
+    job = translator_service.create_job("job-race")
+    try:
+        # O pedido chega com o job ainda "processing", mas ele termina (e limpa o checkpoint) durante a escrita
+        original_request = JobCheckpoint.request_cancel
+
+        def request_then_finish(self, keep_partial=True):
+            original_request(self, keep_partial)
+            job.status = "completed"
+
+        monkeypatch.setattr(JobCheckpoint, "request_cancel", request_then_finish)
+        job.status = "processing"
+        translator_service.request_job_cancel("job-race")
+        assert not (tmp_path / "job-race").exists()
+    finally:
+        translator_service.release_job("job-race")
+        translator_service.delete_job("job-race")
+
+
+def test_stale_cancel_markers_are_removed_on_resume(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(job_checkpoint, "CHECKPOINT_DIR", tmp_path)
+    JobCheckpoint("job-old").request_cancel()
+    JobCheckpoint("job-queued").request_cancel()
+    old = time.time() - job_checkpoint.ORPHAN_CANCEL_SECONDS - 10
+    os.utime(tmp_path / "job-old" / job_checkpoint.CANCEL_FILE, (old, old))
+
+    assert translator_service.resume_interrupted_jobs(lambda job, params: None) == []
+    assert not (tmp_path / "job-old").exists()
+    # Recente: pode ser de um job ainda na fila de outro processo
+    assert (tmp_path / "job-queued").exists()
+
+
+def test_journal_replays_cache_and_batches(tmp_path):
+
+    checkpoint = JobCheckpoint("job-journal", directory=tmp_path)
+    cache = job_checkpoint.CheckpointedCache(checkpoint, {"Hi": "Oi"})
+    cache["Hello"] = "Olá"
+    # Valor repetido não gera nova linha no journal
+    cache["Hi"] = "Oi"
+    checkpoint.record_batch(1, [{"key": "a", "translated": "Olá"}], {"api_calls": 1})
+    checkpoint.close()
+
+    # Crash no meio da escrita: a última linha fica truncada e é ignorada
+    with open(checkpoint.journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"t": "batch", "n": 2, "r": [["b"')
+
+    state = JobCheckpoint("job-journal", directory=tmp_path).load_journal()
+    assert state["cache"] == {"Hello": "Olá"}
+    assert state["batches"] == {1: [{"key": "a", "translated": "Olá"}]}
+    assert state["stats"] == {"api_calls": 1}
+    assert len(checkpoint.journal_path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_claim_skips_jobs_with_live_owner(tmp_path):
+
+    JobCheckpoint("job-alive", directory=tmp_path).save_plan({
+        "job_id": "job-alive", "status": "processing", "owner_pid": os.getpid(),
+    })
+    JobCheckpoint("job-dead", directory=tmp_path).save_plan({
+        "job_id": "job-dead", "status": "processing", "owner_pid": None,
+    })
+
+    claimed = [checkpoint.job_id for checkpoint in job_checkpoint.claim_interrupted_checkpoints(tmp_path)]
+    assert claimed == ["job-dead"]
+    # Já reivindicado: outro worker que reiniciar junto não retoma o mesmo job
+    assert job_checkpoint.claim_interrupted_checkpoints(tmp_path) == []
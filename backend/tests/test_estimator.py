@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.estimator import (
+    DEFAULT_LATENCY,
+    estimate_translation_plan,
+    heuristic_token_count,
+    plan_calls,
+    schedule_batches,
+)
+
+
+def test_schedule_fills_parallel_slots_in_plan_order():
+
+    assert schedule_batches([3, 1, 1, 1], parallel=2) == 3
+    assert schedule_batches([1, 1, 1, 1], parallel=1) == 4
+    # Slots ocupados por batches em andamento entram na conta
+    assert schedule_batches([1], parallel=2, busy=[5, 0]) == 5
+
+
+def test_plan_skips_cache_hits_and_repeats_from_earlier_batches():
+
+    entries = [{"key": f"k{i}", "value": value} for i, value in enumerate(["Save", "Open", "Save", "Close", "Save"])]
+    cache = {"Close": "Fechar", "Open": "__PH_0__"}
+
+    # Um batch por vez: o terceiro "Save" já encontra a tradução do primeiro batch
+    batches, cached = plan_calls(entries, cache, batch_size=2, parallel=1)
+    assert cached == 3
+    assert [sorted(b["grouped"].values()) for b in batches] == [["Open", "Save"], [], []]
+
+    # Batches simultâneos não enxergam as traduções uns dos outros
+    batches, cached = plan_calls(entries, cache, batch_size=2, parallel=2)
+    assert cached == 2
+    assert sorted(batches[1]["grouped"].values()) == ["Save"]
+
+
+def test_estimate_shrinks_with_cache_and_brackets_the_expected_value():
+
+    data = {f"key{i}": f"Please save the document number {i} before closing" for i in range(30)}
+    cold = estimate_translation_plan(data, "pt", model="gpt-4o-mini", batch_size=10, parallel=2, latency=DEFAULT_LATENCY)
+    cache = {value: "tradução" for value in list(data.values())[:20]}
+    warm = estimate_translation_plan(
+        data, "pt", model="gpt-4o-mini", batch_size=10, parallel=2, cache=cache, latency=DEFAULT_LATENCY,
+    )
+
+    assert cold["strings_to_translate"] == 30 and warm["strings_to_translate"] == 10
+    assert warm["cached_strings"] == 20
+    assert warm["api_calls"] < cold["api_calls"]
+    assert warm["estimated_cost_usd"] < cold["estimated_cost_usd"]
+    for name, expected in (("tokens_input", "estimated_tokens_input"), ("tokens_output", "estimated_tokens_output")):
+        low, high = cold["range"][name]
+        assert low <= cold[expected] <= high
+    assert cold["latency_model"]["source"] == "custom"
+
+
+def test_google_estimate_is_free_and_limits_parallelism():
+
+    estimate = estimate_translation_plan({"a": "Save", "b": "Open"}, "pt", method="google", parallel=8,
+                                         latency={"intercept": 1.0, "per_input_token": 0.0, "per_output_token": 0.0})
+    assert estimate["estimated_cost_usd"] == 0.0
+    assert estimate["api_calls"] == 2
+    assert estimate["parallel"] == 2
+
+
+def test_heuristic_token_count_grows_with_non_ascii_text():
+
+    assert heuristic_token_count("hello world") == 2
+    assert heuristic_token_count("ação") > heuristic_token_count("acao")
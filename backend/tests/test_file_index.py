@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.file_index import FileIndex
+
+
+def write(path: Path, data) -> None:
+
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_in_place_rewrite_is_detected(tmp_path):
+
+    write(tmp_path / "a_pt.json", {"x": "1"})
+    index = FileIndex(tmp_path)
+    assert index.entries()["a_pt.json"]["keys"] == 1
+
+    # Mesmo diretório (mtime do diretório inalterado), conteúdo novo
+    dir_mtime = tmp_path.stat().st_mtime_ns
+    write(tmp_path / "a_pt.json", {"x": "1", "y": "2", "z": "3"})
+    os.utime(tmp_path, ns=(dir_mtime, dir_mtime))
+    assert index.entries()["a_pt.json"]["keys"] == 3
+    assert FileIndex(tmp_path).entries()["a_pt.json"]["keys"] == 3
+
+
+def test_invalid_file_is_skipped_until_it_changes(tmp_path):
+
+    (tmp_path / "bad_pt.json").write_text("{not json", encoding="utf-8")
+    index = FileIndex(tmp_path)
+    assert index.entries() == {}
+    write(tmp_path / "bad_pt.json", {"fixed": "yes"})
+    assert "bad_pt.json" in index.entries()
+
+
+def test_missing_sort_values_always_last(tmp_path):
+
+    index = FileIndex(tmp_path, detect_language=lambda name: name.split("_")[0] if "_" in name else None)
+    for name in ("pt_a.json", "nolang.json", "es_b.json"):
+        write(tmp_path / name, {"k": "v"})
+    for order in ("asc", "desc"):
+        entries, total = index.query(sort="language_code", order=order)
+        assert total == 3
+        assert entries[-1]["filename"] == "nolang.json"
+    entries, _ = index.query(sort="language_code", order="asc")
+    assert [e["language_code"] for e in entries[:2]] == ["es", "pt"]
@@ -0,0 +1,87 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.file_offsets import FileOffsetIndex, build_pointer, parse_pointer, scan_offsets
+from scripts.script_openai import flatten_object
+
+
+DOCUMENT = {
+    "menu": {"save": "Salvar", "open": "Abrir \"já\"", "a/b": {"c~d": "Ação"}},
+    "items": ["um", {"x": "dois"}],
+    "count": 3,
+    "empty": {},
+    "home": {"title": "Início", "nested": {"deep": None}},
+}
+
+
+def write_document(directory: Path, data=DOCUMENT, name: str = "pt.json") -> None:
+
+    (directory / name).write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def test_scan_matches_flatten_object():
+
+    buf = json.dumps(DOCUMENT, ensure_ascii=False).encode("utf-8")
+    leaves, _ = scan_offsets(buf)
+    expected = flatten_object(DOCUMENT)
+    assert [key for key, _, _ in leaves] == [e["key"] for e in expected]
+    assert [json.loads(buf[start:end]) for _, start, end in leaves] == [e["value"] for e in expected]
+
+
+def test_pointer_round_trip():
+
+    tokens = ["menu", "a/b", "c~d"]
+    assert build_pointer(tokens) == "/menu/a~1b/c~0d"
+    assert parse_pointer(build_pointer(tokens)) == tokens
+    with pytest.raises(ValueError):
+        parse_pointer("menu")
+
+
+def test_subtree_reads_nodes_by_pointer(tmp_path):
+
+    write_document(tmp_path)
+    index = FileOffsetIndex(tmp_path)
+    assert index.subtree("pt.json", "") == DOCUMENT
+    assert index.subtree("pt.json", "/menu/a~1b") == {"c~d": "Ação"}
+    # Dentro de uma lista-valor: lê a lista e desce o resto em memória
+    assert index.subtree("pt.json", "/items/1/x") == "dois"
+    with pytest.raises(KeyError):
+        index.subtree("pt.json", "/menu/missing")
+
+
+def test_entries_are_paged_in_document_order(tmp_path):
+
+    write_document(tmp_path)
+    index = FileOffsetIndex(tmp_path)
+    keys = [e["key"] for e in flatten_object(DOCUMENT)]
+
+    page, total = index.entries("pt.json", page=2, page_size=3)
+    assert total == len(keys)
+    assert [e["key"] for e in page] == keys[3:6]
+
+    page, total = index.entries("pt.json", pointer="/menu")
+    assert total == 3
+    assert page[1] == {"key": "menu.open", "value": "Abrir \"já\""}
+
+    page, total = index.entries("pt.json", prefix="home.")
+    assert [e["key"] for e in page] == ["home.title", "home.nested.deep"]
+    assert index.entries("pt.json", pointer="/count") == ([], 0)
+
+
+def test_rewritten_file_is_reindexed(tmp_path):
+
+    write_document(tmp_path)
+    index = FileOffsetIndex(tmp_path)
+    assert index.subtree("pt.json", "/menu/save") == "Salvar"
+
+    write_document(tmp_path, {"menu": {"save": "Guardar novamente"}})
+    assert index.subtree("pt.json", "/menu/save") == "Guardar novamente"
+    assert index.entries("pt.json")[1] == 1
+
+    index.remove("pt.json")
+    assert index._query("SELECT COUNT(*) FROM files")[0][0] == 0
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import api
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+
+    # output/ é relativo ao diretório atual
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "output").mkdir()
+    return TestClient(api.app)
+
+
+def write_output(name: str, content: str) -> None:
+
+    Path("output", name).write_text(content, encoding="utf-8")
+
+
+def test_valid_file_is_wrapped_in_envelope(client):
+
+    write_output("ok_pt.json", '{"a": {"b": "olá"}}')
+    response = client.get("/api/files/ok_pt.json")
+    assert response.status_code == 200
+    assert response.json() == {"success": True, "filename": "ok_pt.json", "data": {"a": {"b": "olá"}}}
+
+
+@pytest.mark.parametrize("content", ['{not json}', '{"a": "b"', '{"a": "b"} {"c": 1}'])
+def test_corrupt_file_returns_400(client, content):
+
+    write_output("corrupt_pt.json", content)
+    response = client.get("/api/files/corrupt_pt.json")
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Arquivo JSON inválido")
+
+
+@pytest.mark.parametrize("content", ['{not json}', '{"a": "b"', '{"a": "b"} {"c": 1}'])
+def test_corrupt_large_file_returns_400(client, monkeypatch, content):
+
+    # Acima do limite o arquivo é transmitido em streaming e validado pelo índice de offsets
+    monkeypatch.setattr(api, "FILE_STREAM_THRESHOLD", 0)
+    write_output("corrupt_large_pt.json", content)
+    response = client.get("/api/files/corrupt_large_pt.json")
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Arquivo JSON inválido")
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_envelope_in_each_encoding(client, encoding):
+
+    # identity é descomprimido fora do event loop; gzip sai direto da variante em memória
+    write_output("enc_pt.json", '{"a": "olá"}')
+    response = client.get("/api/files/enc_pt.json", headers={"Accept-Encoding": encoding})
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding", "identity") == encoding
+    assert response.json()["data"] == {"a": "olá"}
+
+
+def test_unchanged_file_answers_304(client):
+
+    write_output("cached_pt.json", '{"a": "b"}')
+    first = client.get("/api/files/cached_pt.json")
+    etag = first.headers["etag"]
+    second = client.get("/api/files/cached_pt.json", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
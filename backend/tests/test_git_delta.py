@@ -0,0 +1,96 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import script_openai
+
+
+def git(repo: Path, *args: str) -> None:
+
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True, capture_output=True,
+    )
+
+
+def delta_args(**overrides) -> dict:
+
+    args = {
+        "git_base": "HEAD", "locales": ["pt", "es"], "target_language": "pt", "target_pattern": None,
+        "model": "gpt-4o-mini", "batch_size": 10, "parallel": 1, "verbose": False, "dry_run": False,
+    }
+    args.update(overrides)
+    return args
+
+
+def write_json(path: Path, data: dict) -> None:
+
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_read_git_revision(tmp_path):
+
+    git(tmp_path, "init", "-q")
+    source = tmp_path / "en.json"
+    write_json(source, {"a": "Hello"})
+    git(tmp_path, "add", "en.json")
+    git(tmp_path, "commit", "-q", "-m", "base")
+
+    assert script_openai.read_git_revision(source, "HEAD") == {"a": "Hello"}
+    # Arquivo que não existe no commit: tudo é delta
+    assert script_openai.read_git_revision(tmp_path / "new.json", "HEAD") is None
+
+
+def test_git_delta_translates_only_changes_per_locale(tmp_path, monkeypatch):
+
+    git(tmp_path, "init", "-q")
+    source = tmp_path / "en.json"
+    write_json(source, {"a": "Hello", "b": "Save", "old": "Gone"})
+    git(tmp_path, "add", "en.json")
+    git(tmp_path, "commit", "-q", "-m", "base")
+
+    # b mudou, c é nova, old saiu; pt está em dia com o commit, es ainda não tem a chave a
+    write_json(source, {"a": "Hello", "b": "Save all", "c": "Cancel"})
+    write_json(tmp_path / "pt.json", {"a": "Olá", "b": "Salvar", "old": "Sumiu"})
+    write_json(tmp_path / "es.json", {"b": "Guardar"})
+
+    requested = {}
+
+    async def translate_entries(entries, cache, target_lang, model, stats, *args):
+        requested[target_lang] = sorted(e["key"] for e in entries)
+        return {e["key"]: f"{target_lang}:{e['value']}" for e in entries}
+
+    monkeypatch.setattr(script_openai, "translate_entries_async", translate_entries)
+
+    script_openai.git_delta_mode(delta_args(), source)
+
+    assert requested == {"pt": ["b", "c"], "es": ["a", "b", "c"]}
+    assert json.loads((tmp_path / "pt.json").read_text(encoding="utf-8")) == {
+        "a": "Olá", "b": "pt:Save all", "c": "pt:Cancel",
+    }
+    assert json.loads((tmp_path / "es.json").read_text(encoding="utf-8")) == {
+        "a": "es:Hello", "b": "es:Save all", "c": "es:Cancel",
+    }
+    assert script_openai.get_manifest_path(tmp_path / "pt.json").exists()
+
+
+def test_git_delta_dry_run_writes_nothing(tmp_path, monkeypatch):
+
+    git(tmp_path, "init", "-q")
+    source = tmp_path / "en.json"
+    write_json(source, {"a": "Hello"})
+    git(tmp_path, "add", "en.json")
+    git(tmp_path, "commit", "-q", "-m", "base")
+    write_json(source, {"a": "Hello", "b": "Save"})
+
+    async def translate_entries(entries, cache, target_lang, model, stats, *args):
+        return {e["key"]: "x" for e in entries}
+
+    monkeypatch.setattr(script_openai, "translate_entries_async", translate_entries)
+
+    script_openai.git_delta_mode(delta_args(locales=["pt"], dry_run=True), source)
+
+    assert not (tmp_path / "en_pt.json").exists()
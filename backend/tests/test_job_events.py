@@ -0,0 +1,70 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import job_events
+
+
+def test_events_between_reads_are_delivered_together():
+
+    stream = job_events.subscribe("job-events")
+    try:
+        job_events.publish("job-events", "batch", {"batch": 1})
+        job_events.publish("job-events", "batch", {"batch": 2})
+        job_events.publish("other-job", "batch", {"batch": 9})
+
+        assert stream.drain() == {
+            "events": [{"type": "batch", "batch": 1}, {"type": "batch", "batch": 2}],
+            "dropped": 0,
+        }
+        assert stream.drain() == {"events": [], "dropped": 0}
+    finally:
+        job_events.unsubscribe(stream)
+    assert "job-events" not in job_events._subscribers
+
+
+def test_slow_subscriber_keeps_latest_events(monkeypatch):
+
+    monkeypatch.setattr(job_events, "MAX_PENDING_EVENTS", 3)
+    stream = job_events.subscribe("job-slow")
+    try:
+        for batch in range(5):
+            job_events.publish("job-slow", "batch", {"batch": batch})
+        drained = stream.drain()
+        assert [event["batch"] for event in drained["events"]] == [2, 3, 4]
+        assert drained["dropped"] == 2
+    finally:
+        job_events.unsubscribe(stream)
+
+
+def test_wait_wakes_on_publish():
+
+    async def scenario():
+        stream = job_events.subscribe("job-wait")
+        try:
+            # Sem eventos: espera até o timeout
+            assert not await stream.wait(0.01)
+            asyncio.get_running_loop().call_soon(job_events.publish, "job-wait", "completed")
+            assert await stream.wait(1)
+            assert stream.drain()["events"] == [{"type": "completed"}]
+        finally:
+            job_events.unsubscribe(stream)
+
+    asyncio.run(scenario())
+
+
+def test_forwarder_replaces_local_delivery(monkeypatch):
+
+    forwarded = []
+    monkeypatch.setattr(job_events, "_listeners", [])
+    stream = job_events.subscribe("job-worker")
+    job_events.set_forwarder(lambda job_id, event: forwarded.append((job_id, event)))
+    try:
+        job_events.publish("job-worker", "batch", {"batch": 1})
+        assert forwarded == [("job-worker", {"type": "batch", "batch": 1})]
+        assert stream.drain()["events"] == []
+    finally:
+        job_events.set_forwarder(None)
+        job_events.unsubscribe(stream)
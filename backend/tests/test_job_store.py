@@ -0,0 +1,143 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.job_store import JobStore, SQLiteJobStore, RESULT_SPILL_MIN_BYTES
+from core.payload_cache import SpilledPayload, encode_json_payload
+from core.translator_service import TranslationJob
+
+
+def finished_job(job_id: str, data=None, end_time=None) -> TranslationJob:
+
+    job = TranslationJob(job_id)
+    job.status = "completed"
+    job.end_time = end_time if end_time is not None else time.time()
+    if data is not None:
+        job.result_payload = encode_json_payload({"data": data})
+    return job
+
+
+def big_result() -> dict:
+
+    # Texto pouco compressível: o corpo gzip passa do mínimo para despejo
+    return {f"k{i}": f"{i * 7919:x}-{i * 104729:x}-{i ** 3:x}" for i in range(RESULT_SPILL_MIN_BYTES // 8)}
+
+
+def test_expired_jobs_are_dropped(tmp_path):
+
+    store = JobStore(ttl_seconds=60, spill_dir=tmp_path)
+    store.add(finished_job("old", end_time=time.time() - 120))
+    store.add(finished_job("new"))
+    running = TranslationJob("running")
+    running.status = "processing"
+    store.add(running)
+    assert store.get("old") is None
+    assert store.get("new") is not None
+    assert store.get("running") is running
+
+
+def test_least_recently_used_finished_jobs_are_evicted(tmp_path):
+
+    store = JobStore(max_finished=2, spill_dir=tmp_path)
+    for job_id in ("a", "b"):
+        store.add(finished_job(job_id))
+    store.get("a")
+    store.add(finished_job("c"))
+    assert "b" not in store
+    assert "a" in store and "c" in store
+
+
+def test_large_results_spill_to_disk_over_budget(tmp_path):
+
+    store = JobStore(memory_budget_bytes=1, spill_dir=tmp_path)
+    data = big_result()
+    job = finished_job("big", data)
+    store.add(job)
+    assert isinstance(job.result_payload, SpilledPayload)
+    assert store.memory_usage(job) == 0
+    # O resultado continua disponível, lido do disco
+    assert store.get("big").result_payload.body().startswith(b'{"data"')
+    store.delete("big")
+    assert not list(tmp_path.iterdir())
+
+
+def test_memory_usage_counts_result_data_kept_with_payload(tmp_path):
+
+    store = JobStore(spill_dir=tmp_path)
+    job = finished_job("j", {"a": "b" * 1000})
+    compressed_only = store.memory_usage(job)
+    assert compressed_only == job.result_payload.compressed_size
+    job.result_data = {"a": "b" * 1000}
+    assert store.memory_usage(job) == compressed_only + job.result_payload.size
+
+
+def test_sqlite_store_is_shared_between_workers(tmp_path):
+
+    path = tmp_path / "jobs.db"
+    owner = SQLiteJobStore(TranslationJob, path=path)
+    other = SQLiteJobStore(TranslationJob, path=path)
+
+    job = TranslationJob("shared")
+    job.status = "processing"
+    job.config = {"request_key": "key-shared"}
+    owner.add(job)
+    assert owner.get("shared") is job
+    # O outro worker reconstrói o job a partir da linha do banco
+    assert other.get("shared").status == "processing"
+    assert other.find_by_request_key("key-shared").job_id == "shared"
+
+    job.status = "completed"
+    job.end_time = time.time()
+    job.result_payload = encode_json_payload({"data": {"a": "Olá"}})
+    owner.save(job)
+    assert not owner.is_local("shared")
+    rebuilt = other.get("shared")
+    assert rebuilt.status == "completed"
+    assert rebuilt.result_payload.body() == job.result_payload.body()
+
+
+def test_sqlite_store_delete_is_seen_by_owner(tmp_path):
+
+    path = tmp_path / "jobs.db"
+    owner = SQLiteJobStore(TranslationJob, path=path)
+    other = SQLiteJobStore(TranslationJob, path=path)
+    job = TranslationJob("gone")
+    job.status = "processing"
+    owner.add(job)
+
+    assert other.delete("gone")
+    assert other.get("gone") is None
+    # O dono nota a exclusão na próxima gravação e não recria a linha
+    owner.save(job)
+    assert not owner.is_local("gone")
+    assert len(owner) == 0
+
+
+def test_sqlite_store_drops_expired_and_oldest_finished(tmp_path):
+
+    store = SQLiteJobStore(TranslationJob, path=tmp_path / "jobs.db", ttl_seconds=60, max_finished=2)
+    store.add(finished_job("expired", end_time=time.time() - 120))
+    assert store.get("expired") is None
+    for job_id in ("a", "b", "c"):
+        store.add(finished_job(job_id))
+        time.sleep(0.01)
+    assert store.get("a") is None
+    assert store.get("b") is not None and store.get("c") is not None
+
+
+def test_find_by_request_key_skips_jobs_that_cannot_answer(tmp_path):
+
+    store = JobStore(spill_dir=tmp_path)
+    with_result = finished_job("done", {"a": "Olá"})
+    without_result = finished_job("empty")
+    failed = finished_job("failed", {"a": "Olá"})
+    failed.status = "failed"
+    for job in (with_result, without_result, failed):
+        job.config = {"request_key": "same"}
+        store.add(job)
+
+    assert store.find_by_request_key("same") is with_result
+    store.delete("done")
+    assert store.find_by_request_key("same") is None
@@ -0,0 +1,72 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.json_compare import CompareCache, diff_documents
+
+
+def by_status(entries):
+
+    grouped = {}
+    for entry in entries:
+        grouped.setdefault(entry["status"], []).append(entry)
+    return grouped
+
+
+def test_diff_classifies_every_leaf():
+
+    left = {"a": "Save", "b": "Open", "c": "", "d": 1, "e": "Gone", "list": [1, 2]}
+    right = {"a": "Save", "b": "Abrir", "c": "x", "d": "1", "f": "New", "list": [1, 2]}
+    grouped = by_status(diff_documents(left, right))
+
+    assert [e["path"] for e in grouped["unchanged"]] == ["a", "list"]
+    assert [e["path"] for e in grouped["emptyValue"]] == ["c"]
+    # Mesmo conteúdo com tipo diferente conta como alteração
+    assert {e["path"]: e["newType"] for e in grouped["modified"]} == {"b": "string", "d": "string"}
+    assert [e["path"] for e in grouped["removed"]] == ["e"]
+    assert [e["path"] for e in grouped["added"]] == ["f"]
+
+
+def test_renames_prefer_same_parent_then_same_key_name():
+
+    left = {"menu": {"save": "Save", "dup": "Open"}, "home": {"title": "Welcome"}, "other": {"dup": "Open"}}
+    right = {"menu": {"save_button": "Save", "dup": "Open"}, "pages": {"title": "Welcome"}, "misc": {"dup2": "Open"}}
+    grouped = by_status(diff_documents(left, right))
+
+    renamed = {e["oldPath"]: e["path"] for e in grouped["keyChanged"]}
+    assert renamed == {"menu.save": "menu.save_button", "home.title": "pages.title"}
+    # Mesmo valor, mas nem o pai nem o nome da chave batem: não é renomeação
+    assert [e["path"] for e in grouped["removed"]] == ["other.dup"]
+    assert [e["path"] for e in grouped["added"]] == ["misc.dup2"]
+
+
+def test_empty_values_are_not_rename_evidence():
+
+    grouped = by_status(diff_documents({"a": ""}, {"b": ""}))
+    assert "keyChanged" not in grouped
+    assert grouped["removed"][0]["isEmpty"] and grouped["added"][0]["isEmpty"]
+
+
+def test_compare_cache_reuses_and_pages_results(tmp_path):
+
+    cache = CompareCache(tmp_path / "compare.db", max_results=1)
+    left = json.dumps({f"k{i}": str(i) for i in range(5)}).encode("utf-8")
+    right = json.dumps({**{f"k{i}": str(i) for i in range(5)}, "k0": "zero", "new": "x"}).encode("utf-8")
+
+    summary, cached = cache.compare(left, right, "en.json", "pt.json")
+    assert not cached
+    assert summary["summary"]["modified"] == 1 and summary["summary"]["added"] == 1
+    assert cache.compare(left, right)[1]
+
+    page, total = cache.page(summary["compare_id"], status="unchanged", page=2, page_size=3)
+    assert total == 4
+    assert [e["path"] for e in page] == ["k4"]
+    report = cache.report(summary["compare_id"])
+    assert report["metadata"]["file1"] == "en.json"
+    assert report["differences"]["modified"][0]["newValue"] == "zero"
+
+    # Limite de uma comparação: a anterior sai do cache
+    cache.compare(right, left)
+    assert cache.get(summary["compare_id"]) is None
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import api
+
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def test_api_import_does_not_load_translation_backends():
+
+    # Processo novo: neste, outros testes já podem ter importado as bibliotecas
+    env = {name: value for name, value in os.environ.items() if name != "OPENAI_API_KEY"}
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys; from api import api; print('openai' in sys.modules, 'deep_translator' in sys.modules)"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_openai_job_without_key_is_refused_up_front(monkeypatch):
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client = TestClient(api.app)
+    assert client.get("/").json()["backends"] == {"openai": False, "google": True}
+
+    response = client.post("/api/translate/start", json={"json_data": {"a": "hello"}, "target_language": "pt"})
+    assert response.status_code == 503
+    assert "OPENAI_API_KEY" in response.json()["detail"]
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.metrics import Counter, Gauge, Histogram, Metric, Registry
+
+
+def worker_and_api_registries():
+
+    registries = []
+    for _ in range(2):
+        registry = Registry()
+        registry.register(Counter("calls_total", "Chamadas.", ("model",)))
+        registry.register(Histogram("batch_seconds", "Batches.", buckets=(1.0, 5.0)))
+        registry.register(Gauge("depth", "Fila.", callback=lambda: 3))
+        registries.append(registry)
+    return registries
+
+
+def test_metric_without_samples_cannot_be_instantiated():
+
+    class Incomplete(Metric):
+        kind = "counter"
+
+    with pytest.raises(TypeError):
+        Incomplete("x", "y")
+
+
+def test_worker_deltas_merge_into_api_registry():
+
+    worker, api = worker_and_api_registries()
+    calls = worker._metrics["calls_total"]
+    seconds = worker._metrics["batch_seconds"]
+    calls.inc(2, "gpt-4o-mini")
+    seconds.observe(0.5)
+    seconds.observe(3.0)
+
+    api.merge(worker.delta())
+    # Só o que mudou desde o último envio vai de novo: nada é somado duas vezes
+    calls.inc(1, "gpt-4o-mini")
+    api.merge(worker.delta())
+    assert worker.delta() == {}
+
+    text = api.render()
+    assert 'calls_total{model="gpt-4o-mini"} 3' in text
+    assert 'batch_seconds_bucket{le="1"} 1' in text
+    assert 'batch_seconds_bucket{le="5"} 2' in text
+    assert 'batch_seconds_bucket{le="+Inf"} 2' in text
+    assert "batch_seconds_sum 3.5" in text
+    # Gauge com callback é lido no processo que renderiza, não enviado pelos workers
+    assert "depth" not in worker.delta()
+    assert "depth 3" in text
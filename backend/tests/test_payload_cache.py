@@ -0,0 +1,63 @@
+import gzip
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.payload_cache import (
+    encode_json_payload,
+    etag_matches,
+    iter_compressed,
+    negotiate_encoding,
+)
+
+
+DATA = {"success": True, "data": {"menu": {"save": "Salvar", "open": "Abrir"}}}
+
+
+def test_payload_is_serialized_once_and_decodes_back():
+
+    payload = encode_json_payload(DATA)
+    assert json.loads(payload.body()) == DATA
+    assert payload.encoded("identity") == payload.body()
+    assert gzip.decompress(payload.encoded("gzip")) == payload.body()
+    # Mesmo conteúdo, mesma ETag
+    assert encode_json_payload(DATA).etag == payload.etag
+    assert encode_json_payload({**DATA, "success": False}).etag != payload.etag
+
+
+def test_spilled_payload_streams_the_same_body(tmp_path):
+
+    payload = encode_json_payload(DATA)
+    spilled = payload.spill(tmp_path / "job.json.gz")
+    assert spilled.etag == payload.etag
+    assert b"".join(spilled.iter_encoded("identity")) == payload.body()
+    assert gzip.decompress(b"".join(spilled.iter_encoded("gzip"))) == payload.body()
+    spilled.remove()
+    assert not (tmp_path / "job.json.gz").exists()
+
+
+def test_streaming_compression_round_trips():
+
+    chunks = [b'{"a":', b'"b"}']
+    assert gzip.decompress(b"".join(iter_compressed(chunks, "gzip"))) == b'{"a":"b"}'
+    assert b"".join(iter_compressed(chunks, "identity")) == b'{"a":"b"}'
+
+
+def test_encoding_negotiation():
+
+    assert negotiate_encoding(None) == "identity"
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") == "identity"
+    assert negotiate_encoding("*") == "gzip"
+    assert negotiate_encoding("deflate") == "identity"
+
+
+def test_etag_matching_ignores_weak_prefix():
+
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"other"', '"abc"')
+    assert not etag_matches(None, '"abc"')
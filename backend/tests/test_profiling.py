@@ -0,0 +1,47 @@
+import pstats
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.profiling import RunProfiler, run_profiled
+
+
+def busy_work() -> int:
+
+    return sum(len(str(i)) for i in range(20000))
+
+
+def test_only_one_run_is_profiled_at_a_time():
+
+    first = RunProfiler()
+    second = RunProfiler()
+    assert first.start()
+    try:
+        # cProfile e tracemalloc não admitem duas medições ao mesmo tempo
+        assert not second.start()
+        second.stop()
+    finally:
+        first.stop()
+    assert second.start()
+    second.stop()
+
+
+def test_profile_files_are_written(tmp_path, capsys):
+
+    assert run_profiled(busy_work, tmp_path / "pt.json", memory=True) == busy_work()
+
+    stats = pstats.Stats(str(tmp_path / "pt.json.prof"))
+    assert any(name == "busy_work" for _, _, name in stats.stats)
+    assert "Tempo total" in (tmp_path / "pt.json.prof.txt").read_text(encoding="utf-8")
+    assert "Pico de memória" in (tmp_path / "pt.json.alloc.txt").read_text(encoding="utf-8")
+    assert "python -m pstats" in capsys.readouterr().out
+
+
+def test_cpu_only_profile_has_no_alloc_report(tmp_path):
+
+    profiler = RunProfiler()
+    profiler.start()
+    busy_work()
+    profiler.stop()
+    assert sorted(profiler.save(tmp_path / "job")) == ["pstats", "text"]
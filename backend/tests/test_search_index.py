@@ -0,0 +1,55 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import translation_cache
+from core.file_index import FileIndex
+from core.search_index import SearchIndex, build_match_query
+
+
+def test_match_query_quotes_terms_and_prefixes_the_last():
+
+    assert build_match_query('salvar "tudo') == '"salvar" """tudo"*'
+    assert build_match_query("abrir", "key") == 'key : ("abrir"*)'
+    assert build_match_query("   ") == ""
+
+
+def test_search_finds_translations_and_their_source(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(translation_cache, "API_CACHE_DIR", tmp_path / "cache")
+    translation_cache.merge_translation_cache("pt", {"Save file": "Salvar arquivo"})
+    index = SearchIndex(tmp_path)
+    data = {"menu": {"save": "Salvar arquivo", "open": "Abrir"}, "count": 2, "flag": True}
+    (tmp_path / "pt.json").write_text(json.dumps(data), encoding="utf-8")
+
+    # Números entram como texto; booleanos e null ficam de fora
+    assert index.index_file("pt.json", data, "pt") == 3
+    results, total = index.search("arq")
+    assert total == 1
+    assert results[0]["key"] == "menu.save"
+    assert results[0]["source"] == "Save file"
+    assert "<mark>" in results[0]["snippet"]
+    # Busca restrita a um campo
+    assert index.search("save", field="source")[1] == 1
+    assert index.search("save", field="value")[1] == 0
+    assert index.search("Abrir", language="es")[1] == 0
+
+
+def test_search_ignores_accents_and_follows_file_changes(tmp_path):
+
+    index = SearchIndex(tmp_path)
+    files = FileIndex(tmp_path)
+    (tmp_path / "pt.json").write_text(json.dumps({"a": "Configurações"}), encoding="utf-8")
+    (tmp_path / "es.json").write_text(json.dumps({"a": "Configuración"}), encoding="utf-8")
+
+    assert index.sync(files.entries()) == 2
+    assert index.search("configuracoes")[1] == 1
+    # Nada mudou: nenhum arquivo é relido
+    assert index.sync(files.entries()) == 0
+
+    (tmp_path / "es.json").unlink()
+    index.sync(files.entries())
+    assert index.search("configuracion")[1] == 0
+    assert index.stats() == {"files": 1, "entries": 1}
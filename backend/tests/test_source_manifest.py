@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.script_openai import (
+    DEFAULT_ON_FAILURE,
+    build_source_manifest,
+    flatten_object,
+    get_manifest_path,
+    load_source_manifest,
+    save_source_manifest,
+    select_entries_to_translate,
+)
+
+
+def keys(entries):
+
+    return sorted(e["key"] for e in entries)
+
+
+def test_manifest_selects_only_changed_and_new_keys():
+
+    old_source = flatten_object({"a": "Save", "b": "Open", "c": "OK", "gone": "Bye"})
+    new_source = flatten_object({"a": "Save file", "b": "Open", "c": "OK", "d": "New"})
+    existing = {"a": "Salvar", "b": "Abrir", "c": "OK", "gone": "Tchau"}
+
+    to_translate, manifest, diff = select_entries_to_translate(new_source, existing, build_source_manifest(old_source))
+    assert keys(to_translate) == ["a", "d"]
+    assert diff == {"added": ["d"], "changed": ["a"], "removed": ["gone"]}
+    assert manifest == build_source_manifest(new_source)
+
+
+def test_manifest_keeps_translations_equal_to_source():
+
+    # "OK" traduzido como "OK" não é retraduzido quando a origem não mudou
+    source = flatten_object({"c": "OK"})
+    to_translate, _, _ = select_entries_to_translate(source, {"c": "OK"}, build_source_manifest(source))
+    assert to_translate == []
+    # Sem manifesto, a heurística antiga trata o valor idêntico como não traduzido
+    to_translate, _, diff = select_entries_to_translate(source, {"c": "OK"})
+    assert keys(to_translate) == ["c"] and diff is None
+
+
+def test_failed_keys_are_always_retried():
+
+    source = flatten_object({"a": "Save"})
+    to_translate, _, _ = select_entries_to_translate(source, {"a": DEFAULT_ON_FAILURE}, build_source_manifest(source))
+    assert keys(to_translate) == ["a"]
+
+
+def test_manifest_round_trip(tmp_path):
+
+    path = get_manifest_path(tmp_path / "pt.json")
+    assert path.name == "pt.json.manifest.json"
+    assert load_source_manifest(path) is None
+    manifest = build_source_manifest(flatten_object({"a": "Save", "n": {"x": 1}}))
+    save_source_manifest(path, manifest, "en.json")
+    assert load_source_manifest(path) == manifest
+    path.write_text('{"version": -1, "hashes": {}}', encoding="utf-8")
+    assert load_source_manifest(path) is None
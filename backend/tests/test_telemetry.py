@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.estimator import JobEta
+from core.telemetry import LatencyTelemetry, MIN_FIT_SAMPLES, fit_latency, holdout_error, predict_batch_seconds
+
+
+TRUE_LATENCY = {"intercept": 0.4, "per_input_token": 0.0001, "per_output_token": 0.02}
+PRIOR = {"intercept": 1.0, "per_input_token": 0.0, "per_output_token": 0.01}
+
+
+def measured(count: int):
+
+    # Batches variados, com a latência exata do modelo "real"
+    samples = []
+    for i in range(count):
+        calls, input_tokens, output_tokens = 1 + i % 3, 500 + 97 * i, 100 + 41 * (i % 7)
+        samples.append((calls, input_tokens, output_tokens, predict_batch_seconds(TRUE_LATENCY, calls, input_tokens, output_tokens)))
+    return samples
+
+
+def test_fit_moves_from_prior_towards_measurements():
+
+    few = fit_latency(measured(2), PRIOR)
+    many = fit_latency(measured(300), PRIOR)
+    for term, value in TRUE_LATENCY.items():
+        # Com mais medições o ajuste chega mais perto do modelo real
+        assert abs(many[term] - value) <= abs(few[term] - value) + 1e-9
+    assert abs(many["per_output_token"] - 0.02) < 0.002
+    assert fit_latency([], PRIOR) == PRIOR
+
+
+def test_fit_never_returns_negative_coefficients():
+
+    # Mais tokens de entrada, menos tempo: o termo sairia negativo e fica em zero
+    samples = [(1, 1000 * i, 100, 5.0 - 0.4 * i) for i in range(1, 10)]
+    fitted = fit_latency(samples, PRIOR)
+    assert min(fitted.values()) >= 0
+    assert fitted["per_input_token"] == 0.0
+
+
+def test_holdout_error_beats_the_prior_for_a_consistent_backend():
+
+    samples = measured(300)
+    recent = samples[:len(samples) // 5]
+    prior_error = sum(abs(predict_batch_seconds(PRIOR, *s[:3]) - s[3]) / s[3] for s in recent) / len(recent)
+    assert holdout_error(samples, PRIOR) < min(0.05, prior_error)
+    assert holdout_error([], PRIOR) is None
+
+
+def test_telemetry_falls_back_to_all_concurrencies_and_default(tmp_path):
+
+    telemetry = LatencyTelemetry(tmp_path / "telemetry.db")
+    assert telemetry.fit("openai", "gpt-4o-mini", 2, PRIOR)["source"] == "default"
+
+    for calls, input_tokens, output_tokens, seconds in measured(MIN_FIT_SAMPLES):
+        telemetry.record("openai", "gpt-4o-mini", 1, calls, input_tokens, output_tokens, seconds)
+    # Nenhuma medição com concorrência 2: usa as do modelo em qualquer concorrência
+    fit = telemetry.fit("openai", "gpt-4o-mini", 2, PRIOR)
+    assert fit["source"] == "fitted"
+    assert fit["samples"] == MIN_FIT_SAMPLES
+    assert telemetry.models() == [("openai", "gpt-4o-mini", MIN_FIT_SAMPLES)]
+
+
+def test_eta_scales_pending_batches_by_measured_speed():
+
+    eta = JobEta({1: 10.0, 2: 10.0, 3: 10.0, 4: 10.0}, parallel=1)
+    assert eta.remaining() == 40.0
+    # Dois batches levaram o dobro do previsto; o prior de 2 batches amortece a correção
+    eta.finish(1, 20.0)
+    eta.finish(2, 20.0)
+    assert eta.scale() == 60.0 / 40.0
+    assert eta.remaining() == 30.0
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import tracing
+from core.tracing import JobTrace
+
+
+def test_parallel_batches_get_their_own_lanes():
+
+    trace = JobTrace("job-trace")
+
+    async def batch(number: int) -> None:
+        with trace.lane():
+            with trace.span("batch", batch=number):
+                with trace.span("api_call"):
+                    await asyncio.sleep(0.01)
+
+    async def job() -> None:
+        with trace.span("translate"):
+            await asyncio.gather(*(batch(i) for i in range(3)))
+        # Faixas liberadas são reaproveitadas
+        await batch(3)
+
+    asyncio.run(job())
+
+    events = trace.chrome_trace()["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    lanes = {e["args"]["batch"]: e["tid"] for e in spans if e["name"] == "batch"}
+    assert sorted(lanes[i] for i in range(3)) == [1, 2, 3]
+    assert lanes[3] == 1
+    assert [e["tid"] for e in spans if e["name"] == "translate"] == [0]
+    # Cada faixa paralela aparece com nome próprio no visualizador
+    names = {e["tid"]: e["args"]["name"] for e in events if e["name"] == "thread_name"}
+    assert names == {0: "job", 1: "slot 1", 2: "slot 2", 3: "slot 3"}
+
+    summary = trace.summary()
+    assert summary["phases"]["batch"]["count"] == 4
+    assert summary["phases"]["api_call"]["seconds"] >= 0.04
+
+
+def test_events_over_the_limit_only_feed_the_totals(monkeypatch):
+
+    monkeypatch.setattr(tracing, "TRACE_MAX_EVENTS", 2)
+    trace = JobTrace("job-limit")
+    for _ in range(5):
+        with trace.span("step"):
+            pass
+    trace.count("queue_wait", 1.5)
+
+    assert len(trace.events) == 2 and trace.dropped == 3
+    assert trace.summary()["phases"]["step"]["count"] == 5
+    assert trace.summary()["phases"]["queue_wait"] == {"seconds": 1.5, "count": 1}
+
+
+def test_saved_traces_are_capped(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(tracing, "JOB_TRACE_DIR", tmp_path)
+    monkeypatch.setattr(tracing, "JOB_TRACE_MAX", 2)
+    for i in range(3):
+        path = tracing.save_trace(JobTrace(f"job-{i}"))
+        # mtimes distintos: os mais antigos saem primeiro
+        os.utime(path, (i, i))
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == ["job-1.json", "job-2.json"]
+    assert json.loads(path.read_text(encoding="utf-8"))["otherData"]["job_id"] == "job-2"
@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import api
+
+
+def test_profile_is_rejected_without_worker_pool(monkeypatch):
+
+    # JOB_WORKERS=0: os jobs rodam no event loop da API
+    monkeypatch.setattr(api, "dispatcher", None)
+    response = TestClient(api.app).post("/api/translate/start", json={
+        "json_data": {"a": "hello"},
+        "target_language": "pt",
+        "profile": True,
+    })
+    assert response.status_code == 400
+    assert "JOB_WORKERS" in response.json()["detail"]
+
+
+def test_bulk_profile_is_rejected_without_worker_pool(monkeypatch):
+
+    monkeypatch.setattr(api, "dispatcher", None)
+    response = TestClient(api.app).post(
+        "/api/translate/bulk",
+        files={"file": ("locale.zip", b"PK\x05\x06" + b"\x00" * 18)},
+        data={"target_language": "pt", "profile": "true"},
+    )
+    assert response.status_code == 400
+    assert "JOB_WORKERS" in response.json()["detail"]
+
+
+def test_identical_requests_reuse_the_same_job(monkeypatch):
+
+    launched = []
+    monkeypatch.setattr(api, "dispatcher", None)
+    monkeypatch.setattr(api, "launch_job", lambda job, params: launched.append(job))
+    client = TestClient(api.app)
+    request = {"json_data": {"a": "hello", "b": "world"}, "target_language": "pt", "method": "google"}
+
+    first = client.post("/api/translate/start", json=request).json()
+    try:
+        # batch_size só muda o agendamento: continua sendo o mesmo pedido
+        second = client.post("/api/translate/start", json={**request, "batch_size": 5}).json()
+        assert second["deduplicated"] and second["job_id"] == first["job_id"]
+
+        # Ordem das chaves faz parte do documento
+        reordered = client.post("/api/translate/start", json={**request, "json_data": {"b": "world", "a": "hello"}}).json()
+        forced = client.post("/api/translate/start", json={**request, "force": True}).json()
+        assert not reordered["deduplicated"] and not forced["deduplicated"]
+        assert len(launched) == 3
+
+        # Job que falhou nunca é reaproveitado
+        for job in launched:
+            job.status = "failed"
+        assert not client.post("/api/translate/start", json=request).json()["deduplicated"]
+    finally:
+        for job in launched:
+            api.delete_job(job.job_id)
@@ -0,0 +1,69 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import file_lock, translation_cache
+from core.translation_cache import load_language_caches, load_translation_cache, merge_translation_cache
+from scripts.script_openai import DEFAULT_ON_FAILURE
+
+
+def test_merge_skips_failures_and_identity_pairs(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(translation_cache, "API_CACHE_DIR", tmp_path)
+    added = merge_translation_cache("pt", {
+        "Hello world": "Olá mundo",
+        "Save": "Save",
+        "Cancel": DEFAULT_ON_FAILURE,
+        "Hi {name}": "Oi __PH_0__",
+        "Empty": "",
+    })
+    assert added == 1
+    assert load_translation_cache("pt") == {"Hello world": "Olá mundo"}
+    # Só o que mudou conta como adicionado
+    assert merge_translation_cache("pt", {"Hello world": "Olá mundo", "Open": "Abrir"}) == 1
+
+
+def test_cache_is_scoped_by_method_and_model(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(translation_cache, "API_CACHE_DIR", tmp_path)
+    merge_translation_cache("pt", {"Save": "Salvar"}, "google")
+    merge_translation_cache("pt", {"Open": "Abrir"}, "openai", "gpt-4o")
+    assert load_translation_cache("pt", "openai", "gpt-4o-mini") == {}
+    assert load_translation_cache("pt", "openai", "gpt-4o") == {"Open": "Abrir"}
+    assert load_translation_cache("pt", "google", "gpt-4o") == {"Save": "Salvar"}
+    assert load_language_caches("pt") == {"Save": "Salvar", "Open": "Abrir"}
+    assert load_language_caches("es") == {}
+
+
+def merge_in_child(cache_dir: str, worker: int) -> None:
+
+    translation_cache.API_CACHE_DIR = Path(cache_dir)
+    for i in range(25):
+        merge_translation_cache("pt", {f"text {worker} {i}": f"texto {worker} {i}"})
+
+
+def test_concurrent_merges_from_processes_keep_every_entry(tmp_path, monkeypatch):
+
+    # Os workers do pool gravam o mesmo cache: o lock de arquivo serializa o lê-modifica-grava
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=merge_in_child, args=(str(tmp_path), worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+    monkeypatch.setattr(translation_cache, "API_CACHE_DIR", tmp_path)
+    assert len(load_translation_cache("pt")) == 100
+
+
+def test_lock_fails_loudly_without_platform_support(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(file_lock, "fcntl", None)
+    monkeypatch.setattr(file_lock, "msvcrt", None)
+    with pytest.raises(RuntimeError):
+        with file_lock.exclusive_file_lock(tmp_path / "x.lock"):
+            pass
@@ -0,0 +1,103 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import deep_translator
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import translation_cache, translator_service
+
+
+class FailingTranslator:
+
+    def __init__(self, source: str, target: str):
+        pass
+
+    def translate(self, text: str) -> str:
+        raise ConnectionError("backend fora do ar")
+
+
+def test_job_where_every_call_fails_is_failed_and_not_cached(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(translation_cache, "API_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(deep_translator, "GoogleTranslator", FailingTranslator)
+    job = translator_service.create_job()
+    try:
+        with pytest.raises(RuntimeError):
+            asyncio.run(translator_service.translate_json_async(
+                {"a": "Hello world", "b": "Save"}, "pt", job.job_id, method="google", parallel=1,
+            ))
+        assert job.status == "failed"
+        assert job.stats["errors"] == 2
+        assert translation_cache.load_language_caches("pt") == {}
+    finally:
+        translator_service.release_job(job.job_id)
+        translator_service.delete_job(job.job_id)
+
+
+class UpperTranslator:
+
+    def __init__(self, source: str, target: str):
+        pass
+
+    def translate(self, text: str) -> str:
+        return text.upper()
+
+
+def test_bundle_job_records_profile(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(translation_cache, "API_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(deep_translator, "GoogleTranslator", UpperTranslator)
+    job = translator_service.create_job()
+    try:
+        outputs = asyncio.run(translator_service.translate_bundle_async(
+            {"a.json": {"x": "save"}, "b.json": {"y": "save", "z": "open"}}, "pt", job.job_id,
+            method="google", parallel=1, profile=True,
+        ))
+        assert outputs == {"a.json": {"x": "SAVE"}, "b.json": {"y": "SAVE", "z": "OPEN"}}
+        assert job.status == "completed"
+        assert "pstats" in job.stats["profile"]["files"]
+        # Só o payload comprimido fica retido; os dados são decodificados sob demanda
+        assert job.result_data is None
+        assert translator_service.get_result_data(job) == outputs
+    finally:
+        translator_service.release_job(job.job_id)
+        translator_service.delete_job(job.job_id)
+
+
+def test_cancel_stops_running_job_and_keeps_paid_translations(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(translation_cache, "API_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(translator_service, "CANCEL_POLL_SECONDS", 0.01)
+    job = translator_service.create_job()
+    calls = []
+
+    class CancellingTranslator:
+
+        def __init__(self, source: str, target: str):
+            pass
+
+        def translate(self, text: str) -> str:
+            calls.append(text)
+            # O pedido chega com a segunda tradução em andamento: a primeira já foi paga
+            if len(calls) == 2:
+                translator_service.request_job_cancel(job.job_id)
+            time.sleep(0.05)
+            return text.upper()
+
+    monkeypatch.setattr(deep_translator, "GoogleTranslator", CancellingTranslator)
+    source = {f"k{i}": f"text {i}" for i in range(40)}
+    try:
+        with pytest.raises(translator_service.JobCancelled):
+            asyncio.run(translator_service.translate_json_async(
+                source, "pt", job.job_id, method="google", batch_size=1, parallel=1,
+            ))
+        assert job.status == "cancelled"
+        assert len(calls) < len(source)
+        assert translation_cache.load_language_caches("pt")["text 0"] == "TEXT 0"
+    finally:
+        translator_service.release_job(job.job_id)
+        translator_service.delete_job(job.job_id)
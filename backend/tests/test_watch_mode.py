@@ -0,0 +1,43 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import script_openai
+
+
+def watch_args() -> dict:
+
+    return {"target_language": "pt", "model": "gpt-4o-mini", "batch_size": 10, "parallel": 1, "verbose": False}
+
+
+def test_watch_repairs_missing_keys_and_stops_cleanly(tmp_path, monkeypatch, capsys):
+
+    source = tmp_path / "en.json"
+    source.write_text(json.dumps({"a": "Hello", "b": "Save"}), encoding="utf-8")
+    output = tmp_path / "pt.json"
+
+    async def translate_entries(entries, cache, target_lang, model, stats, *args):
+        # A IA "esquece" a chave b: o reparo tem que retraduzi-la sozinha
+        stats["translated"] += 1
+        return {"a": "Olá"}
+
+    def single_key(key, value, model, target_lang, stats):
+        return "Salvar", {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12}
+
+    def loop_once(input_path, read_source, sync):
+        sync(read_source())
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(script_openai, "translate_entries_async", translate_entries)
+    monkeypatch.setattr(script_openai, "call_openai_single_key", single_key)
+    monkeypatch.setattr(script_openai, "watch_loop", loop_once)
+
+    script_openai.watch_mode(watch_args(), source, output, tmp_path / ".cache.json", script_openai.get_manifest_path(output))
+
+    assert json.loads(output.read_text(encoding="utf-8")) == {"a": "Olá", "b": "Salvar"}
+    assert json.loads((tmp_path / ".cache.json").read_text(encoding="utf-8"))["Save"] == "Salvar"
+    out = capsys.readouterr().out
+    assert "Observação encerrada" in out
+    assert "2 traduzidas" in out
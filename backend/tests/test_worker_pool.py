@@ -0,0 +1,37 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import job_events, translator_service
+from core.worker_pool import JobDispatcher
+
+
+def test_job_runs_in_a_worker_process_and_result_comes_back():
+
+    # Sem strings a traduzir: o job completa no worker sem chamar nenhum backend
+    data = {"count": 3, "enabled": True, "nested": {"ratio": 0.5}}
+
+    async def scenario():
+        dispatcher = JobDispatcher(workers=1)
+        dispatcher.start(asyncio.get_running_loop())
+        job = translator_service.create_job()
+        stream = job_events.subscribe(job.job_id)
+        try:
+            dispatcher.submit(job, {"json_data": data, "target_language": "pt", "method": "google"})
+            assert job.status == "queued" and dispatcher.queue_depth == 1
+            while job.status not in translator_service.FINISHED_STATUSES:
+                await stream.wait(30)
+                stream.drain()
+            assert job.status == "completed"
+            assert dispatcher.queue_depth == 0
+            assert translator_service.get_result_data(job) == data
+            # Já terminou: não há o que cancelar na fila
+            assert not dispatcher.cancel(job.job_id)
+        finally:
+            job_events.unsubscribe(stream)
+            dispatcher.shutdown()
+            translator_service.delete_job(job.job_id)
+
+    asyncio.run(asyncio.wait_for(scenario(), 60))
@@ -11,8 +11,7 @@ import FilesList from './components/FilesList'
 import FileViewer from './components/FileViewer'
 import CompareStep from './components/CompareStep'
 import CompareView from './components/CompareView'
-import { uploadJSON, estimateTranslation, startTranslation, getJobStatus, getJobResult, saveJobResult } from './services/api'
-import { saveFileToCache, loadFileFromCache, removeFileFromCache, clearAllCache } from './utils/fileCache'
+import { uploadJSON, estimateTranslation, startTranslation, subscribeJobEvents, getJobResult, saveJobResult } from './services/api'
 
 function App() {
   const [page, setPage] = useState('translate')
@@ -34,16 +33,13 @@ function App() {
   const [loading, setLoading] = useState(false)
   const [viewingFile, setViewingFile] = useState(null)
   const [viewingFilename, setViewingFilename] = useState(null)
+  const [viewingPrefix, setViewingPrefix] = useState('')
   // Estados para comparação
   const [compareFile1, setCompareFile1] = useState(null)
   const [compareFiles2, setCompareFiles2] = useState([])
-  const [compareData1, setCompareData1] = useState(null)
   const [compareFile1Name, setCompareFile1Name] = useState(null)
   const [compareFile2Names, setCompareFile2Names] = useState([])
   const [currentFileIndex, setCurrentFileIndex] = useState(0)
-  const [currentFile2Data, setCurrentFile2Data] = useState(null) // Apenas o arquivo atual em memória
-  const [loadingFile, setLoadingFile] = useState(false)
-  const [fileCacheIds, setFileCacheIds] = useState([]) // IDs dos arquivos no cache
 
   const handleUpload = async (file) => {
     setLoading(true)
@@ -82,39 +78,39 @@ function App() {
     setLoading(true)
     setError(null)
     try {
-      const response = await startTranslation(jsonData, config)
+      const response = await startTranslation(jsonData, { ...config, sourceFilename: uploadInfo?.filename })
       setJobId(response.job_id)
       setStep(5)
-      pollJobStatus(response.job_id)
+      watchJobStatus(response.job_id)
     } catch (err) {
       setError(err.response?.data?.detail || err.message || 'Erro ao iniciar tradução')
       setLoading(false)
     }
   }
 
-  const pollJobStatus = async (id) => {
-    const interval = setInterval(async () => {
-      try {
-        const status = await getJobStatus(id)
+  const watchJobStatus = (id) => {
+    subscribeJobEvents(id, {
+      onStatus: (status) => setJobStatus(status),
+      onDone: async (status) => {
         setJobStatus(status)
-        
         if (status.status === 'completed') {
-          clearInterval(interval)
-          const resultData = await getJobResult(id)
-          setResult(resultData)
-          setStep(6)
-          setLoading(false)
-        } else if (status.status === 'failed') {
-          clearInterval(interval)
+          try {
+            const resultData = await getJobResult(id)
+            setResult(resultData)
+            setStep(6)
+          } catch (err) {
+            setError(err.message || 'Erro ao obter resultado')
+          }
+        } else {
           setError(status.error_message || 'Tradução falhou')
-          setLoading(false)
         }
-      } catch (err) {
-        clearInterval(interval)
+        setLoading(false)
+      },
+      onError: (err) => {
         setError(err.message || 'Erro ao verificar status')
         setLoading(false)
-      }
-    }, 2000)
+      },
+    })
   }
 
   const handleReset = () => {
@@ -155,9 +151,10 @@ function App() {
     }
   }
 
-  const handleViewFile = (data, filename) => {
+  const handleViewFile = (data, filename, prefix = '') => {
     setViewingFile(data)
     setViewingFilename(filename)
+    setViewingPrefix(prefix)
   }
 
   const handleCloseViewer = () => {
@@ -165,106 +162,29 @@ function App() {
     setViewingFilename(null)
   }
 
-  const handleCompare = async (file1, files2) => {
-    setLoading(true)
+  const handleCompare = (file1, files2) => {
+    // A comparação roda no servidor (CompareView); aqui só guardamos os arquivos escolhidos
+    const filesArray = Array.isArray(files2) ? files2 : [files2]
     setError(null)
-    try {
-      // Limpar cache anterior se existir
-      await clearAllCache()
-      
-      // Fazer upload e parse do arquivo base
-      const response1 = await uploadJSON(file1)
-      setCompareData1(response1.data)
-      setCompareFile1Name(response1.filename)
-      setCompareFile1(file1)
-      
-      // Processar múltiplos arquivos e salvar no cache
-      const filesArray = Array.isArray(files2) ? files2 : [files2]
-      const namesList = []
-      const cacheIds = []
-      
-      for (let i = 0; i < filesArray.length; i++) {
-        const file = filesArray[i]
-        const response = await uploadJSON(file)
-        const fileId = `file2_${Date.now()}_${i}_${Math.random().toString(36).substr(2, 9)}`
-        
-        // Salvar no cache
-        await saveFileToCache(fileId, response.data, response.filename)
-        
-        namesList.push(response.filename)
-        cacheIds.push(fileId)
-      }
-      
-      setCompareFile2Names(namesList)
-      setFileCacheIds(cacheIds)
-      setCompareFiles2(filesArray)
-      setCurrentFileIndex(0)
-      
-      // Carregar apenas o primeiro arquivo em memória
-      if (cacheIds.length > 0) {
-        const firstFileData = await loadFileFromCache(cacheIds[0])
-        setCurrentFile2Data(firstFileData)
-      }
-    } catch (err) {
-      setError(err.response?.data?.detail || err.message || 'Erro ao processar arquivos')
-    } finally {
-      setLoading(false)
-    }
+    setCompareFile1(file1)
+    setCompareFile1Name(file1.name)
+    setCompareFiles2(filesArray)
+    setCompareFile2Names(filesArray.map((file) => file.name))
+    setCurrentFileIndex(0)
   }
 
-  const handleBackFromCompare = async () => {
-    // Limpar cache ao sair
-    await clearAllCache()
-    
+  const handleBackFromCompare = () => {
     setCompareFile1(null)
     setCompareFiles2([])
-    setCompareData1(null)
+    setCompareFile1Name(null)
     setCompareFile2Names([])
     setCurrentFileIndex(0)
-    setCurrentFile2Data(null)
-    setFileCacheIds([])
     setError(null)
   }
 
-  const loadFileAtIndex = async (index) => {
-    if (index < 0 || index >= fileCacheIds.length) return
-    
-    setLoadingFile(true)
-    try {
-      const fileId = fileCacheIds[index]
-      const fileData = await loadFileFromCache(fileId)
-      setCurrentFile2Data(fileData)
-    } catch (err) {
-      console.error('Erro ao carregar arquivo do cache:', err)
-      setError('Erro ao carregar arquivo do cache')
-    } finally {
-      setLoadingFile(false)
-    }
-  }
-
-  const handleNextFile = async () => {
-    if (currentFileIndex < fileCacheIds.length - 1) {
-      const newIndex = currentFileIndex + 1
-      setCurrentFileIndex(newIndex)
-      await loadFileAtIndex(newIndex)
-    }
-  }
-
-  const handlePreviousFile = async () => {
-    if (currentFileIndex > 0) {
-      const newIndex = currentFileIndex - 1
-      setCurrentFileIndex(newIndex)
-      await loadFileAtIndex(newIndex)
-    }
-  }
-
-  const handleSelectFile = async (index) => {
-    // Prevenir múltiplas chamadas simultâneas
-    if (loadingFile) return
-    
-    if (index >= 0 && index < fileCacheIds.length && index !== currentFileIndex) {
+  const handleSelectFile = (index) => {
+    if (index >= 0 && index < compareFiles2.length) {
       setCurrentFileIndex(index)
-      await loadFileAtIndex(index)
     }
   }
 
@@ -332,16 +252,15 @@ function App() {
                 </div>
               )}
 
-              {compareData1 && currentFile2Data && fileCacheIds.length > 0 ? (
+              {compareFile1 && compareFiles2.length > 0 ? (
                 <CompareView
-                  file1Data={compareData1}
-                  file2Data={currentFile2Data}
+                  file1={compareFile1}
+                  file2={compareFiles2[currentFileIndex]}
                   file1Name={compareFile1Name}
                   file2Name={compareFile2Names[currentFileIndex]}
                   currentIndex={currentFileIndex}
-                  totalFiles={fileCacheIds.length}
+                  totalFiles={compareFiles2.length}
                   fileNames={compareFile2Names}
-                  loadingFile={loadingFile}
                   onSelectFile={handleSelectFile}
                   onBack={handleBackFromCompare}
                 />
@@ -444,10 +363,11 @@ function App() {
         </div>
       </main>
 
-      {viewingFile && (
+      {viewingFilename && (
         <FileViewer
           data={viewingFile}
           filename={viewingFilename}
+          initialPrefix={viewingPrefix}
           onClose={handleCloseViewer}
         />
       )}
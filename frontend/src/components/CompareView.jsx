@@ -1,36 +1,117 @@
-import { useState, useRef, useEffect, useMemo } from 'react'
-import { ArrowLeft, FileJson, Download, Filter, List, Loader2 } from 'lucide-react'
-import { compareJSONs, formatJSONForDisplay } from '../utils/jsonCompare'
+import { useState, useRef, useEffect } from 'react'
+import { ArrowLeft, FileJson, Download, Filter, List, Loader2, ChevronLeft, ChevronRight } from 'lucide-react'
+import { compareDocuments, getCompareDiffs, downloadCompareReport } from '../services/api'
+import { formatPathValue } from '../utils/jsonCompare'
 import './CompareView.css'
 
+const DIFFS_PAGE_SIZE = 200
+
+// Valor exibido em cada lado para uma diferença; null deixa a linha em branco naquele lado
+const diffSide = (diff, side) => {
+  switch (diff.status) {
+    case 'added':
+      return side === 'left' ? null : { path: diff.path, value: diff.value }
+    case 'removed':
+      return side === 'left' ? { path: diff.path, value: diff.value } : null
+    case 'keyChanged':
+      return side === 'left'
+        ? { path: diff.oldPath, value: diff.oldValue }
+        : { path: diff.path, value: diff.newValue }
+    case 'modified':
+    case 'emptyValue':
+      return { path: diff.path, value: side === 'left' ? diff.oldValue : diff.newValue }
+    default:
+      return { path: diff.path, value: diff.value }
+  }
+}
+
 const CompareView = ({ 
-  file1Data, 
-  file2Data, 
+  file1, 
+  file2, 
   file1Name, 
   file2Name, 
   currentIndex = 0, 
   totalFiles = 1, 
   fileNames = [], 
-  loadingFile = false,
   onSelectFile = () => {}, 
   onBack 
 }) => {
   const [syncScroll, setSyncScroll] = useState(true)
-  const [filter, setFilter] = useState('all') // 'all', 'added', 'removed', 'modified', 'unchanged'
+  const [filter, setFilter] = useState('all') // 'all', 'added', 'removed', 'modified', 'keyChanged', 'emptyValue', 'unchanged'
   const leftPanelRef = useRef(null)
   const rightPanelRef = useRef(null)
-  const [differences, setDifferences] = useState(null)
-  const [leftLines, setLeftLines] = useState([])
-  const [rightLines, setRightLines] = useState([])
+  // Resumos já calculados pelo servidor, por índice do segundo arquivo
+  const comparisonsRef = useRef({})
+  const [comparison, setComparison] = useState(null)
+  const [comparing, setComparing] = useState(false)
+  const [diffs, setDiffs] = useState([])
+  const [page, setPage] = useState(1)
+  const [pages, setPages] = useState(0)
+  const [loadingDiffs, setLoadingDiffs] = useState(false)
+  const [error, setError] = useState(null)
+
+  useEffect(() => {
+    comparisonsRef.current = {}
+  }, [file1])
+
+  useEffect(() => {
+    if (!file1 || !file2) return
+    let cancelled = false
+    setPage(1)
+    setError(null)
+    const cached = comparisonsRef.current[currentIndex]
+    if (cached) {
+      setComparison(cached)
+      return
+    }
+    setComparison(null)
+    setDiffs([])
+    setComparing(true)
+    compareDocuments(file1, file2)
+      .then((data) => {
+        comparisonsRef.current[currentIndex] = data
+        if (!cancelled) setComparison(data)
+      })
+      .catch((err) => {
+        if (!cancelled) setError(err.response?.data?.detail || err.message)
+      })
+      .finally(() => {
+        if (!cancelled) setComparing(false)
+      })
+    return () => {
+      cancelled = true
+    }
+  }, [file1, file2, currentIndex])
 
   useEffect(() => {
-    if (file1Data && file2Data) {
-      const diff = compareJSONs(file1Data, file2Data)
-      setDifferences(diff)
-      setLeftLines(formatJSONForDisplay(file1Data, diff, 'left'))
-      setRightLines(formatJSONForDisplay(file2Data, diff, 'right'))
+    if (!comparison) return
+    let cancelled = false
+    setLoadingDiffs(true)
+    getCompareDiffs(comparison.compare_id, {
+      category: filter === 'all' ? undefined : filter,
+      page,
+      page_size: DIFFS_PAGE_SIZE,
+    })
+      .then((data) => {
+        if (cancelled) return
+        setDiffs(data.diffs || [])
+        setPages(data.pages || 0)
+      })
+      .catch((err) => {
+        if (!cancelled) setError(err.response?.data?.detail || err.message)
+      })
+      .finally(() => {
+        if (!cancelled) setLoadingDiffs(false)
+      })
+    return () => {
+      cancelled = true
     }
-  }, [file1Data, file2Data])
+  }, [comparison, filter, page])
+
+  const handleFilter = (value) => {
+    setPage(1)
+    setFilter(filter === value ? 'all' : value)
+  }
 
   const handleLeftScroll = (e) => {
     if (syncScroll && rightPanelRef.current) {
@@ -65,107 +146,43 @@ const CompareView = ({
     }
   }
 
-  const stats = differences ? {
-    added: differences.added.length,
-    removed: differences.removed.length,
-    modified: differences.modified.length,
-    keyChanged: differences.keyChanged.length,
-    emptyValue: differences.emptyValue.length,
-    unchanged: differences.unchanged.length,
-    total: differences.added.length + differences.removed.length + differences.modified.length + 
-           differences.keyChanged.length + differences.emptyValue.length + differences.unchanged.length
-  } : null
-
-  // Filtrar linhas baseado no filtro selecionado
-  const filteredLeftLines = useMemo(() => {
-    if (filter === 'all') return leftLines
-    return leftLines.filter(line => line.status === filter)
-  }, [leftLines, filter])
-
-  const filteredRightLines = useMemo(() => {
-    if (filter === 'all') return rightLines
-    return rightLines.filter(line => line.status === filter)
-  }, [rightLines, filter])
+  const stats = comparison ? comparison.summary : null
 
-  // Gerar relatório
-  const generateReport = () => {
-    if (!differences) return
-
-    const report = {
-      metadata: {
-        generatedAt: new Date().toISOString(),
-        file1: file1Name,
-        file2: file2Name,
-        totalEntries: stats.total
-      },
-      summary: {
-        added: stats.added,
-        removed: stats.removed,
-        modified: stats.modified,
-        keyChanged: stats.keyChanged,
-        emptyValue: stats.emptyValue,
-        unchanged: stats.unchanged
-      },
-      differences: {
-        added: differences.added.map(d => ({
-          path: d.path,
-          value: d.value,
-          type: d.type,
-          isEmpty: d.isEmpty
-        })),
-        removed: differences.removed.map(d => ({
-          path: d.path,
-          value: d.value,
-          type: d.type,
-          isEmpty: d.isEmpty
-        })),
-        modified: differences.modified.map(d => ({
-          path: d.path,
-          oldValue: d.oldValue,
-          newValue: d.newValue,
-          oldType: d.oldType,
-          newType: d.newType
-        })),
-        keyChanged: differences.keyChanged.map(d => ({
-          oldPath: d.oldPath,
-          newPath: d.path,
-          oldKey: d.oldKey,
-          newKey: d.newKey,
-          oldValue: d.oldValue,
-          newValue: d.newValue,
-          type: d.type
-        })),
-        emptyValue: differences.emptyValue.map(d => ({
-          path: d.path,
-          oldValue: d.oldValue,
-          newValue: d.newValue,
-          oldType: d.oldType,
-          newType: d.newType,
-          isEmptyInFile1: d.isEmptyInFile1,
-          isEmptyInFile2: d.isEmptyInFile2
-        })),
-        unchanged: differences.unchanged.map(d => ({
-          path: d.path,
-          value: d.value
-        }))
-      }
+  const handleDownloadReport = async () => {
+    if (!comparison) return
+    try {
+      await downloadCompareReport(comparison.compare_id)
+    } catch (err) {
+      alert(`Erro ao baixar relatório: ${err.message}`)
     }
-
-    return report
   }
 
-  const handleDownloadReport = () => {
-    const report = generateReport()
-    const blob = new Blob([JSON.stringify(report, null, 2)], { type: 'application/json' })
-    const url = URL.createObjectURL(blob)
-    const a = document.createElement('a')
-    a.href = url
-    const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5)
-    a.download = `comparison-report_${timestamp}.json`
-    document.body.appendChild(a)
-    a.click()
-    document.body.removeChild(a)
-    URL.revokeObjectURL(url)
+  const renderLines = (side) => {
+    if (diffs.length === 0) {
+      return (
+        <div className="no-results">
+          <p>Nenhum resultado encontrado para o filtro selecionado.</p>
+        </div>
+      )
+    }
+    return diffs.map((diff, index) => {
+      const line = diffSide(diff, side)
+      const lineNumber = (page - 1) * DIFFS_PAGE_SIZE + index + 1
+      if (!line) {
+        return (
+          <div key={`${side}-${lineNumber}`} className="compare-line line-placeholder">
+            <span className="line-number">{lineNumber}</span>
+          </div>
+        )
+      }
+      return (
+        <div key={`${side}-${lineNumber}`} className={`compare-line line-${diff.status}`}>
+          <span className="line-number">{lineNumber}</span>
+          <span className="line-icon">{getLineIcon(diff.status)}</span>
+          <span className="line-content">{formatPathValue(line.path, line.value)}</span>
+        </div>
+      )
+    })
   }
 
   const hasMultipleFiles = totalFiles > 1
@@ -199,7 +216,7 @@ const CompareView = ({
             />
             <span>Sincronizar rolagem</span>
           </label>
-          <button className="btn btn-primary" onClick={handleDownloadReport}>
+          <button className="btn btn-primary" onClick={handleDownloadReport} disabled={!comparison}>
             <Download size={18} />
             Salvar Relatório
           </button>
@@ -219,7 +236,7 @@ const CompareView = ({
                 value={currentIndex}
                 onChange={(e) => onSelectFile(parseInt(e.target.value))}
                 className="file-select"
-                disabled={loadingFile}
+                disabled={comparing}
               >
                 {fileNames.map((name, index) => (
                   <option key={index} value={index}>
@@ -232,19 +249,21 @@ const CompareView = ({
         </div>
       )}
 
-      {loadingFile && (
+      {comparing && (
         <div className="file-loading-indicator">
           <Loader2 size={20} className="spinner" />
-          <span>Carregando arquivo...</span>
+          <span>Comparando arquivos...</span>
         </div>
       )}
 
+      {error && <div className="alert error">{error}</div>}
+
       {stats && (
         <>
           <div className="compare-stats">
             <div 
               className={`stat-item stat-added ${filter === 'added' ? 'active' : ''}`}
-              onClick={() => setFilter(filter === 'added' ? 'all' : 'added')}
+              onClick={() => handleFilter('added')}
               style={{ cursor: 'pointer' }}
             >
               <span className="stat-label">Adicionadas:</span>
@@ -252,7 +271,7 @@ const CompareView = ({
             </div>
             <div 
               className={`stat-item stat-removed ${filter === 'removed' ? 'active' : ''}`}
-              onClick={() => setFilter(filter === 'removed' ? 'all' : 'removed')}
+              onClick={() => handleFilter('removed')}
               style={{ cursor: 'pointer' }}
             >
               <span className="stat-label">Removidas:</span>
@@ -260,7 +279,7 @@ const CompareView = ({
             </div>
             <div 
               className={`stat-item stat-key-changed ${filter === 'keyChanged' ? 'active' : ''}`}
-              onClick={() => setFilter(filter === 'keyChanged' ? 'all' : 'keyChanged')}
+              onClick={() => handleFilter('keyChanged')}
               style={{ cursor: 'pointer' }}
             >
               <span className="stat-label">Chaves Alteradas:</span>
@@ -268,7 +287,7 @@ const CompareView = ({
             </div>
             <div 
               className={`stat-item stat-empty-value ${filter === 'emptyValue' ? 'active' : ''}`}
-              onClick={() => setFilter(filter === 'emptyValue' ? 'all' : 'emptyValue')}
+              onClick={() => handleFilter('emptyValue')}
               style={{ cursor: 'pointer' }}
             >
               <span className="stat-label">Valores Vazios:</span>
@@ -276,7 +295,7 @@ const CompareView = ({
             </div>
             <div 
               className={`stat-item stat-modified ${filter === 'modified' ? 'active' : ''}`}
-              onClick={() => setFilter(filter === 'modified' ? 'all' : 'modified')}
+              onClick={() => handleFilter('modified')}
               style={{ cursor: 'pointer' }}
             >
               <span className="stat-label">Valores Modificados:</span>
@@ -284,7 +303,7 @@ const CompareView = ({
             </div>
             <div 
               className={`stat-item stat-unchanged ${filter === 'unchanged' ? 'active' : ''}`}
-              onClick={() => setFilter(filter === 'unchanged' ? 'all' : 'unchanged')}
+              onClick={() => handleFilter('unchanged')}
               style={{ cursor: 'pointer' }}
             >
               <span className="stat-label">Inalteradas:</span>
@@ -292,7 +311,7 @@ const CompareView = ({
             </div>
             <div 
               className={`stat-item ${filter === 'all' ? 'active' : ''}`}
-              onClick={() => setFilter('all')}
+              onClick={() => handleFilter('all')}
               style={{ cursor: 'pointer' }}
             >
               <span className="stat-label">Total:</span>
@@ -310,7 +329,7 @@ const CompareView = ({
                 filter === 'emptyValue' ? 'Valores Vazios' :
                 'Inalteradas'
               }</span>
-              <button className="filter-clear" onClick={() => setFilter('all')}>
+              <button className="filter-clear" onClick={() => handleFilter('all')}>
                 Limpar filtro
               </button>
             </div>
@@ -318,6 +337,21 @@ const CompareView = ({
         </>
       )}
 
+      {pages > 1 && (
+        <div className="compare-pagination">
+          <button className="btn-icon" onClick={() => setPage(page - 1)} disabled={loadingDiffs || page <= 1}>
+            <ChevronLeft size={18} />
+          </button>
+          <span>
+            {page} / {pages}
+          </span>
+          <button className="btn-icon" onClick={() => setPage(page + 1)} disabled={loadingDiffs || page >= pages}>
+            <ChevronRight size={18} />
+          </button>
+          {loadingDiffs && <Loader2 size={18} className="spinner" />}
+        </div>
+      )}
+
       <div className="compare-panels">
         <div className="compare-panel">
           <div className="compare-panel-header">
@@ -329,22 +363,7 @@ const CompareView = ({
             onScroll={handleLeftScroll}
           >
             <div className="compare-lines">
-              {filteredLeftLines.length === 0 ? (
-                <div className="no-results">
-                  <p>Nenhum resultado encontrado para o filtro selecionado.</p>
-                </div>
-              ) : (
-                filteredLeftLines.map((line, index) => (
-                  <div
-                    key={`left-${line.path}-${index}`}
-                    className={`compare-line line-${line.status}`}
-                  >
-                    <span className="line-number">{index + 1}</span>
-                    <span className="line-icon">{getLineIcon(line.status)}</span>
-                    <span className="line-content">{line.display}</span>
-                  </div>
-                ))
-              )}
+              {renderLines('left')}
             </div>
           </div>
         </div>
@@ -361,22 +380,7 @@ const CompareView = ({
             onScroll={handleRightScroll}
           >
             <div className="compare-lines">
-              {filteredRightLines.length === 0 ? (
-                <div className="no-results">
-                  <p>Nenhum resultado encontrado para o filtro selecionado.</p>
-                </div>
-              ) : (
-                filteredRightLines.map((line, index) => (
-                  <div
-                    key={`right-${line.path}-${index}`}
-                    className={`compare-line line-${line.status}`}
-                  >
-                    <span className="line-number">{index + 1}</span>
-                    <span className="line-icon">{getLineIcon(line.status)}</span>
-                    <span className="line-content">{line.display}</span>
-                  </div>
-                ))
-              )}
+              {renderLines('right')}
             </div>
           </div>
         </div>
@@ -0,0 +1,131 @@
+import { useState, useEffect } from 'react'
+import { FileSearch, Loader2, ChevronLeft, ChevronRight } from 'lucide-react'
+import { searchTranslatedFiles } from '../services/api'
+import './ContentSearch.css'
+
+const RESULTS_PAGE_SIZE = 20
+
+const FIELD_OPTIONS = [
+  { value: '', label: 'Tudo' },
+  { value: 'value', label: 'Tradução' },
+  { value: 'source', label: 'Origem' },
+  { value: 'key', label: 'Chave' },
+]
+
+// O servidor marca os termos encontrados com <mark>; o texto é renderizado sem HTML
+const renderSnippet = (snippet) =>
+  snippet.split(/(<mark>.*?<\/mark>)/g).map((part, index) =>
+    part.startsWith('<mark>') ? <mark key={index}>{part.slice(6, -7)}</mark> : part
+  )
+
+const ContentSearch = ({ onOpenResult }) => {
+  const [text, setText] = useState('')
+  const [query, setQuery] = useState('')
+  const [field, setField] = useState('')
+  const [page, setPage] = useState(1)
+  const [response, setResponse] = useState(null)
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState(null)
+
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setPage(1)
+      setQuery(text.trim())
+    }, 300)
+    return () => clearTimeout(timer)
+  }, [text])
+
+  useEffect(() => {
+    if (!query) {
+      setResponse(null)
+      return
+    }
+    let cancelled = false
+    setLoading(true)
+    setError(null)
+    searchTranslatedFiles({ q: query, field: field || undefined, page, page_size: RESULTS_PAGE_SIZE })
+      .then((data) => {
+        if (!cancelled) setResponse(data)
+      })
+      .catch((err) => {
+        if (!cancelled) setError(err.response?.data?.detail || err.message)
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false)
+      })
+    return () => {
+      cancelled = true
+    }
+  }, [query, field, page])
+
+  return (
+    <div className="content-search">
+      <div className="content-search-bar">
+        <FileSearch size={18} />
+        <input
+          type="text"
+          value={text}
+          onChange={(e) => setText(e.target.value)}
+          placeholder="Buscar textos dentro dos arquivos..."
+        />
+        <select
+          value={field}
+          onChange={(e) => {
+            setPage(1)
+            setField(e.target.value)
+          }}
+        >
+          {FIELD_OPTIONS.map((option) => (
+            <option key={option.value} value={option.value}>
+              {option.label}
+            </option>
+          ))}
+        </select>
+        {loading && <Loader2 size={18} className="spinner" />}
+      </div>
+
+      {error && <div className="alert error">{error}</div>}
+
+      {response && (
+        <div className="content-search-results">
+          <div className="content-search-summary">
+            {response.total} ocorrência(s) em {response.took_ms} ms
+          </div>
+          {response.results.map((result) => (
+            <button
+              key={`${result.filename}:${result.key}`}
+              className="content-search-result"
+              onClick={() => onOpenResult(result)}
+            >
+              <div className="result-location">
+                <span className="result-file">{result.filename}</span>
+                <span className="result-key">{result.key}</span>
+              </div>
+              <div className="result-snippet">{renderSnippet(result.snippet)}</div>
+              {result.source && <div className="result-source">{result.source}</div>}
+            </button>
+          ))}
+          {response.pages > 1 && (
+            <div className="content-search-pagination">
+              <button className="btn-icon" onClick={() => setPage(page - 1)} disabled={loading || page <= 1}>
+                <ChevronLeft size={18} />
+              </button>
+              <span>
+                {page} / {response.pages}
+              </span>
+              <button
+                className="btn-icon"
+                onClick={() => setPage(page + 1)}
+                disabled={loading || page >= response.pages}
+              >
+                <ChevronRight size={18} />
+              </button>
+            </div>
+          )}
+        </div>
+      )}
+    </div>
+  )
+}
+
+export default ContentSearch
@@ -11,6 +11,7 @@ const EstimateStep = ({ estimate, onStart, onBack, loading }) => {
   }
 
   const isGoogleTranslate = estimate.method === 'google' || estimate.model === 'Google Translate'
+  const range = estimate.range
 
   return (
     <div className="estimate-step">
@@ -25,7 +26,10 @@ const EstimateStep = ({ estimate, onStart, onBack, loading }) => {
           <FileText size={24} />
           <div>
             <p className="estimate-label">Strings para Traduzir</p>
-            <p className="estimate-value">{estimate.total_strings.toLocaleString()}</p>
+            <p className="estimate-value">{estimate.strings_to_translate.toLocaleString()}</p>
+            {estimate.cached_strings > 0 && (
+              <p className="estimate-range">{estimate.cached_strings.toLocaleString()} já no cache</p>
+            )}
           </div>
         </div>
 
@@ -45,6 +49,11 @@ const EstimateStep = ({ estimate, onStart, onBack, loading }) => {
             <div>
               <p className="estimate-label">Custo Estimado</p>
               <p className="estimate-value">${estimate.estimated_cost_usd.toFixed(6)}</p>
+              {range && (
+                <p className="estimate-range">
+                  ${range.cost_usd[0].toFixed(6)} – ${range.cost_usd[1].toFixed(6)}
+                </p>
+              )}
             </div>
           </div>
         )}
@@ -54,6 +63,11 @@ const EstimateStep = ({ estimate, onStart, onBack, loading }) => {
           <div>
             <p className="estimate-label">Tempo Estimado</p>
             <p className="estimate-value">{formatTime(estimate.estimated_time_seconds)}</p>
+            {range && (
+              <p className="estimate-range">
+                {formatTime(range.time_seconds[0])} – {formatTime(range.time_seconds[1])}
+              </p>
+            )}
           </div>
         </div>
       </div>
@@ -79,6 +93,18 @@ const EstimateStep = ({ estimate, onStart, onBack, loading }) => {
                 <span className="detail-label">Batches Paralelos:</span>
                 <span className="detail-value">{estimate.parallel}</span>
               </div>
+              <div className="detail-item">
+                <span className="detail-label">Chamadas à API:</span>
+                <span className="detail-value">
+                  {estimate.api_calls.toLocaleString()} ({estimate.individual_calls.toLocaleString()} individuais)
+                </span>
+              </div>
+              <div className="detail-item">
+                <span className="detail-label">Contagem de tokens:</span>
+                <span className="detail-value">
+                  {estimate.tokenizer === 'tiktoken' ? 'tiktoken' : 'aproximada'}
+                </span>
+              </div>
               <div className="detail-item">
                 <span className="detail-label">Tokens Input (est.):</span>
                 <span className="detail-value">{estimate.estimated_tokens_input.toLocaleString()}</span>
@@ -89,6 +115,19 @@ const EstimateStep = ({ estimate, onStart, onBack, loading }) => {
               </div>
             </>
           )}
+          {estimate.latency_model && (
+            <div className="detail-item">
+              <span className="detail-label">Modelo de latência:</span>
+              <span className="detail-value">
+                {estimate.latency_model.source === 'fitted'
+                  ? `calibrado (${estimate.latency_model.samples} batches` +
+                    (estimate.latency_model.error != null
+                      ? `, erro médio ${Math.round(estimate.latency_model.error * 100)}%)`
+                      : ')')
+                  : 'padrão (sem histórico)'}
+              </span>
+            </div>
+          )}
           {isGoogleTranslate && (
             <div className="detail-item">
               <span className="detail-label">Nota:</span>
@@ -1,13 +1,62 @@
-import { useState } from 'react'
-import { X, Download, Copy, Check } from 'lucide-react'
-import { downloadTranslatedFile } from '../services/api'
+import { useState, useEffect } from 'react'
+import { X, Download, Copy, Check, Search, ChevronLeft, ChevronRight, Loader2 } from 'lucide-react'
+import { downloadTranslatedFile, getTranslatedFileEntries } from '../services/api'
 import './FileViewer.css'
 
-const FileViewer = ({ data, filename, onClose }) => {
+const ENTRIES_PAGE_SIZE = 200
+
+// Sem `data`, o arquivo é lido do servidor em páginas de chaves achatadas
+const FileViewer = ({ data, filename, initialPrefix = '', onClose }) => {
   const [copied, setCopied] = useState(false)
+  const [entries, setEntries] = useState([])
+  const [page, setPage] = useState(1)
+  const [pages, setPages] = useState(0)
+  const [total, setTotal] = useState(0)
+  const [prefix, setPrefix] = useState(initialPrefix)
+  const [query, setQuery] = useState(initialPrefix)
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState(null)
+  const paged = !data
+
+  useEffect(() => {
+    if (!paged) return
+    let cancelled = false
+    setLoading(true)
+    setError(null)
+    getTranslatedFileEntries(filename, {
+      page,
+      page_size: ENTRIES_PAGE_SIZE,
+      prefix: query || undefined,
+    })
+      .then((response) => {
+        if (cancelled) return
+        setEntries(response.entries || [])
+        setTotal(response.total || 0)
+        setPages(response.pages || 0)
+      })
+      .catch((err) => {
+        if (!cancelled) setError(err.response?.data?.detail || err.message)
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false)
+      })
+    return () => {
+      cancelled = true
+    }
+  }, [paged, filename, page, query])
+
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setPage(1)
+      setQuery(prefix.trim())
+    }, 300)
+    return () => clearTimeout(timer)
+  }, [prefix])
+
+  const pageData = () => Object.fromEntries(entries.map((entry) => [entry.key, entry.value]))
 
   const handleCopy = () => {
-    const jsonString = JSON.stringify(data, null, 2)
+    const jsonString = JSON.stringify(paged ? pageData() : data, null, 2)
     navigator.clipboard.writeText(jsonString)
     setCopied(true)
     setTimeout(() => setCopied(false), 2000)
@@ -27,10 +76,14 @@ const FileViewer = ({ data, filename, onClose }) => {
         <div className="viewer-header">
           <div>
             <h3>{filename}</h3>
-            <p>{Object.keys(data).length} chaves principais</p>
+            <p>
+              {paged
+                ? `${total} chaves${query ? ` com prefixo "${query}"` : ''}`
+                : `${Object.keys(data).length} chaves principais`}
+            </p>
           </div>
           <div className="viewer-actions">
-            <button className="btn-icon" onClick={handleCopy} title="Copiar JSON">
+            <button className="btn-icon" onClick={handleCopy} title={paged ? 'Copiar página' : 'Copiar JSON'}>
               {copied ? <Check size={20} /> : <Copy size={20} />}
             </button>
             <button className="btn-icon" onClick={handleDownload} title="Baixar">
@@ -41,10 +94,41 @@ const FileViewer = ({ data, filename, onClose }) => {
             </button>
           </div>
         </div>
+        {paged && (
+          <div className="viewer-toolbar">
+            <div className="viewer-search">
+              <Search size={16} />
+              <input
+                type="text"
+                value={prefix}
+                onChange={(e) => setPrefix(e.target.value)}
+                placeholder="Filtrar por prefixo da chave (ex: common.buttons)"
+              />
+            </div>
+            <div className="viewer-pagination">
+              <button className="btn-icon" onClick={() => setPage(page - 1)} disabled={loading || page <= 1}>
+                <ChevronLeft size={18} />
+              </button>
+              <span>
+                {pages ? `${page} / ${pages}` : '0 / 0'}
+              </span>
+              <button className="btn-icon" onClick={() => setPage(page + 1)} disabled={loading || page >= pages}>
+                <ChevronRight size={18} />
+              </button>
+            </div>
+          </div>
+        )}
         <div className="viewer-content">
-          <pre className="json-viewer">
-            {JSON.stringify(data, null, 2)}
-          </pre>
+          {paged && error && <div className="alert error">{error}</div>}
+          {paged && loading ? (
+            <div className="viewer-loading">
+              <Loader2 size={32} className="spinner" />
+            </div>
+          ) : (
+            <pre className="json-viewer">
+              {JSON.stringify(paged ? pageData() : data, null, 2)}
+            </pre>
+          )}
         </div>
       </div>
     </div>
@@ -52,4 +136,3 @@ const FileViewer = ({ data, filename, onClose }) => {
 }
 
 export default FileViewer
-
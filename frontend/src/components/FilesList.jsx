@@ -1,20 +1,52 @@
 import { useState, useEffect } from 'react'
-import { FileJson, Download, Trash2, Eye, RefreshCw, Loader2, Calendar, HardDrive, Globe } from 'lucide-react'
+import { FileJson, Download, Trash2, Eye, RefreshCw, Loader2, Calendar, HardDrive, Globe, Search, ChevronLeft, ChevronRight } from 'lucide-react'
 import { listTranslatedFiles, downloadTranslatedFile, deleteTranslatedFile, getTranslatedFile } from '../services/api'
+import ContentSearch from './ContentSearch'
 import './FilesList.css'
 
+const PAGE_SIZE = 24
+const LARGE_FILE_SIZE = 5 * 1024 * 1024
+
+const SORT_OPTIONS = [
+  { value: 'modified:desc', label: 'Mais recentes' },
+  { value: 'modified:asc', label: 'Mais antigos' },
+  { value: 'filename:asc', label: 'Nome (A-Z)' },
+  { value: 'size:desc', label: 'Maiores' },
+  { value: 'keys:desc', label: 'Mais chaves' },
+  { value: 'language_code:asc', label: 'Idioma' },
+]
+
 const FilesList = ({ onViewFile, onBack }) => {
   const [files, setFiles] = useState([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [deleting, setDeleting] = useState(null)
+  const [page, setPage] = useState(1)
+  const [pages, setPages] = useState(0)
+  const [total, setTotal] = useState(0)
+  const [search, setSearch] = useState('')
+  const [query, setQuery] = useState('')
+  const [sortOption, setSortOption] = useState(SORT_OPTIONS[0].value)
 
   const loadFiles = async () => {
     setLoading(true)
     setError(null)
     try {
-      const response = await listTranslatedFiles()
+      const [sort, order] = sortOption.split(':')
+      const response = await listTranslatedFiles({
+        page,
+        page_size: PAGE_SIZE,
+        sort,
+        order,
+        search: query || undefined,
+      })
       setFiles(response.files || [])
+      setTotal(response.total || 0)
+      setPages(response.pages || 0)
+      // Página ficou vazia após exclusões: volta para a última existente
+      if (page > 1 && page > (response.pages || 0)) {
+        setPage(Math.max(response.pages || 1, 1))
+      }
     } catch (err) {
       setError(err.response?.data?.detail || err.message || 'Erro ao carregar arquivos')
     } finally {
@@ -24,7 +56,16 @@ const FilesList = ({ onViewFile, onBack }) => {
 
   useEffect(() => {
     loadFiles()
-  }, [])
+  }, [page, query, sortOption])
+
+  // Espera o usuário parar de digitar antes de consultar a API
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setPage(1)
+      setQuery(search.trim())
+    }, 300)
+    return () => clearTimeout(timer)
+  }, [search])
 
   const handleDownload = async (filename) => {
     try {
@@ -50,7 +91,12 @@ const FilesList = ({ onViewFile, onBack }) => {
     }
   }
 
-  const handleView = async (filename) => {
+  const handleView = async (filename, size) => {
+    // Arquivos grandes abrem paginados: o visualizador busca as chaves sob demanda
+    if (size > LARGE_FILE_SIZE) {
+      onViewFile(null, filename)
+      return
+    }
     try {
       const response = await getTranslatedFile(filename)
       onViewFile(response.data, filename)
@@ -100,6 +146,35 @@ const FilesList = ({ onViewFile, onBack }) => {
         </div>
       </div>
 
+      <div className="files-toolbar">
+        <div className="files-search">
+          <Search size={18} />
+          <input
+            type="text"
+            value={search}
+            onChange={(e) => setSearch(e.target.value)}
+            placeholder="Buscar por nome do arquivo ou origem..."
+          />
+        </div>
+        <select
+          className="files-sort"
+          value={sortOption}
+          onChange={(e) => {
+            setPage(1)
+            setSortOption(e.target.value)
+          }}
+        >
+          {SORT_OPTIONS.map((option) => (
+            <option key={option.value} value={option.value}>
+              {option.label}
+            </option>
+          ))}
+        </select>
+        <span className="files-total">{total} arquivo(s)</span>
+      </div>
+
+      <ContentSearch onOpenResult={(result) => onViewFile(null, result.filename, result.key)} />
+
       {error && (
         <div className="alert error">
           <span>{error}</span>
@@ -114,9 +189,9 @@ const FilesList = ({ onViewFile, onBack }) => {
       ) : files.length === 0 ? (
         <div className="empty-state">
           <FileJson size={64} />
-          <h3>Nenhum arquivo traduzido</h3>
-          <p>Os arquivos traduzidos aparecerão aqui</p>
-          {onBack && (
+          <h3>{query ? 'Nenhum arquivo encontrado' : 'Nenhum arquivo traduzido'}</h3>
+          <p>{query ? 'Tente outro termo de busca' : 'Os arquivos traduzidos aparecerão aqui'}</p>
+          {onBack && !query && (
             <button className="btn btn-primary" onClick={onBack}>
               Criar Primeira Tradução
             </button>
@@ -134,6 +209,12 @@ const FilesList = ({ onViewFile, onBack }) => {
                   {file.filename}
                 </h3>
                 <div className="file-meta">
+                  {file.source && (
+                    <div className="meta-item" title="Arquivo de origem">
+                      <FileJson size={16} />
+                      <span>{file.source}</span>
+                    </div>
+                  )}
                   {file.language_name && (
                     <div className="meta-item language-badge">
                       <Globe size={16} />
@@ -153,7 +234,7 @@ const FilesList = ({ onViewFile, onBack }) => {
               <div className="file-actions">
                 <button
                   className="btn-icon"
-                  onClick={() => handleView(file.filename)}
+                  onClick={() => handleView(file.filename, file.size)}
                   title="Visualizar"
                 >
                   <Eye size={20} />
@@ -182,6 +263,30 @@ const FilesList = ({ onViewFile, onBack }) => {
           ))}
         </div>
       )}
+
+      {pages > 1 && (
+        <div className="files-pagination">
+          <button
+            className="btn btn-secondary"
+            onClick={() => setPage(page - 1)}
+            disabled={loading || page <= 1}
+          >
+            <ChevronLeft size={18} />
+            Anterior
+          </button>
+          <span>
+            Página {page} de {pages}
+          </span>
+          <button
+            className="btn btn-secondary"
+            onClick={() => setPage(page + 1)}
+            disabled={loading || page >= pages}
+          >
+            Próxima
+            <ChevronRight size={18} />
+          </button>
+        </div>
+      )}
     </div>
   )
 }
@@ -13,23 +13,19 @@ const ProgressStep = ({ jobStatus, config }) => {
   }, [jobStatus])
 
   useEffect(() => {
-    if (!jobStatus || jobStatus.status !== 'processing') {
-      if (jobStatus?.elapsed_seconds !== null && jobStatus?.elapsed_seconds !== undefined) {
-        setElapsedTime(jobStatus.elapsed_seconds)
-      }
+    if (jobStatus?.elapsed_seconds === null || jobStatus?.elapsed_seconds === undefined) {
       return
     }
 
-    if (jobStatus.elapsed_seconds !== null && jobStatus.elapsed_seconds !== undefined) {
-      setElapsedTime(jobStatus.elapsed_seconds)
+    setElapsedTime(jobStatus.elapsed_seconds)
+    if (jobStatus.status !== 'processing') {
+      return
     }
 
+    // Atualizações chegam por push só quando há progresso; o relógio avança localmente
+    const receivedAt = Date.now()
     const interval = setInterval(() => {
-      if (jobStatus.elapsed_seconds !== null && jobStatus.elapsed_seconds !== undefined) {
-        setElapsedTime(jobStatus.elapsed_seconds)
-      } else {
-        setElapsedTime(prev => prev + 1)
-      }
+      setElapsedTime(jobStatus.elapsed_seconds + (Date.now() - receivedAt) / 1000)
     }, 1000)
 
     return () => clearInterval(interval)
@@ -70,9 +66,7 @@ const ProgressStep = ({ jobStatus, config }) => {
 
   const targetLang = jobStatus.target_language || (config ? getLanguageName(config.targetLanguage) : '')
   const model = jobStatus.model || (config ? config.model : '')
-  const elapsed = jobStatus.elapsed_seconds !== null && jobStatus.elapsed_seconds !== undefined 
-    ? jobStatus.elapsed_seconds 
-    : elapsedTime
+  const elapsed = elapsedTime
 
   return (
     <div className="progress-step">
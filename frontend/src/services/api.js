@@ -43,6 +43,7 @@ export const startTranslation = async (jsonData, config) => {
     parallel: config.parallel,
     method: config.method,
     json_data: jsonData,
+    source_filename: config.sourceFilename,
   })
   
   return response.data
@@ -53,6 +54,33 @@ export const getJobStatus = async (jobId) => {
   return response.data
 }
 
+export const subscribeJobEvents = (jobId, { onStatus, onDone, onError }) => {
+  const source = new EventSource(`${API_BASE_URL}/api/translate/${jobId}/events`)
+
+  source.addEventListener('status', (event) => {
+    onStatus?.(JSON.parse(event.data))
+  })
+
+  source.addEventListener('progress', (event) => {
+    const payload = JSON.parse(event.data)
+    onStatus?.(payload.status, payload.batches)
+  })
+
+  source.addEventListener('done', (event) => {
+    source.close()
+    onDone?.(JSON.parse(event.data))
+  })
+
+  // EventSource reconecta sozinho; só desiste quando o servidor fecha de vez (ex: 404)
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED) {
+      onError?.(new Error('Conexão com o progresso do job perdida'))
+    }
+  }
+
+  return () => source.close()
+}
+
 export const getJobResult = async (jobId) => {
   const response = await api.get(`/api/translate/${jobId}/result`)
   return response.data
@@ -75,8 +103,8 @@ export const getLanguages = async () => {
   return response.data
 }
 
-export const listTranslatedFiles = async () => {
-  const response = await api.get('/api/files')
+export const listTranslatedFiles = async (params = {}) => {
+  const response = await api.get('/api/files', { params })
   return response.data
 }
 
@@ -85,6 +113,52 @@ export const getTranslatedFile = async (filename) => {
   return response.data
 }
 
+// Página de chaves achatadas (ou subárvore, com params.pointer) sem baixar o arquivo inteiro
+export const getTranslatedFileEntries = async (filename, params = {}) => {
+  const response = await api.get(`/api/files/${filename}`, { params })
+  return response.data
+}
+
+export const searchTranslatedFiles = async (params = {}) => {
+  const response = await api.get('/api/search', { params })
+  return response.data
+}
+
+// Comparação feita no servidor: devolve compare_id e o resumo; as diferenças vêm paginadas
+export const compareDocuments = async (file1, file2) => {
+  const formData = new FormData()
+  formData.append('file1', file1)
+  formData.append('file2', file2)
+  
+  const response = await api.post('/api/compare', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  })
+  return response.data
+}
+
+export const getCompareDiffs = async (compareId, params = {}) => {
+  const response = await api.get(`/api/compare/${compareId}`, { params })
+  return response.data
+}
+
+export const downloadCompareReport = async (compareId) => {
+  const response = await api.get(`/api/compare/${compareId}/report`, {
+    responseType: 'blob',
+  })
+  
+  const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5)
+  const url = window.URL.createObjectURL(new Blob([response.data]))
+  const link = document.createElement('a')
+  link.href = url
+  link.setAttribute('download', `comparison-report_${timestamp}.json`)
+  document.body.appendChild(link)
+  link.click()
+  link.remove()
+  window.URL.revokeObjectURL(url)
+}
+
 export const downloadTranslatedFile = async (filename) => {
   const response = await api.get(`/api/files/${filename}/download`, {
     responseType: 'blob',
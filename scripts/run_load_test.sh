@@ -0,0 +1,10 @@
+#!/bin/bash
+
+if [ ! -d "venv" ]; then
+    echo "❌ Ambiente virtual não encontrado!"
+    echo "Execute primeiro: ./install.sh"
+    exit 1
+fi
+
+source venv/bin/activate
+python backend/benchmarks/load_test.py "$@"